@@ -0,0 +1,152 @@
+"""
+Microbenchmark of point encoding/decoding: the code path of qdrant-odm
+0.0.4, reproduced below, against the per-model code generated in
+`qdrant_odm.codegen`.
+
+    python -m benchmarks.serializers
+"""
+
+import timeit
+import types
+from typing import Any, ClassVar
+
+from qdrant_client import models
+
+from qdrant_odm import CollectionConfig, PointModel, index
+
+VECTOR_SIZE = 8
+NUMBER = 20_000
+
+
+def make_model(
+    width: int, vector_size: int = VECTOR_SIZE, name: str | None = None
+) -> type[PointModel[int]]:
+    """
+    Model with `width` fields, one in ten of them a dense vector.
+    """
+    annotations, namespace = {}, {}
+
+    for i in range(width):
+        if i % 10 == 9:
+            annotations[f"vector_{i}"] = list[float]
+            namespace[f"vector_{i}"] = index.Vector(vector_size, models.Distance.COSINE)
+        else:
+            annotations[f"field_{i}"] = str
+            namespace[f"field_{i}"] = ""
+
+    name = name or f"Model{width}"
+    namespace["__annotations__"] = annotations
+    # Its own config: 0.0.4 names the collection on a config shared by default.
+    namespace["collection_config"] = CollectionConfig(collection_name=name)
+    return types.new_class(
+        name, (PointModel[int],), exec_body=lambda ns: ns.update(namespace)
+    )
+
+
+def make_point(
+    model: type[PointModel[int]], id: int = 1, vector_size: int = VECTOR_SIZE
+) -> PointModel[int]:
+    """
+    Point of a model made by `make_model`, built with the keyword
+    constructor only so that older versions of the ODM can run it too.
+    """
+    values = {
+        field: [0.5 + (id % 7) / 10] * vector_size if field.startswith("vector_") else field
+        for field in model.__annotations__
+    }
+    return model(id=id, **values)
+
+
+def baseline_fields(model: type) -> dict[str, Any]:
+    """
+    Fields as resolved by 0.0.4 on every access, walking the bases.
+    """
+    annotations = {}
+    stack = [model.__bases__]
+    while stack:
+        for base in stack.pop():
+            for field, type_ in getattr(base, "__annotations__", {}).items():
+                if getattr(type_, "__origin__", None) is not ClassVar:
+                    annotations[field] = type_
+            if base.__bases__:
+                stack.append(base.__bases__)
+    return annotations | model.__annotations__
+
+
+def baseline_to_point_struct(point: PointModel) -> models.PointStruct:
+    """
+    `PointStruct(id=..., payload=point.payload(), vector=point.vectors())` of
+    0.0.4, with its `payload()` and `vectors()` inlined.
+    """
+    model = type(point)
+    defaults = model.__schema__.defaults
+    exclude = model.__non_payload_fields__
+    payload = {}
+    for field in baseline_fields(model):
+        if field not in exclude:
+            value = getattr(point, field, None)
+            payload[field] = value if value else defaults.get(field)
+
+    vectors = {}
+    for field in exclude:
+        if field != "id" and (vector := getattr(point, field, None)):
+            vectors[field] = vector
+
+    return models.PointStruct(id=point.id, payload=payload, vector=vectors)
+
+
+def baseline_from_record(
+    model: type[PointModel], record: models.Record
+) -> PointModel:
+    """
+    `_from_record` of 0.0.4: the keyword constructor, then `__post_init__`.
+    """
+    point = object.__new__(model)
+    values = {"id": record.id, **(record.payload or {}), **(record.vector or {})}
+    for field in baseline_fields(model):
+        object.__setattr__(point, field, values.get(field))
+    for slot, value in (
+        ("_persisted", False),
+        ("_plan", None),
+        ("_loader", None),
+    ):
+        object.__setattr__(point, slot, value)
+    object.__setattr__(point, "_persisted", True)
+    return point
+
+
+def points_per_second(statement) -> float:
+    return NUMBER / min(timeit.repeat(statement, number=NUMBER, repeat=3))
+
+
+def main():
+    print(f"{'fields':>6} {'operation':>10} {'0.0.4':>12} {'generated':>12} {'speedup':>8}")
+
+    for width in (5, 20, 50):
+        model = make_model(width)
+        point = make_point(model)
+        record = models.Record(
+            id=point.id, payload=point.payload(), vector=point.vectors()
+        )
+
+        cases = {
+            "encode": (
+                lambda: baseline_to_point_struct(point),
+                point._to_point_struct,
+            ),
+            "decode": (
+                lambda: baseline_from_record(model, record),
+                lambda: model._from_record(record, True),
+            ),
+        }
+
+        for operation, (baseline, generated) in cases.items():
+            before = points_per_second(baseline)
+            after = points_per_second(generated)
+            print(
+                f"{width:>6} {operation:>10} {before:>12,.0f} {after:>12,.0f} {after / before:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
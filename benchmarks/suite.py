@@ -0,0 +1,296 @@
+"""
+Benchmarks of the ODM hot paths against a local Qdrant: model construction,
+`payload()`/`vectors()` encoding, `_from_record` decoding, `insert_many`,
+`scroll` and `neighbours`, across model widths, vector sizes and batch sizes.
+
+Results are saved as JSON; `--compare` reports the changes from a previous
+run and exits with status 1 if any case regressed beyond `--tolerance`.
+Points are built and written through the API of qdrant-odm 0.0.4, newer
+APIs being used only when present, so the suite runs on older checkouts.
+
+    python -m benchmarks.suite --output before.json
+    python -m benchmarks.suite --output after.json --compare before.json
+"""
+
+import argparse
+import importlib.metadata
+import inspect
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, NamedTuple
+
+from qdrant_client import QdrantClient, models
+
+from qdrant_odm import PointModel, init_models
+
+from .serializers import make_model, make_point
+
+
+class Result(NamedTuple):
+    benchmark: str
+    params: dict[str, Any]
+    value: float
+    unit: str
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{name}={value}" for name, value in sorted(self.params.items()))
+        return f"{self.benchmark}[{params}]"
+
+
+class Config(NamedTuple):
+    widths: tuple[int, ...] = (5, 20, 50)
+    vector_sizes: tuple[int, ...] = (16, 128, 768)
+    batch_sizes: tuple[int, ...] = (64, 256, 1024)
+    io_width: int = 20
+    points: int = 5_000
+    micro_number: int = 5_000
+    queries: int = 200
+
+
+QUICK = Config(
+    widths=(5, 20),
+    vector_sizes=(16, 128),
+    batch_sizes=(64, 256),
+    points=1_000,
+    micro_number=1_000,
+    queries=50,
+)
+
+# Latencies are better when lower, every other unit when higher.
+LOWER_IS_BETTER = {"ms"}
+
+
+def per_second(statement: Callable[[], Any], number: int) -> float:
+    return number / min(timeit.repeat(statement, number=number, repeat=3))
+
+
+def accepts(function: Callable[..., Any], parameter: str) -> bool:
+    return parameter in inspect.signature(function).parameters
+
+
+def insert(
+    model: type[PointModel[int]], points: list[PointModel[int]], batch_size: int
+) -> None:
+    """
+    Write `points` in batches, one `insert_many` call per batch on versions
+    where it does not batch itself.
+    """
+    if accepts(model.insert_many, "batch_size"):
+        model.insert_many(points, batch_size=batch_size)
+        return
+    for batch in itertools.batched(points, batch_size):
+        model.insert_many(*batch)
+
+
+def get_points(model: type[PointModel[int]], ids: list[int]) -> list[PointModel[int]]:
+    if hasattr(model, "get_many"):
+        return model.get_many(ids)
+    return [model.get(id) for id in ids]
+
+
+def bench_micro(config: Config) -> list[Result]:
+    results = []
+
+    for width, vector_size in itertools.product(config.widths, config.vector_sizes):
+        model = make_model(width, vector_size)
+        point = make_point(model, vector_size=vector_size)
+        values = point.to_dict()
+        record = models.Record(id=point.id, payload=point.payload(), vector=point.vectors())
+        params = {"width": width, "vector_size": vector_size}
+
+        for benchmark, statement in (
+            ("construct", lambda: model(**values)),
+            ("payload", point.payload),
+            ("vectors", point.vectors),
+            ("from_record", lambda: model._from_record(record, True)),
+        ):
+            results.append(
+                Result(
+                    benchmark,
+                    params,
+                    per_second(statement, config.micro_number),
+                    "ops/s",
+                )
+            )
+
+    return results
+
+
+def fresh_model(
+    client: QdrantClient, width: int, vector_size: int, name: str
+) -> type[PointModel[int]]:
+    model = make_model(width, vector_size, name)
+    if client.collection_exists(name):
+        client.delete_collection(name)
+    init_models(client, [model])
+    return model
+
+
+def bench_io(client: QdrantClient, config: Config) -> list[Result]:
+    results = []
+
+    for vector_size in config.vector_sizes:
+        template = make_model(config.io_width, vector_size)
+        # Ids start at 1: 0.0.4 drops falsy field values, the id included.
+        points = [
+            make_point(template, id, vector_size) for id in range(1, config.points + 1)
+        ]
+
+        for batch_size in config.batch_sizes:
+            name = f"bench_{config.io_width}_{vector_size}_{batch_size}"
+            model = fresh_model(client, config.io_width, vector_size, name)
+            batch = [model(**point.to_dict()) for point in points]
+            params = {
+                "width": config.io_width,
+                "vector_size": vector_size,
+                "batch_size": batch_size,
+            }
+
+            started = time.perf_counter()
+            insert(model, batch, batch_size)
+            elapsed = time.perf_counter() - started
+            results.append(Result("insert_many", params, len(batch) / elapsed, "points/s"))
+
+            started = time.perf_counter()
+            scrolled = sum(len(page) for page in model.scroll(limit=batch_size))
+            elapsed = time.perf_counter() - started
+            results.append(Result("scroll", params, scrolled / elapsed, "points/s"))
+
+            client.delete_collection(name)
+
+        name = f"bench_{config.io_width}_{vector_size}_neighbours"
+        model = fresh_model(client, config.io_width, vector_size, name)
+        insert(model, [model(**point.to_dict()) for point in points], 256)
+        using = next(field for field in model.__annotations__ if field.startswith("vector_"))
+        probes = get_points(model, list(range(1, min(config.queries, config.points) + 1)))
+        latencies = []
+
+        for point in itertools.islice(itertools.cycle(probes), config.queries):
+            started = time.perf_counter()
+            point.neighbours(using, limit=10)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+        params = {"width": config.io_width, "vector_size": vector_size}
+        quantiles = statistics.quantiles(latencies, n=100)
+        results.append(Result("neighbours_p50", params, quantiles[49], "ms"))
+        results.append(Result("neighbours_p95", params, quantiles[94], "ms"))
+        client.delete_collection(name)
+
+    return results
+
+
+def version() -> str:
+    try:
+        return importlib.metadata.version("qdrant-odm")
+    except importlib.metadata.PackageNotFoundError:
+        pass
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment(location: str, config: Config) -> dict[str, Any]:
+    return {
+        "version": version(),
+        "qdrant_client": importlib.metadata.version("qdrant-client"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "location": location,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": config._asdict(),
+    }
+
+
+def compare(
+    results: list[Result], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """
+    Print the change of each case from `baseline`, returning the regressed ones.
+    """
+    previous = {
+        Result(**result).key: result["value"] for result in baseline["results"]
+    }
+    regressions = []
+
+    print(f"\nCompared with {baseline['environment']['version']}:")
+    for result in results:
+        if (before := previous.get(result.key)) is None:
+            continue
+
+        change = result.value / before - 1
+        worse = -change if result.unit not in LOWER_IS_BETTER else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        if flag:
+            regressions.append(result.key)
+        print(f"{result.key:<60} {before:>14,.2f} {result.value:>14,.2f} {change:>+8.1%}{flag}")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--location",
+        default=":memory:",
+        help='":memory:" or a directory for a local on-disk Qdrant',
+    )
+    parser.add_argument("--output", help="JSON file to save the results to")
+    parser.add_argument("--compare", help="JSON results of a previous run")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Relative slowdown reported as a regression",
+    )
+    parser.add_argument("--quick", action="store_true", help="Smaller matrix")
+    parser.add_argument("--skip-io", action="store_true", help="Only microbenchmarks")
+    args = parser.parse_args(argv)
+
+    config = QUICK if args.quick else Config()
+    results = bench_micro(config)
+
+    if not args.skip_io:
+        if args.location == ":memory:":
+            client = QdrantClient(":memory:")
+        else:
+            client = QdrantClient(path=args.location)
+        results += bench_io(client, config)
+        client.close()
+
+    for result in results:
+        print(f"{result.key:<60} {result.value:>14,.2f} {result.unit}")
+
+    report = {
+        "environment": environment(args.location, config),
+        "results": [result._asdict() for result in results],
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed by more than {args.tolerance:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
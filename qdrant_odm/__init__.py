@@ -1,5 +1,23 @@
+from .bulk import BatchFailure, BulkWriteError, RetryOptions
+from .cache import CacheStats, PointCache
 from .crud import CRUDPoint as PointModel, ReadOptions, WriteOptions
+from .embed import Embedder, EmbeddingCache
+from .export import export_collection, import_collection
+from .filters import Param, UnindexedFieldWarning
+from .ingest import IngestResult, ingest
+from .instrument import (
+    LoggingHook,
+    OpenTelemetryHook,
+    PrometheusHook,
+    Span,
+    add_hook,
+    remove_hook,
+)
 from .model import CollectionConfig, init_models
+from .plan import QueryPlan
+from .pool import ClientPool
+from .reconcile import CollectionDiff
+from .session import Session
 
 __all__ = [
     "PointModel",
@@ -7,4 +25,27 @@ __all__ = [
     "WriteOptions",
     "CollectionConfig",
     "init_models",
+    "BatchFailure",
+    "BulkWriteError",
+    "RetryOptions",
+    "PointCache",
+    "CacheStats",
+    "Session",
+    "QueryPlan",
+    "Param",
+    "UnindexedFieldWarning",
+    "export_collection",
+    "import_collection",
+    "ingest",
+    "Embedder",
+    "EmbeddingCache",
+    "IngestResult",
+    "Span",
+    "add_hook",
+    "remove_hook",
+    "LoggingHook",
+    "PrometheusHook",
+    "OpenTelemetryHook",
+    "ClientPool",
+    "CollectionDiff",
 ]
@@ -0,0 +1,398 @@
+import asyncio
+import contextvars
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from itertools import batched, islice
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    NamedTuple,
+    Sequence,
+)
+
+import grpc
+import httpx
+from loguru import logger
+from qdrant_client.conversions import common_types as types
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from .model import PointModel
+from .pool import _unavailable
+from .scroll import PageSize
+
+
+class BatchFailure(NamedTuple):
+    ids: list[types.PointId]
+    error: Exception
+
+
+class BulkWriteError(Exception):
+    """
+    Raised after a bulk write finished with some of its batches failed.
+
+    All other batches were still sent; `failures` tells which ids did not land.
+    """
+
+    def __init__(self, failures: list[BatchFailure]):
+        self.failures = failures
+        super().__init__(
+            f"{len(failures)} batch(es) failed, {len(self.failed_ids)} points "
+            f"not written. First error: {failures[0].error!r}"
+        )
+
+    @property
+    def failed_ids(self) -> list[types.PointId]:
+        return [id for failure in self.failures for id in failure.ids]
+
+
+class RetryOptions(NamedTuple):
+    """
+    Retries of the failed batches of a bulk write.
+
+    Batches failing with a transient error (connection error, timeout, 429 or
+    5xx response) are sent again up to `attempts` times, after a jittered
+    delay doubling from `backoff` up to `max_backoff` seconds. Batches too
+    large for the server, or timing out, are split in halves instead.
+    """
+
+    attempts: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+
+    def delay(self, attempt: int) -> float:
+        return min(self.backoff * 2**attempt, self.max_backoff) * random.uniform(0.5, 1)
+
+
+class BatchSize(PageSize):
+    """
+    Upsert batch size, fixed or adapted to the observed request time like
+    scroll pages.
+
+    Splitting a batch lowers the size to the halves; after a batch was too
+    large for the server, the size stays below it for the rest of the write.
+    """
+
+    def __init__(self, batch_size: int | None = None, target_seconds: float = 1.0):
+        super().__init__(
+            batch_size, initial=64, minimum=1, maximum=4096, target_seconds=target_seconds
+        )
+
+    def split(self, size: int, too_large: bool) -> None:
+        half = max(size // 2, 1)
+        if too_large:
+            self._maximum = min(self._maximum, half)
+        self.value = min(self.value, half)
+
+
+def _too_large(error: Exception) -> bool:
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 413 or (
+            error.status_code == 400 and b"larger than allowed" in error.content
+        )
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.RESOURCE_EXHAUSTED  # type: ignore
+    return False
+
+
+def _timed_out(error: Exception) -> bool:
+    if isinstance(error, ResponseHandlingException):
+        return isinstance(error.source, httpx.TimeoutException)
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.DEADLINE_EXCEEDED  # type: ignore
+    return isinstance(error, TimeoutError)
+
+
+def _transient(error: Exception) -> bool:
+    if isinstance(error, UnexpectedResponse) and error.status_code == 429:
+        return True
+    return _unavailable(error)
+
+
+def iter_points[P: PointModel](points: Iterable[P | Iterable[P]]) -> Iterator[P]:
+    """
+    Flatten `insert_many(*points)` arguments, which may be points or iterables
+    (lists, generators) of points.
+    """
+    for item in points:
+        if isinstance(item, PointModel):
+            yield item
+        else:
+            yield from item
+
+
+async def aiter_points[P: PointModel](
+    points: Iterable[P | Iterable[P] | AsyncIterable[P]],
+) -> AsyncIterator[P]:
+    """
+    Async counterpart of `iter_points`, also accepting async iterables.
+    """
+    for item in points:
+        if isinstance(item, PointModel):
+            yield item
+        elif isinstance(item, AsyncIterable):
+            async for point in item:
+                yield point
+        else:
+            for point in item:
+                yield point
+
+
+def _embed_chunk_size(model: type[PointModel]) -> int:
+    return max(
+        index.embedder.chunk_size  # type: ignore
+        for index in model.__embedded_fields__.values()
+    )
+
+
+def with_embeddings[P: PointModel](model: type[P], points: Iterator[P]) -> Iterator[P]:
+    """
+    Fill the embedded vector fields of `points` as they stream by, in chunks
+    keeping every worker of the embedders busy.
+    """
+    if not model.__embedded_fields__:
+        yield from points
+        return
+
+    for chunk in batched(points, _embed_chunk_size(model)):
+        model.fill_embeddings(chunk)
+        yield from chunk
+
+
+async def awith_embeddings[P: PointModel](
+    model: type[P], points: AsyncIterator[P]
+) -> AsyncIterator[P]:
+    """
+    Async counterpart of `with_embeddings`, embedding in a worker thread.
+    """
+    if not model.__embedded_fields__:
+        async for point in points:
+            yield point
+        return
+
+    chunk_size, chunk = _embed_chunk_size(model), []
+
+    async for point in points:
+        chunk.append(point)
+        if len(chunk) == chunk_size:
+            await asyncio.to_thread(model.fill_embeddings, chunk)
+            for embedded in chunk:
+                yield embedded
+            chunk = []
+
+    if chunk:
+        await asyncio.to_thread(model.fill_embeddings, chunk)
+        for embedded in chunk:
+            yield embedded
+
+
+def _batches[P](points: Iterable[P], batch_size: BatchSize) -> Iterator[list[P]]:
+    iterator = iter(points)
+    while batch := list(islice(iterator, batch_size.value)):
+        yield batch
+
+
+def _recover(
+    error: Exception,
+    batch: Sequence[PointModel],
+    attempt: int,
+    batch_size: BatchSize,
+    retry: RetryOptions,
+) -> float | Literal["split"] | None:
+    """
+    How `batch` failing with `error` on its `attempt`-th retry is recovered:
+    "split" in halves, the delay before sending it again, or None if it
+    cannot be.
+    """
+    size = len(batch)
+    if retry.attempts and size > 1 and (_too_large(error) or _timed_out(error)):
+        batch_size.split(size, _too_large(error))
+        logger.warning(f"Splitting a batch of {size} points: {error}")
+        return "split"
+    if attempt < retry.attempts and _transient(error):
+        delay = retry.delay(attempt)
+        logger.warning(
+            f"Retrying a batch of {size} points in {delay:.2f}s "
+            f"({attempt + 1}/{retry.attempts}): {error}"
+        )
+        return delay
+    return None
+
+
+def _failed(batch: Sequence[PointModel], error: Exception) -> list[BatchFailure]:
+    return [BatchFailure([point.id for point in batch], error)]  # type: ignore
+
+
+def _write_batch[P: PointModel](
+    send: Callable[[Sequence[P]], Any],
+    batch: Sequence[P],
+    batch_size: BatchSize,
+    retry: RetryOptions,
+) -> list[BatchFailure]:
+    """
+    Send `batch`, retrying or splitting it as `retry` allows, and return the
+    parts that could not be written.
+    """
+    attempt = 0
+
+    while True:
+        started = time.perf_counter()
+        try:
+            send(batch)
+        except Exception as error:
+            recovery = _recover(error, batch, attempt, batch_size, retry)
+            if recovery is None:
+                return _failed(batch, error)
+            if recovery == "split":
+                half = len(batch) // 2
+                return _write_batch(send, batch[:half], batch_size, retry) + _write_batch(
+                    send, batch[half:], batch_size, retry
+                )
+            attempt += 1
+            time.sleep(recovery)
+        else:
+            batch_size.observe(time.perf_counter() - started, len(batch))
+            return []
+
+
+async def _write_batch_async[P: PointModel](
+    send: Callable[[Sequence[P]], Awaitable[Any]],
+    batch: Sequence[P],
+    batch_size: BatchSize,
+    retry: RetryOptions,
+) -> list[BatchFailure]:
+    """
+    Async counterpart of `_write_batch`.
+    """
+    attempt = 0
+
+    while True:
+        started = time.perf_counter()
+        try:
+            await send(batch)
+        except Exception as error:
+            recovery = _recover(error, batch, attempt, batch_size, retry)
+            if recovery is None:
+                return _failed(batch, error)
+            if recovery == "split":
+                half = len(batch) // 2
+                return await _write_batch_async(
+                    send, batch[:half], batch_size, retry
+                ) + await _write_batch_async(send, batch[half:], batch_size, retry)
+            attempt += 1
+            await asyncio.sleep(recovery)
+        else:
+            batch_size.observe(time.perf_counter() - started, len(batch))
+            return []
+
+
+def write_batches[P: PointModel](
+    send: Callable[[Sequence[P]], Any],
+    points: Iterable[P],
+    batch_size: int | BatchSize | None,
+    parallel: int = 1,
+    retry: RetryOptions = RetryOptions(),
+) -> None:
+    """
+    Stream `points` to `send` in batches of `batch_size`, adapted to the
+    request time if None.
+
+    With `parallel > 1` batches are sent from a pool of that many threads. The
+    input is only consumed when a worker is free, so at most `parallel`
+    batches are held in memory regardless of the input size.
+
+    Failed batches are retried, or split in halves, according to `retry`;
+    only the points of the parts that still failed are reported.
+
+    Raises:
+        BulkWriteError: if any batch failed.
+    """
+    if not isinstance(batch_size, BatchSize):
+        batch_size = BatchSize(batch_size)
+    if batch_size.value < 1 or parallel < 1:
+        raise ValueError("batch_size and parallel must be positive")
+
+    write = partial(_write_batch, send, batch_size=batch_size, retry=retry)
+    failures: list[BatchFailure] = []
+
+    if parallel == 1:
+        for batch in _batches(points, batch_size):
+            failures += write(batch)
+    else:
+        pending: set[Future] = set()
+
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            for batch in _batches(points, batch_size):
+                if len(pending) >= parallel:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        failures += future.result()
+
+                # Run in a copy of the context so that the batch is measured
+                # in the operation that sends it.
+                context = contextvars.copy_context()
+                pending.add(executor.submit(context.run, write, batch))
+
+            for future in wait(pending).done:
+                failures += future.result()
+
+    if failures:
+        raise BulkWriteError(failures)
+
+
+async def write_batches_async[P: PointModel](
+    send: Callable[[Sequence[P]], Awaitable[Any]],
+    points: AsyncIterable[P],
+    batch_size: int | BatchSize | None,
+    parallel: int = 1,
+    retry: RetryOptions = RetryOptions(),
+) -> None:
+    """
+    Async counterpart of `write_batches`, keeping at most `parallel` batches
+    in flight as tasks on the running event loop.
+
+    Raises:
+        BulkWriteError: if any batch failed.
+    """
+    if not isinstance(batch_size, BatchSize):
+        batch_size = BatchSize(batch_size)
+    if batch_size.value < 1 or parallel < 1:
+        raise ValueError("batch_size and parallel must be positive")
+
+    failures: list[BatchFailure] = []
+    pending: set[asyncio.Task] = set()
+
+    async def drain(return_when: str) -> None:
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        for task in done:
+            failures.extend(task.result())
+
+    async def flush(batch: list[P]) -> None:
+        if len(pending) >= parallel:
+            await drain(asyncio.FIRST_COMPLETED)
+        pending.add(
+            asyncio.ensure_future(_write_batch_async(send, batch, batch_size, retry))
+        )
+
+    batch: list[P] = []
+    async for point in points:
+        batch.append(point)
+        if len(batch) >= batch_size.value:
+            await flush(batch)
+            batch = []
+
+    if batch:
+        await flush(batch)
+    if pending:
+        await drain(asyncio.ALL_COMPLETED)
+
+    if failures:
+        raise BulkWriteError(failures)
@@ -0,0 +1,193 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Iterable, NamedTuple, Sequence
+
+from qdrant_client.conversions import common_types as types
+
+from .lookup import normalize_id
+
+type WithVectors = bool | frozenset[str]
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class CachedRecord(NamedTuple):
+    """
+    Minimal stand-in for `types.Record`, enough for `PointModel._from_record`.
+    """
+
+    id: types.PointId
+    payload: dict[str, Any] | None
+    vector: Any
+
+
+class _Entry(NamedTuple):
+    record: CachedRecord
+    with_vectors: WithVectors
+    expires_at: float
+    size: int
+
+
+def _with_vectors(with_vectors: bool | Sequence[str]) -> WithVectors:
+    if isinstance(with_vectors, bool):
+        return with_vectors
+    return frozenset(with_vectors)
+
+
+def _covers(cached: WithVectors, requested: WithVectors) -> bool:
+    if requested is False or cached is True:
+        return True
+    if requested is True or cached is False:
+        return False
+    return requested <= cached  # type: ignore
+
+
+def _copy_vectors(value: Any) -> Any:
+    """
+    Copy of the vectors of a record. Floats are immutable, so dense vectors
+    are copied as lists, which is much cheaper than `deepcopy`.
+    """
+    if isinstance(value, dict):
+        return {name: _copy_vectors(vector) for name, vector in value.items()}
+    if isinstance(value, list):
+        if value and isinstance(value[0], list):
+            return [list(vector) for vector in value]
+        return list(value)
+    if value is None:
+        return None
+    return deepcopy(value)
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Rough number of heap bytes held by a record's payload or vectors.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(key) + estimate_size(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if hasattr(value, "__dict__"):
+        return estimate_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class PointCache:
+    """
+    Thread-safe LRU cache of records keyed by collection and point id.
+
+    Entries expire `ttl` seconds after they were stored, and the least
+    recently used ones are evicted beyond `max_entries` or `max_bytes`.
+    Payloads and vectors are copied when stored and on every hit, so cached
+    records cannot be changed through the points they were read into.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, types.PointId], _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self._hits, self._misses, self._evictions, len(self._entries), self._bytes
+        )
+
+    def get(
+        self,
+        collection_name: str,
+        id: types.PointId,
+        with_vectors: bool | Sequence[str] = False,
+    ) -> CachedRecord | None:
+        key = (collection_name, normalize_id(id))
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry.expires_at < time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None or not _covers(entry.with_vectors, _with_vectors(with_vectors)):
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+        record = entry.record
+        return record._replace(
+            payload=deepcopy(record.payload), vector=_copy_vectors(record.vector)
+        )
+
+    def put(
+        self,
+        collection_name: str,
+        records: Iterable[types.Record | types.ScoredPoint],
+        with_vectors: bool | Sequence[str] = False,
+    ) -> None:
+        with_vectors = _with_vectors(with_vectors)
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+
+        with self._lock:
+            for record in records:
+                key = (collection_name, record.id)
+                payload = deepcopy(record.payload)
+                vector = _copy_vectors(record.vector)
+                size = estimate_size(payload) + estimate_size(vector)
+
+                if key in self._entries:
+                    self._remove(key)
+
+                self._entries[key] = _Entry(
+                    CachedRecord(record.id, payload, vector),
+                    with_vectors,
+                    expires_at,
+                    size,
+                )
+                self._bytes += size
+
+            self._evict()
+
+    def invalidate(self, collection_name: str, ids: Iterable[types.PointId]) -> None:
+        with self._lock:
+            for id in ids:
+                key = (collection_name, normalize_id(id))
+                if key in self._entries:
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: tuple[str, types.PointId]) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._evictions += 1
@@ -0,0 +1,178 @@
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
+from qdrant_client import models
+
+from .dataclass import field_slot
+
+if TYPE_CHECKING:
+    from .model import PointModel
+
+
+_EMPTY: Any = MappingProxyType({})
+
+
+def _compile(name: str, lines: list[str], namespace: dict[str, Any]) -> Callable:
+    exec("\n".join(lines), namespace)
+    function = namespace[name]
+    function.__generated__ = True
+    return function
+
+
+def is_generated(method: Any) -> bool:
+    """
+    Whether `method`, possibly a classmethod, was built by this module.
+    """
+    return getattr(getattr(method, "__func__", method), "__generated__", False)
+
+
+def _sparse(value: Any) -> models.SparseVector:
+    if isinstance(value, models.SparseVector):
+        return value
+    return models.SparseVector(indices=value[0], values=value[1])
+
+
+def _dense(value: Any) -> Any:
+    # The client models validate vectors as lists of floats; `tolist()` does
+    # the conversion in one C call instead of element by element.
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def _array(value: Any, dtype: np.dtype) -> np.ndarray | None:
+    if value is None:
+        return None
+    return np.asarray(value, dtype=dtype)
+
+
+def _payload_lines(cls: "type[PointModel]") -> list[str]:
+    return [
+        "    payload = {",
+        *(f"        {field!r}: self.{field}," for field in cls.__payload_fields__),
+        "    }",
+    ]
+
+
+def _vectors_lines(cls: "type[PointModel]") -> list[str]:
+    lines = ["    vectors = {}"]
+    sparse_fields = cls.__index_config__["sparse_vectors_config"]
+
+    for field in cls.__vector_fields__:
+        value = "_sparse(value)" if field in sparse_fields else "_dense(value)"
+        lines += [
+            f"    if (value := self.{field}) is not None:",
+            f"        vectors[{field!r}] = {value}",
+        ]
+
+    return lines
+
+
+def make_payload(cls: "type[PointModel]") -> Callable:
+    """
+    Build `payload()` for `cls` with one attribute read per payload field.
+    """
+    lines = ["def payload(self):", *_payload_lines(cls), "    return payload"]
+    return _compile("payload", lines, {})
+
+
+def make_vectors(cls: "type[PointModel]") -> Callable:
+    """
+    Build `vectors()` for `cls` with one attribute read per vector field.
+    """
+    lines = ["def vectors(self):", *_vectors_lines(cls), "    return vectors"]
+    return _compile("vectors", lines, {"_sparse": _sparse, "_dense": _dense})
+
+
+def make_to_point_struct(
+    cls: "type[PointModel]", call_payload: bool = False, call_vectors: bool = False
+) -> Callable:
+    """
+    Build `_to_point_struct()` for `cls`, encoding a point without going
+    through the intermediate `payload()` and `vectors()` calls, unless they
+    are overridden and must be called: `call_payload` and `call_vectors`.
+    """
+    lines = [
+        "def _to_point_struct(self):",
+        *(["    payload = self.payload()"] if call_payload else _payload_lines(cls)),
+        *(["    vectors = self.vectors()"] if call_vectors else _vectors_lines(cls)),
+        "    return PointStruct(id=self.id, payload=payload, vector=vectors)",
+    ]
+    return _compile(
+        "_to_point_struct",
+        lines,
+        {"_sparse": _sparse, "_dense": _dense, "PointStruct": models.PointStruct},
+    )
+
+
+def make_from_record(cls: "type[PointModel]") -> Callable:
+    """
+    Build `_from_record()` for `cls`.
+
+    The generated function allocates the instance directly and assigns every
+    field from the record, so the generic `__init__` loop is skipped.
+    `__post_init__` is still called to keep user hooks working.
+    """
+    defaults = cls.__schema__.defaults
+    namespace: dict[str, Any] = {
+        "_EMPTY": _EMPTY,
+        "_new": object.__new__,
+        "_array": _array,
+    }
+    lines = [
+        "def _from_record(cls, record, set_persisted=False):",
+        "    point = _new(cls)",
+        "    payload = record.payload or _EMPTY",
+        "    vector = record.vector or _EMPTY",
+        "    _set_id(point, record.id)",
+    ]
+
+    # Fields are written through their slot descriptors, which skips the
+    # change tracking done by `PointModel.__setattr__`.
+    for field in cls.__schema__.fields:
+        namespace[f"_set_{field}"] = field_slot(cls, field).__set__
+
+    for field in cls.__payload_fields__:
+        if field in defaults:
+            namespace[f"_default_{field}"] = defaults[field]
+            lines.append(
+                f"    _set_{field}(point, payload.get({field!r}, _default_{field}))"
+            )
+        else:
+            lines.append(f"    _set_{field}(point, payload.get({field!r}))")
+
+    for field in cls.__vector_fields__:
+        if field in cls.__numpy_vectors__:
+            namespace[f"_dtype_{field}"] = cls.__numpy_vectors__[field]
+            lines.append(
+                f"    _set_{field}(point, _array(vector.get({field!r}), _dtype_{field}))"
+            )
+        else:
+            lines.append(f"    _set_{field}(point, vector.get({field!r}))")
+
+    for slot, value in (
+        ("_changed", "set()"),
+        ("_plan", "None"),
+        ("_loader", "None"),
+        ("_persisted", "set_persisted"),
+    ):
+        namespace[f"_set{slot}"] = getattr(cls, slot).__set__
+        lines.append(f"    _set{slot}(point, {value})")
+
+    from .model import PointModel
+
+    # `PointModel.__post_init__` only initializes the slots set above, so it is
+    # called only when a subclass overrides it.
+    post_init_owner = next(
+        klass for klass in cls.__mro__ if "__post_init__" in klass.__dict__
+    )
+    if post_init_owner is not PointModel:
+        lines += [
+            "    point.__post_init__()",
+            "    _set_persisted(point, set_persisted)",
+            "    _set_changed(point, set())",
+        ]
+
+    lines.append("    return point")
+    return classmethod(_compile("_from_record", lines, namespace))
@@ -1,17 +1,59 @@
-from typing import Iterable, Iterator, NamedTuple, Self, Sequence
+from functools import partial
+from itertools import batched, chain
+from typing import Any, Callable, ClassVar, Iterable, Iterator, NamedTuple, Self, Sequence
 from types import TracebackType
 
-from qdrant_client import models
+from qdrant_client import QdrantClient, models
 from qdrant_client.conversions import common_types as types
 
+from .bulk import RetryOptions, iter_points, with_embeddings, write_batches
+from .deferred import FetchFields, loaded_values
+from .filters import Expr, as_filter
+from .instrument import count_points, instrumented, operation
+from .lookup import GetBatcher, retrieve_many
 from .model import PointModel, T
+from .scroll import Page, iter_pages
 
 
 class ReadOptions(NamedTuple):
+    """
+    Options of the reads. With `lazy`, set by `only()` and `defer()`, the
+    fields left out by `with_payload` and `with_vectors` are loaded when
+    first accessed; otherwise they keep their default.
+    """
+
     with_vectors: bool | Sequence[str] = False
     consistency: types.ReadConsistency | None = None
     shard_key_selector: types.ShardKeySelector | None = None
     timeout: int | None = None
+    with_payload: bool | Sequence[str] | types.PayloadSelector = True
+    lazy: bool = False
+
+    def only(self, *fields: str) -> Self:
+        """
+        Read only these payload fields; the others are loaded for the whole
+        result set when first accessed.
+        """
+        return self._replace(with_payload=list(fields), lazy=True)
+
+    def defer(self, *fields: str) -> Self:
+        """
+        Read the payload without these fields; they are loaded for the whole
+        result set when first accessed.
+        """
+        if not fields:
+            return self._replace(lazy=True)
+        return self._replace(
+            with_payload=models.PayloadSelectorExclude(exclude=list(fields)), lazy=True
+        )
+
+    def _client_kwargs(self) -> dict[str, Any]:
+        """
+        Arguments of the client read methods.
+        """
+        kwargs = self._asdict()
+        del kwargs["lazy"]
+        return kwargs
 
 
 class WriteOptions(NamedTuple):
@@ -20,88 +62,302 @@ class WriteOptions(NamedTuple):
     shard_key_selector: types.ShardKeySelector | None = None
 
 
+def _fetch_fields(
+    client: QdrantClient, model: type[PointModel], read_options: ReadOptions
+) -> FetchFields:
+    """
+    Fetch used to load deferred fields, with the consistency of the read.
+    """
+
+    def fetch(
+        ids: list[types.PointId], fields: list[str], vectors: list[str]
+    ) -> Sequence[types.Record]:
+        return client.retrieve(
+            model.__collection_name__,
+            ids=ids,
+            **read_options._replace(
+                with_payload=fields or False, with_vectors=vectors or False
+            )._client_kwargs(),
+        )
+
+    return fetch
+
+
+def _with_scores[P](
+    decode: Callable[[Sequence[types.ScoredPoint]], list[P]],
+    results: Sequence[Sequence[types.ScoredPoint]],
+) -> list[list[tuple[P, float]]]:
+    """
+    Decode several query results as one result set and pair them with scores.
+    """
+    points = iter(decode([record for records in results for record in records]))
+    return [[(next(points), record.score) for record in records] for records in results]
+
+
+def _hashable(read_options: ReadOptions) -> bool:
+    try:
+        hash(read_options)
+    except TypeError:
+        return False
+    return True
+
+
+def _neighbour_requests(
+    points_or_ids: Iterable[PointModel | types.PointId],
+    using: str,
+    limit: int,
+    score_threshold: float | None,
+    query_filter: types.Filter | Expr | None,
+    read_options: ReadOptions,
+    search_params: types.SearchParams | None,
+) -> list[models.QueryRequest]:
+    """
+    Build one nearest-neighbours request per point, for `query_batch_points`.
+    """
+    query_filter = as_filter(query_filter)
+    requests = []
+
+    for point in points_or_ids:
+        if isinstance(point, PointModel):
+            if not point._persisted:
+                raise ValueError(
+                    "Cannot get neighbours for non-persisted point. You need to save it first."
+                )
+            id, prefetch = point.id, point._prefetch()
+        else:
+            id, prefetch = point, None
+
+        requests.append(
+            models.QueryRequest(
+                query=models.NearestQuery(nearest=id),
+                using=using,
+                limit=limit,
+                score_threshold=score_threshold,
+                filter=query_filter,
+                prefetch=prefetch,
+                params=search_params,
+                with_vector=read_options.with_vectors,
+                with_payload=read_options.with_payload,
+                shard_key=read_options.shard_key_selector,
+            )
+        )
+
+    return requests
+
+
 class CRUDPoint(PointModel[T]):
+    __get_batcher__: ClassVar[GetBatcher | None] = None
+
     @classmethod
+    @instrumented("get")
     def get(
         cls,
         id: T,
         read_options: ReadOptions = ReadOptions(),
-    ) -> Self:
+    ) -> Self | None:
         """
         Get a point from Qdrant.
 
+        If batching is enabled with `enable_get_batching`, concurrent calls
+        are sent together as one request. Served from the model cache when
+        enabled with `enable_cache`.
+
         Args:
             id (T): The id of the point to get.
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
 
         Returns:
-            Self: The point.
+            Self | None: The point, or None if it does not exist.
+        """
+        if (batcher := cls.__get_batcher__) is not None and _hashable(read_options):
+            return batcher.get(id, read_options)
+
+        return cls.get_many([id], read_options)[0]
+
+    @classmethod
+    @instrumented("get_many")
+    def get_many(
+        cls,
+        ids: Iterable[T],
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 256,
+    ) -> list[Self | None]:
         """
-        record, *_ = cls.__client__.retrieve(
-            cls.__collection_name__, ids=[id], **read_options._asdict()
+        Get several points from Qdrant in as few requests as possible.
+
+        Args:
+            ids (Iterable[T]): The ids of the points to get.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of ids per request. Defaults to 256.
+
+        Returns:
+            list[Self | None]: The points in the order of `ids`, None for missing ones.
+        """
+
+        with_vectors = read_options.with_vectors
+
+        def retrieve(ids: list[T]) -> Sequence[types.Record]:
+            records, missing = cls._cached_records(ids, with_vectors)
+
+            if missing:
+                fetched = cls.__client__.retrieve(
+                    cls.__collection_name__, ids=missing, **read_options._client_kwargs()
+                )
+                cls._cache_records(fetched, with_vectors, read_options.with_payload)
+                records += fetched
+
+            return records  # type: ignore
+
+        return retrieve_many(retrieve, cls._decoder(read_options), ids, chunk_size)
+
+    @classmethod
+    def _decoder(
+        cls, read_options: ReadOptions
+    ) -> Callable[[Sequence[types.Record]], list[Self]]:
+        return partial(
+            cls._decode_records,
+            with_payload=read_options.with_payload,
+            with_vectors=read_options.with_vectors,
+            fetch=_fetch_fields(cls.__client__, cls, read_options),
+            lazy=read_options.lazy,
         )
-        return cls._from_record(record, set_persisted=True)
+
+    @classmethod
+    def enable_get_batching(
+        cls, window: float = 0.002, max_batch_size: int = 256
+    ) -> None:
+        """
+        Coalesce `get()` calls made concurrently from several threads within
+        `window` seconds into a single `get_many()` request.
+
+        Args:
+            window (float, optional): Seconds to wait for more calls. Defaults to 0.002.
+            max_batch_size (int, optional): Send as soon as that many ids are waiting. Defaults to 256.
+        """
+        cls.__get_batcher__ = GetBatcher(cls.get_many, window, max_batch_size)
+
+    @classmethod
+    def disable_get_batching(cls) -> None:
+        cls.__get_batcher__ = None
 
     @classmethod
     def scroll(
         cls,
-        scroll_filter: types.Filter | None = None,
-        limit: int = 10,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
         order_by: types.OrderBy | None = None,
         read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 0,
     ) -> Iterator[list[Self]]:
         """
         Scroll points from Qdrant.
 
         Args:
-            scroll_filter (types.Filter | None, optional): Filter to apply. Defaults to None.
-            limit (int, optional): Number of points to fetch per scroll. Defaults to 10.
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
             order_by (types.OrderBy | None, optional): Order by. Defaults to None.
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched in background while the current one is processed. Defaults to 0.
 
         Yields:
             Iterator[list[Self]]: Iterator of lists of points.
         """
-        offset = None
 
-        while True:
+        def fetch(offset: types.PointId | None, limit: int) -> Page:
             records, offset = cls.__client__.scroll(
                 cls.__collection_name__,
-                scroll_filter=scroll_filter,
+                scroll_filter=as_filter(scroll_filter),
                 offset=offset,
                 limit=limit,
                 order_by=order_by,
-                **read_options._asdict(),
+                **read_options._client_kwargs(),
             )
-            yield [cls._from_record(record, set_persisted=True) for record in records]
+            cls._cache_records(
+                records, read_options.with_vectors, read_options.with_payload
+            )
+            return records, offset
+
+        return iter_pages(
+            fetch,
+            cls._decoder(read_options),
+            limit,
+            read_ahead,
+            partial(operation, "scroll", cls),
+        )
+
+    @classmethod
+    def scroll_points(
+        cls,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
+        order_by: types.OrderBy | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 1,
+    ) -> Iterator[Self]:
+        """
+        Scroll points from Qdrant one by one, reading the next page ahead.
+
+        Args:
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
+            order_by (types.OrderBy | None, optional): Order by. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched in background while the current one is processed. Defaults to 1.
 
-            if offset is None:
-                break
+        Yields:
+            Iterator[Self]: Iterator of points.
+        """
+        pages = cls.scroll(scroll_filter, limit, order_by, read_options, read_ahead)
+        return chain.from_iterable(pages)
 
     @classmethod
+    @instrumented("insert_many")
     def insert_many(
         cls,
-        *points: Self,
+        *points: Self | Iterable[Self],
+        batch_size: int | None = None,
+        parallel: int = 1,
         write_options: WriteOptions = WriteOptions(),
+        retry: RetryOptions = RetryOptions(),
     ) -> None:
         """
         Save the points to Qdrant.
 
+        Points are consumed lazily and sent in chunks, so a generator of any
+        size can be inserted with flat memory usage. Failed chunks are retried
+        after a backoff when the error is transient, and split in halves when
+        too large for the server or timing out.
+
         Args:
+            points (Self | Iterable[Self]): Points or iterables of points.
+            batch_size (int | None, optional): Number of points per upsert request, adapted to the request time if None. Defaults to None.
+            parallel (int, optional): Number of batches sent concurrently. Defaults to 1.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+            retry (RetryOptions, optional): Retries of failed chunks. Defaults to RetryOptions().
+
+        Raises:
+            BulkWriteError: If some points could not be written, with their ids.
         """
-        cls.__client__.upsert(
-            cls.__collection_name__,
-            points=[
-                models.PointStruct(
-                    id=point.id, payload=point.payload(), vector=point.vectors()
-                )
-                for point in points
-            ],
-            **write_options._asdict(),
+        write_kwargs = write_options._asdict()
+
+        def send(batch: Sequence[Self]) -> None:
+            cls.__client__.upsert(
+                cls.__collection_name__,
+                points=cls._encode_points(batch),
+                **write_kwargs,
+            )
+            cls._invalidate_cache(point.id for point in batch)
+
+        write_batches(
+            send,
+            with_embeddings(cls, iter_points(points)),
+            batch_size,
+            parallel,
+            retry,
         )
-        
+
     @classmethod
+    @instrumented("delete_many")
     def delete_many(
         cls,
         *points: Self,
@@ -114,16 +370,20 @@ class CRUDPoint(PointModel[T]):
             points_selector (Iterable[T]): Points selector.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
         """
+        ids = [point.id for point in points]
         cls.__client__.delete(
             cls.__collection_name__,
-            points_selector=models.PointIdsList(points=[point.id for point in points]),
+            points_selector=models.PointIdsList(points=ids),
             **write_options._asdict(),
         )
+        count_points(len(ids))
+        cls._invalidate_cache(ids)
 
     @classmethod
+    @instrumented("count")
     def count(
         cls,
-        count_filter: types.Filter | None = None,
+        count_filter: types.Filter | Expr | None = None,
         exact: bool = True,
         shard_key_selector: types.ShardKeySelector | None = None,
         timeout: int | None = None,
@@ -132,7 +392,7 @@ class CRUDPoint(PointModel[T]):
         Count points in collection.
 
         Args:
-            count_filter (types.Filter | None, optional): Filter to apply. Defaults to None.
+            count_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
             exact (bool, optional): Whether to use exact count. Defaults to True.
             shard_key_selector (types.ShardKeySelector | None, optional): Shard key selector. Defaults to None.
             timeout (int | None, optional): Timeout. Defaults to None.
@@ -142,13 +402,14 @@ class CRUDPoint(PointModel[T]):
         """
         result = cls.__client__.count(
             cls.__collection_name__,
-            count_filter=count_filter,
+            count_filter=as_filter(count_filter),
             exact=exact,
             shard_key_selector=shard_key_selector,
             timeout=timeout,
         )
         return result.count
 
+    @instrumented("save")
     def save(
         self,
         overwrite_vectors: bool = False,
@@ -157,41 +418,44 @@ class CRUDPoint(PointModel[T]):
         """
         Save the point to Qdrant.
 
+        A persisted point only sends the fields changed since it was loaded or
+        saved, in a single request; nothing is sent if no field changed.
+
         Args:
-            overwrite_vectors (bool, optional): Whether to overwrite the vectors if they already exist. Defaults to False.
+            overwrite_vectors (bool, optional): Whether to write changed vectors of an already persisted point. Defaults to False.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
         """
         write_kwargs = write_options._asdict()
         client = self.__client__
         collection_name = self.__collection_name__
-        payload = self.payload()
+        self.fill_embeddings([self])
 
         if self._persisted:
-            client.set_payload(
-                collection_name,
-                payload=payload,
-                points=[self.id],
-                **write_kwargs,
+            operations, written = self._update_operations(
+                overwrite_vectors, write_options.shard_key_selector
             )
+            if not operations:
+                return
 
-            if overwrite_vectors:
-                client.update_vectors(
-                    collection_name,
-                    points=[models.PointVectors(id=self.id, vector=self.vectors())],
-                    **write_kwargs,
-                )
+            client.batch_update_points(
+                collection_name,
+                update_operations=operations,
+                wait=write_options.wait,
+                ordering=write_options.ordering,
+            )
+            self._changed -= written
         else:
             client.upsert(
                 collection_name,
-                points=[
-                    models.PointStruct(
-                        id=self.id, payload=payload, vector=self.vectors()
-                    )
-                ],
+                points=self._encode_points([self]),
                 **write_kwargs,
             )
             self._persisted = True
+            self._changed.clear()
 
+        self._invalidate_cache([self.id])
+
+    @instrumented("delete")
     def delete(self, write_options: WriteOptions = WriteOptions()) -> None:
         """
         Delete the point from Qdrant.
@@ -209,7 +473,10 @@ class CRUDPoint(PointModel[T]):
             points_selector=[self.id],
             **write_options._asdict(),
         )
+        count_points(1)
+        self._invalidate_cache([self.id])
 
+    @instrumented("sync")
     def sync(self, read_options: ReadOptions = ReadOptions()) -> None:
         """
         Syncronize the object with Qdrant record.
@@ -218,64 +485,126 @@ class CRUDPoint(PointModel[T]):
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
         """
         persisted_point = self.get(self.id, read_options)
-        for field in self.fields:
-            if persisted_value := getattr(persisted_point, field, None):
+        if persisted_point is None:
+            raise ValueError(f"Point {self.id} does not exist in Qdrant.")
+
+        # Deferred fields are left alone rather than loaded one by one.
+        for field, persisted_value in loaded_values(persisted_point).items():
+            if persisted_value is not None:
                 setattr(self, field, persisted_value)
         self._persisted = True
+        self._changed.clear()
+
+    @classmethod
+    @instrumented("neighbours_many")
+    def neighbours_many(
+        cls,
+        points_or_ids: Iterable[Self | T],
+        using: str,
+        limit: int = 10,
+        score_threshold: float | None = None,
+        query_filter: types.Filter | Expr | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        search_params: types.SearchParams | None = None,
+        chunk_size: int = 64,
+    ) -> list[list[tuple[Self, float]]]:
+        """
+        Get neighbours for several points with `query_batch_points`, one
+        request per `chunk_size` points instead of one per point.
+
+        Args:
+            points_or_ids (Iterable[Self | T]): Persisted points or point ids.
+            using (str): which vector field to use
+            limit (int, optional): Limit per point. Defaults to 10.
+            score_threshold (float | None, optional): Score threshold. Defaults to None.
+            query_filter (types.Filter | Expr | None, optional): Query filter. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            search_params (SearchParams, optional): Search params.
+            chunk_size (int, optional): Maximum number of queries per request. Defaults to 64.
+
+        Returns:
+            list[list[tuple[Self, float]]]: Neighbours with their scores, in the order of `points_or_ids`.
+        """
+        requests = _neighbour_requests(
+            points_or_ids,
+            using,
+            limit,
+            score_threshold,
+            query_filter,
+            read_options,
+            search_params,
+        )
+        results = []
+
+        for chunk in batched(requests, chunk_size):
+            responses = cls.__client__.query_batch_points(
+                cls.__collection_name__,
+                requests=chunk,
+                consistency=read_options.consistency,
+                timeout=read_options.timeout,
+            )
+            for response in responses:
+                cls._cache_records(
+                    response.points, read_options.with_vectors, read_options.with_payload
+                )
+                results.append(response.points)
+
+        return _with_scores(cls._decoder(read_options), results)
 
     def prefetch(
         self,
         using: str,
         limit: int | None = None,
         score_threshold: float | None = None,
-        prefetch_filter: types.Filter | None = None,
+        prefetch_filter: types.Filter | Expr | None = None,
         params: types.SearchParams | None = None,
     ) -> Self:
         """
-        Prefetch points from Qdrant.
+        Prefetch points from Qdrant for the `neighbours` queries of the point
+        made within a `with` block. Nested blocks stack their stages, each one
+        searching the results of the enclosing ones.
+
+            with chunk.prefetch("topic_vector", limit=100):
+                neighbours = chunk.neighbours(using="description_vector")
+
+        The stages form a `QueryPlan` held by the point until the block exits,
+        so the point cannot be shared between threads meanwhile; a `QueryPlan`
+        describes the same queries without any state on the point.
 
         Args:
             using (str): The using vector to use.
-            limit (int | None, optional): The limit of points to prefetch. Defaults to None.
+            limit (int | None, optional): The limit of points to prefetch. Defaults to None (10).
             score_threshold (float | None, optional): The score threshold to use. Defaults to None.
-            prefetch_filter (types.Filter | None, optional): The filter to use. Defaults to None.
+            prefetch_filter (types.Filter | Expr | None, optional): The filter to use. Defaults to None.
             params (types.SearchParams | None, optional): The search params to use. Defaults to None.
         """
-
-        # if not self._context_prefetch_is_on:
-        #     raise ValueError(
-        #         "Prefetch must be used in context manager. "
-        #         "Use `with point.prefetch(...):`"
-        #     )
-
-        self._context_prefetch_is_on = False
-
-        prefetch_query = models.Prefetch(
-            query=self.id,
-            using=using,
-            limit=limit,
-            score_threshold=score_threshold,
-            filter=prefetch_filter,  # type: ignore
-            prefetch=self._current_prefetch,
-            params=params,  # type: ignore
+        from .plan import QueryPlan
+
+        self._plan = QueryPlan(
+            type(self),
+            using,
+            10 if limit is None else limit,
+            score_threshold,
+            prefetch_filter,
+            params,
+            prefetch=() if self._plan is None else (self._plan,),
         )
-
-        self._current_prefetch = prefetch_query
         return self
 
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type: type, exc_value: Exception, traceback: TracebackType):
-        if current_prefetch := self._current_prefetch:
-            self._current_prefetch = current_prefetch.prefetch  # type: ignore
+        if (plan := self._plan) is not None:
+            self._plan = plan.prefetch[0] if plan.prefetch else None
 
+    @instrumented("neighbours")
     def neighbours(
         self,
         using: str,
         limit: int = 10,
         score_threshold: float | None = None,
-        query_filter: types.Filter | None = None,
+        query_filter: types.Filter | Expr | None = None,
         read_options: ReadOptions = ReadOptions(),
         search_params: types.SearchParams | None = None,
     ) -> list[tuple[Self, float]]:
@@ -286,7 +615,7 @@ class CRUDPoint(PointModel[T]):
             using (str): which vector field to use
             limit (int, optional): Limit. Defaults to 10.
             score_threshold (float | None, optional): Score threshold. Defaults to None.
-            query_filter (types.Filter | None, optional): Query filter. Defaults to None.
+            query_filter (types.Filter | Expr | None, optional): Query filter. Defaults to None.
             prefetch (models.Prefetch | None, optional): Prefetch. Defaults to None.
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
             search_params (SearchParams, optional): Search params.
@@ -306,13 +635,13 @@ class CRUDPoint(PointModel[T]):
             using=using,
             limit=limit,
             score_threshold=score_threshold,
-            query_filter=query_filter,
-            prefetch=self._current_prefetch,
+            query_filter=as_filter(query_filter),
+            prefetch=self._prefetch(),
             search_params=search_params,
-            **read_options._asdict(),
+            **read_options._client_kwargs(),
+        )
+        self._cache_records(
+            response.points, read_options.with_vectors, read_options.with_payload
         )
 
-        return [
-            (self._from_record(record, set_persisted=True), record.score)
-            for record in response.points
-        ]
+        return _with_scores(self._decoder(read_options), [response.points])[0]
@@ -1,45 +1,102 @@
-from typing import Any, ClassVar, dataclass_transform
+from types import MappingProxyType
+from typing import Any, ClassVar, Mapping, NamedTuple, dataclass_transform, get_origin
 
 
-class Serializable:
+class Schema(NamedTuple):
+    """
+    Frozen description of the fields of a `Serializable` class.
+
+    Built once at class creation, so instances never have to walk the MRO.
+    """
+
+    fields: Mapping[str, Any]
+    defaults: Mapping[str, Any]
+
+
+def _is_class_var(type_: Any) -> bool:
+    return type_ is ClassVar or get_origin(type_) is ClassVar
+
+
+class SchemaMeta(type):
+    """
+    Collects annotated fields into `__schema__` and backs them with `__slots__`.
+
+    Field defaults are moved out of the class namespace into the schema, since
+    a class attribute cannot share its name with a slot.
+    """
+
+    def __new__(
+        mcls, name: str, bases: tuple[type, ...], namespace: dict[str, Any], **kwargs
+    ):
+        fields, defaults = {}, {}
+
+        for base in reversed(bases):
+            if (schema := getattr(base, "__schema__", None)) is not None:
+                fields |= schema.fields
+                defaults |= schema.defaults
+
+        inherited = set(fields)
+
+        for field, type_ in namespace.get("__annotations__", {}).items():
+            if not _is_class_var(type_):
+                fields[field] = type_
+
+        for field in fields:
+            if field in namespace:
+                defaults[field] = namespace.pop(field)
+
+        slots = namespace.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        namespace["__slots__"] = (
+            *slots,
+            *(field for field in fields if field not in inherited),
+        )
+
+        namespace["__schema__"] = Schema(
+            MappingProxyType(fields), MappingProxyType(defaults)
+        )
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+
+def field_slot(cls: type, field: str) -> Any:
+    """
+    Slot descriptor of a field, looked up in the class dicts so that
+    attributes of the metaclass, such as `PointModel.f`, cannot shadow it.
+    """
+    for base in cls.__mro__:
+        if field in base.__dict__:
+            return base.__dict__[field]
+    raise AttributeError(f"{cls.__name__} has no field {field}")
+
+
+class Serializable(metaclass=SchemaMeta):
+    __slots__ = ()
+    __schema__: ClassVar[Schema]
+
     def __init__(self, **kwargs: Any):
-        for field in self.fields:
-            setattr(self, field, kwargs.get(field))
+        defaults = self.__schema__.defaults
+
+        for field in self.__schema__.fields:
+            setattr(self, field, kwargs.get(field, defaults.get(field)))
 
     @property
-    def fields(self) -> dict[str, Any]:
-        parent_annotations = {}
-        parents_stack = [self.__class__.__bases__]
-
-        while parents_stack:
-            for base in parents_stack.pop():
-                if hasattr(base, "__annotations__"):
-                    for field, type_ in base.__annotations__.items():
-                        if getattr(type_, "__origin__", None) is not ClassVar:
-                            parent_annotations[field] = type_
-                if base.__bases__:
-                    parents_stack.append(base.__bases__)
-
-        return parent_annotations | type(self).__annotations__
-
-    def to_dict(self, exclude: set[str] | None = None) -> dict[str, Any]:
+    def fields(self) -> Mapping[str, Any]:
+        return self.__schema__.fields
+
+    def to_dict(self, exclude: set[str] | frozenset[str] | None = None) -> dict[str, Any]:
         exclude = exclude or set()
-        dct = {}
-        
-        for field in self.fields:
-            if field in exclude:
-                continue
-            
-            if value := getattr(self, field, None):
-                dct[field] = value
-            else:
-                dct[field] = getattr(self.__class__, field, None)
-            
-        return dct
+        return {
+            field: getattr(self, field)
+            for field in self.__schema__.fields
+            if field not in exclude
+        }
 
 
 @dataclass_transform(kw_only_default=True)
 class DataClass(Serializable):
+    __slots__ = ()
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.__post_init__()
@@ -0,0 +1,239 @@
+import threading
+from itertools import batched
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Sequence
+
+from qdrant_client import models
+from qdrant_client.conversions import common_types as types
+
+from . import codegen
+from .dataclass import field_slot
+
+if TYPE_CHECKING:
+    from .model import PointModel
+
+type WithPayload = bool | Sequence[str] | types.PayloadSelector
+type WithVectors = bool | Sequence[str]
+type FetchFields = Callable[
+    [list[types.PointId], list[str], list[str]], Sequence[types.Record]
+]
+
+
+def deferred_fields(
+    model: "type[PointModel]", with_payload: WithPayload
+) -> tuple[str, ...]:
+    """
+    Payload fields of `model` left out by a `with_payload` selector.
+    """
+    if with_payload is True:
+        return ()
+    if with_payload is False:
+        return model.__payload_fields__
+    if isinstance(with_payload, models.PayloadSelectorExclude):
+        excluded = set(with_payload.exclude)
+        return tuple(field for field in model.__payload_fields__ if field in excluded)
+
+    included = set(
+        with_payload.include
+        if isinstance(with_payload, models.PayloadSelectorInclude)
+        else with_payload
+    )
+    return tuple(field for field in model.__payload_fields__ if field not in included)
+
+
+def deferred_vectors(
+    model: "type[PointModel]", with_vectors: WithVectors
+) -> tuple[str, ...]:
+    """
+    Vector fields of `model` left out by a `with_vectors` selector.
+    """
+    if with_vectors is True:
+        return ()
+    if with_vectors is False:
+        return model.__vector_fields__
+    return tuple(field for field in model.__vector_fields__ if field not in with_vectors)
+
+
+class DeferredLoader:
+    """
+    Loads the fields a result set was read without, for all the points of
+    the set at once, the first time one of them is read on any point.
+
+    Deferred payload fields are loaded together; vectors are loaded one
+    field at a time since they are usually large and only some are needed.
+    Deferred fields are left unset on the points, so reading them falls
+    back to `PointModel.__getattr__`, which calls `load()`.
+    """
+
+    def __init__(
+        self,
+        model: "type[PointModel]",
+        points: list["PointModel"],
+        fields: tuple[str, ...],
+        vectors: tuple[str, ...],
+        fetch: FetchFields | None,
+        chunk_size: int = 256,
+    ):
+        self.model = model
+        self._points = points
+        self._fields = set(fields)
+        self._vectors = set(vectors)
+        self._fetch = fetch
+        self._chunk_size = chunk_size
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return not self._fields and not self._vectors
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """
+        Payload fields not loaded yet.
+        """
+        return tuple(self._fields)
+
+    @property
+    def vectors(self) -> tuple[str, ...]:
+        """
+        Vector fields not loaded yet.
+        """
+        return tuple(self._vectors)
+
+    def pending(self) -> dict[types.PointId, list["PointModel"]]:
+        """
+        Points of the set by id.
+        """
+        points: dict[types.PointId, list["PointModel"]] = {}
+        for point in self._points:
+            points.setdefault(point.id, []).append(point)
+        return points
+
+    def load(self, name: str) -> None:
+        """
+        Load the deferred field `name` for the whole set, together with the
+        other deferred payload fields if it is one.
+        """
+        with self._lock:
+            if name in self._fields:
+                fields, vectors = list(self._fields), []
+            elif name in self._vectors:
+                fields, vectors = [], [name]
+            else:
+                return
+
+            if self._fetch is None:
+                raise AttributeError(
+                    f"Deferred field {name} of {self.model.__name__} must be loaded "
+                    "explicitly, e.g. `await crud.load_deferred(points)`"
+                )
+
+            ids = list(self.pending())
+            self.apply(
+                (
+                    record
+                    for chunk in batched(ids, self._chunk_size)
+                    for record in self._fetch(list(chunk), fields, vectors)
+                ),
+                fields,
+                vectors,
+            )
+
+    def apply(
+        self, records: Iterable[types.Record], fields: Sequence[str], vectors: Sequence[str]
+    ) -> None:
+        """
+        Set `fields` and `vectors` from `records` on the points of the set.
+
+        Fields assigned in the meantime are kept; fields missing from the
+        records get their default, vectors None.
+        """
+        records = {record.id: record for record in records}
+        defaults = self.model.__schema__.defaults
+        numpy_vectors = self.model.__numpy_vectors__
+        payload_slots = [(field, field_slot(self.model, field)) for field in fields]
+        vector_slots = [(field, field_slot(self.model, field)) for field in vectors]
+
+        for id, points in self.pending().items():
+            record = records.get(id)
+            payload = (record and record.payload) or {}
+            vector = (record and record.vector) or {}
+
+            for point in points:
+                for field, slot in payload_slots:
+                    if not _is_set(slot, point):
+                        slot.__set__(point, payload.get(field, defaults.get(field)))
+
+                for field, slot in vector_slots:
+                    if not _is_set(slot, point):
+                        value = vector.get(field)  # type: ignore
+                        if field in numpy_vectors:
+                            value = codegen._array(value, numpy_vectors[field])
+                        slot.__set__(point, value)
+
+        self._fields.difference_update(fields)
+        self._vectors.difference_update(vectors)
+
+        if self.loaded:
+            for point in self._points:
+                object.__setattr__(point, "_loader", None)
+            self._points = []
+
+
+def _is_set(slot: Any, point: "PointModel") -> bool:
+    try:
+        slot.__get__(point)
+    except AttributeError:
+        return False
+    return True
+
+
+def loaded_values(point: "PointModel") -> dict[str, Any]:
+    """
+    Fields of `point` by name, without the deferred ones not loaded yet.
+    """
+    model = type(point)
+    if point._loader is None:
+        return {field: getattr(point, field) for field in model.__schema__.fields}
+
+    values = {}
+    for field in model.__schema__.fields:
+        slot = field_slot(model, field)
+        if _is_set(slot, point):
+            values[field] = slot.__get__(point)
+    return values
+
+
+def defer(
+    model: "type[PointModel]",
+    points: list["PointModel"],
+    records: Sequence[types.Record],
+    fields: tuple[str, ...],
+    vectors: tuple[str, ...],
+    fetch: FetchFields | None,
+) -> None:
+    """
+    Unset the `fields` and `vectors` missing from the records of `points`
+    and attach a shared loader to the points that have some.
+    """
+    payload_slots = [(field, field_slot(model, field)) for field in fields]
+    vector_slots = [(field, field_slot(model, field)) for field in vectors]
+    deferred = []
+
+    for point, record in zip(points, records):
+        payload = record.payload or {}
+        vector = record.vector if isinstance(record.vector, dict) else {}
+        unset = False
+
+        for slots, present in ((payload_slots, payload), (vector_slots, vector)):
+            for field, slot in slots:
+                if field not in present:
+                    slot.__delete__(point)
+                    unset = True
+
+        if unset:
+            deferred.append(point)
+
+    if deferred:
+        loader = DeferredLoader(model, deferred, fields, vectors, fetch)
+        for point in deferred:
+            object.__setattr__(point, "_loader", loader)
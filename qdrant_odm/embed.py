@@ -0,0 +1,205 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+import numpy as np
+
+type EmbedFunction = Callable[[list[Any]], Sequence[Any]]
+
+
+class EmbeddingCache:
+    """
+    Persistent cache of embeddings by content hash, stored in SQLite.
+
+    Vectors are stored as float32, so a cache can be shared by any number of
+    processes and survives restarts; ":memory:" gives a per-process cache.
+    """
+
+    def __init__(self, path: str | os.PathLike = ":memory:"):
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, shape TEXT NOT NULL, data BLOB NOT NULL)"
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            # SQLite limits the number of bound parameters of a statement.
+            for chunk in batched(keys, 500):
+                rows = self._connection.execute(
+                    "SELECT key, shape, data FROM embeddings "
+                    f"WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, shape, data in rows:
+                    found[key] = np.frombuffer(data, dtype=np.float32).reshape(
+                        tuple(map(int, shape.split(",")))
+                    )
+        return found
+
+    def set_many(self, vectors: Mapping[str, Any]) -> None:
+        rows = []
+        for key, vector in vectors.items():
+            array = np.asarray(vector, dtype=np.float32)
+            rows.append((key, ",".join(map(str, array.shape)), array.tobytes()))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+def _namespace(function: EmbedFunction) -> str:
+    """
+    Module and qualified name of `function`, or of its type for callable
+    objects, as a default cache namespace.
+    """
+    named = function if hasattr(function, "__qualname__") else type(function)
+    return f"{named.__module__}.{named.__qualname__}"
+
+
+class Embedder:
+    """
+    Embedding function called in batches, on a worker pool, through an
+    optional content-hash cache.
+
+    `function` takes a list of source values (usually texts) and returns
+    one vector per value, or one list of vectors for multi-vector fields.
+    Equal values are embedded once per call, and values found in the cache
+    are not embedded at all.
+
+    Cache keys hash `name` together with the value, so `name` must change
+    whenever the embedding function does, e.g. `"minilm-l6-v2"`.
+
+        embedder = Embedder(model.encode, batch_size=128, workers=4,
+                            cache=EmbeddingCache("embeddings.db"), name="minilm")
+
+        class Chunk(PointModel[int]):
+            text: str
+            text_vector: list[float] = Vector(384, Distance.COSINE,
+                                              source="text", embedder=embedder)
+    """
+
+    def __init__(
+        self,
+        function: EmbedFunction,
+        batch_size: int = 64,
+        workers: int = 1,
+        cache: EmbeddingCache | str | os.PathLike | None = None,
+        name: str | None = None,
+    ):
+        """
+        Args:
+            function (EmbedFunction): Embeds a list of values.
+            batch_size (int, optional): Maximum number of values per call of `function`. Defaults to 64.
+            workers (int, optional): Number of calls of `function` run concurrently. Defaults to 1.
+            cache (EmbeddingCache | str | os.PathLike | None, optional): Cache, or path of a cache file. Defaults to None.
+            name (str | None, optional): Cache namespace, the module and qualified name of `function` by default. Defaults to None.
+
+        Raises:
+            ValueError: If a cached `function` is a lambda or a local function and has no `name`.
+        """
+        if batch_size < 1 or workers < 1:
+            raise ValueError("batch_size and workers must be positive")
+
+        namespace = name or _namespace(function)
+        # Lambdas and functions defined in the same function share their
+        # qualified name, so they would read each other's cached vectors.
+        if name is None and cache is not None and "<" in namespace:
+            raise ValueError(
+                f"Embedder of {namespace} needs a `name` to be cached: lambdas "
+                "and local functions have no unique qualified name"
+            )
+
+        self.function = function
+        self.batch_size = batch_size
+        self.workers = workers
+        self.cache = (
+            cache
+            if cache is None or isinstance(cache, EmbeddingCache)
+            else EmbeddingCache(cache)
+        )
+        self.name = namespace
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def chunk_size(self) -> int:
+        """
+        Number of values embedded by all the workers at once.
+        """
+        return self.batch_size * self.workers
+
+    def key(self, value: Any) -> str:
+        content = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+        return hashlib.sha256(f"{self.name}\0{content}".encode()).hexdigest()
+
+    def _call(self, values: list[Any]) -> Sequence[Any]:
+        vectors = self.function(values)
+        if len(vectors) != len(values):
+            raise ValueError(
+                f"Embedder {self.name} returned {len(vectors)} vectors for {len(values)} values"
+            )
+        return vectors
+
+    def _map(self, chunks: list[list[Any]]) -> Iterable[Sequence[Any]]:
+        if self.workers == 1 or len(chunks) == 1:
+            return map(self._call, chunks)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="embedder"
+                )
+        return self._executor.map(self._call, chunks)
+
+    def embed(self, values: Sequence[Any]) -> list[Any]:
+        """
+        Embed `values`, in order.
+        """
+        keys = [self.key(value) for value in values]
+        vectors: dict[str, Any] = {}
+        if self.cache is not None:
+            vectors = self.cache.get_many(set(keys))
+
+        missing = {
+            key: value for key, value in zip(keys, values) if key not in vectors
+        }
+        if missing:
+            chunks = [list(chunk) for chunk in batched(missing.items(), self.batch_size)]
+            computed = {}
+            for chunk, chunk_vectors in zip(
+                chunks, self._map([[value for _, value in chunk] for chunk in chunks])
+            ):
+                computed.update(zip((key for key, _ in chunk), chunk_vectors))
+
+            if self.cache is not None:
+                self.cache.set_many(computed)
+            vectors |= computed
+
+        return [vectors[key] for key in keys]
+
+    def close(self) -> None:
+        """
+        Stop the worker pool.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
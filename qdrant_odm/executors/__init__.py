@@ -0,0 +1,11 @@
+from importlib import import_module
+
+from .sync import PointCRUD
+
+# `async` is a keyword, so the module cannot be imported with an import statement.
+AsyncPointCRUD = import_module(".async", __name__).AsyncPointCRUD
+
+__all__ = [
+    "PointCRUD",
+    "AsyncPointCRUD",
+]
@@ -0,0 +1,568 @@
+import asyncio
+from functools import partial
+from itertools import batched, chain
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Sequence
+
+from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.conversions import common_types as types
+
+from qdrant_odm.bulk import (
+    RetryOptions,
+    aiter_points,
+    awith_embeddings,
+    write_batches_async,
+)
+from qdrant_odm.crud import (
+    ReadOptions,
+    WriteOptions,
+    _hashable,
+    _neighbour_requests,
+    _with_scores,
+)
+from qdrant_odm.filters import Expr, as_filter
+from qdrant_odm.instrument import count_points, instrumented, operation
+from qdrant_odm.lookup import AsyncGetBatcher, order_by_ids
+from qdrant_odm.model import PointModel
+from qdrant_odm.plan import QueryInput, QueryPlan
+from qdrant_odm.scroll import Page, aiter_pages
+
+
+class AsyncPointCRUD[T: PointModel]:
+    def __init__(
+        self,
+        point_model_type: type[T],
+        qdrant_client: AsyncQdrantClient | None = None,
+        get_batch_window: float | None = None,
+        max_get_batch_size: int = 256,
+    ):
+        """
+        Args:
+            point_model_type (type[T]): Model of the points.
+            qdrant_client (AsyncQdrantClient | None, optional): Client to use, the one the model was initialized with by `init_models` if None. Defaults to None.
+            get_batch_window (float | None, optional): If set, `get()` calls awaited concurrently within that many seconds are sent as one request. Defaults to None.
+            max_get_batch_size (int, optional): Maximum number of ids in a coalesced request. Defaults to 256.
+        """
+        if qdrant_client is None:
+            qdrant_client = getattr(point_model_type, "__async_client__", None)
+            if qdrant_client is None:
+                raise ValueError(
+                    f"{point_model_type.__name__} was not initialized with an async client"
+                )
+        self._qdrant_client = qdrant_client
+        self._point_model_type = point_model_type
+        self._get_batcher = (
+            None
+            if get_batch_window is None
+            else AsyncGetBatcher(self.get_many, get_batch_window, max_get_batch_size)
+        )
+
+    def _decoder(
+        self, read_options: ReadOptions
+    ) -> Callable[[Sequence[types.Record]], list[T]]:
+        # Deferred fields cannot be fetched on attribute access with an async
+        # client, they are loaded with `load_deferred()`.
+        return partial(
+            self._point_model_type._decode_records,
+            with_payload=read_options.with_payload,
+            with_vectors=read_options.with_vectors,
+            lazy=read_options.lazy,
+        )
+
+    @instrumented("get")
+    async def get(self, id: Any, read_options: ReadOptions = ReadOptions()) -> T | None:
+        """
+        Get a point from Qdrant.
+
+        Args:
+            id (T): The id of the point to get.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+
+        Returns:
+            T | None: The point, or None if it does not exist.
+        """
+        if self._get_batcher is not None and _hashable(read_options):
+            return await self._get_batcher.get(id, read_options)
+
+        return (await self.get_many([id], read_options))[0]
+
+    @instrumented("get_many")
+    async def get_many(
+        self,
+        ids: Iterable[Any],
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 256,
+    ) -> list[T | None]:
+        """
+        Get several points from Qdrant, sending the chunks concurrently.
+
+        Args:
+            ids (Iterable[Any]): The ids of the points to get.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of ids per request. Defaults to 256.
+
+        Returns:
+            list[T | None]: The points in the order of `ids`, None for missing ones.
+        """
+        model = self._point_model_type
+        with_vectors = read_options.with_vectors
+        ids = list(ids)
+
+        records, missing = model._cached_records(list(dict.fromkeys(ids)), with_vectors)
+        chunks = await asyncio.gather(
+            *(
+                self._qdrant_client.retrieve(
+                    model.__collection_name__,
+                    ids=list(chunk),
+                    **read_options._client_kwargs(),
+                )
+                for chunk in batched(missing, chunk_size)
+            )
+        )
+        for chunk in chunks:
+            model._cache_records(chunk, with_vectors, read_options.with_payload)
+
+        return order_by_ids(ids, chain(records, *chunks), self._decoder(read_options))
+
+    @instrumented("load_deferred")
+    async def load_deferred(
+        self,
+        points: Iterable[T],
+        *fields: str,
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 256,
+    ) -> None:
+        """
+        Load the fields the result sets of `points` were read without: payload
+        fields left out by a projection (`ReadOptions.only` or
+        `ReadOptions.defer`) and vectors not in `ReadOptions.with_vectors`.
+
+        Args:
+            points (Iterable[T]): Points read from Qdrant.
+            fields (str): Fields to load. Defaults to all the deferred ones.
+            read_options (ReadOptions, optional): Read options of the loading requests. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of ids per request. Defaults to 256.
+        """
+        loaders = {
+            id(loader): loader
+            for point in points
+            if (loader := point._loader) is not None and not loader.loaded
+        }
+
+        for loader in loaders.values():
+            payload_fields = [f for f in loader.fields if not fields or f in fields]
+            vector_fields = [f for f in loader.vectors if not fields or f in fields]
+            if not payload_fields and not vector_fields:
+                continue
+
+            fetch_options = read_options._replace(
+                with_payload=payload_fields or False,
+                with_vectors=vector_fields or False,
+            )
+            chunks = await asyncio.gather(
+                *(
+                    self._qdrant_client.retrieve(
+                        loader.model.__collection_name__,
+                        ids=list(chunk),
+                        **fetch_options._client_kwargs(),
+                    )
+                    for chunk in batched(loader.pending(), chunk_size)
+                )
+            )
+            loader.apply(chain.from_iterable(chunks), payload_fields, vector_fields)
+
+    async def scroll(
+        self,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
+        order_by: types.OrderBy | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 0,
+    ) -> AsyncIterator[list[T]]:
+        """
+        Scroll points from Qdrant.
+
+        Args:
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
+            order_by (types.OrderBy | None, optional): Order by. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched by a background task while the current one is processed. Defaults to 0.
+
+        Yields:
+            AsyncIterator[list[T]]: Async iterator of lists of points.
+        """
+
+        async def fetch(offset: types.PointId | None, limit: int) -> Page:
+            records, offset = await self._qdrant_client.scroll(
+                self._point_model_type.__collection_name__,
+                scroll_filter=as_filter(scroll_filter),
+                offset=offset,
+                limit=limit,
+                order_by=order_by,
+                **read_options._client_kwargs(),
+            )
+            self._point_model_type._cache_records(
+                records, read_options.with_vectors, read_options.with_payload
+            )
+            return records, offset
+
+        decode = self._decoder(read_options)
+        measure = partial(operation, "scroll", self._point_model_type)
+        async for page in aiter_pages(fetch, decode, limit, read_ahead, measure):
+            yield page
+
+    async def scroll_points(
+        self,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
+        order_by: types.OrderBy | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 1,
+    ) -> AsyncIterator[T]:
+        """
+        Scroll points from Qdrant one by one, reading the next page ahead.
+
+        Args:
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
+            order_by (types.OrderBy | None, optional): Order by. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched by a background task while the current one is processed. Defaults to 1.
+
+        Yields:
+            AsyncIterator[T]: Async iterator of points.
+        """
+        async for page in self.scroll(
+            scroll_filter, limit, order_by, read_options, read_ahead
+        ):
+            for point in page:
+                yield point
+
+    @instrumented("insert_many")
+    async def insert_many(
+        self,
+        *points: T | Iterable[T] | AsyncIterable[T],
+        batch_size: int | None = None,
+        parallel: int = 1,
+        write_options: WriteOptions = WriteOptions(),
+        retry: RetryOptions = RetryOptions(),
+    ) -> None:
+        """
+        Save the points to Qdrant.
+
+        Points are consumed lazily and sent in chunks, so a (async) generator
+        of any size can be inserted with flat memory usage. Failed chunks are
+        retried after a backoff when the error is transient, and split in
+        halves when too large for the server or timing out.
+
+        Args:
+            points (T | Iterable[T] | AsyncIterable[T]): Points or (async) iterables of points.
+            batch_size (int | None, optional): Number of points per upsert request, adapted to the request time if None. Defaults to None.
+            parallel (int, optional): Number of batches sent concurrently. Defaults to 1.
+            write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+            retry (RetryOptions, optional): Retries of failed chunks. Defaults to RetryOptions().
+
+        Raises:
+            BulkWriteError: If some points could not be written, with their ids.
+        """
+        write_kwargs = write_options._asdict()
+
+        async def send(batch: Sequence[T]) -> None:
+            await self._qdrant_client.upsert(
+                self._point_model_type.__collection_name__,
+                points=self._point_model_type._encode_points(batch),
+                **write_kwargs,
+            )
+            self._point_model_type._invalidate_cache(point.id for point in batch)
+
+        await write_batches_async(
+            send,
+            awith_embeddings(self._point_model_type, aiter_points(points)),
+            batch_size,
+            parallel,
+            retry,
+        )
+
+    @instrumented("delete_many")
+    async def delete_many(
+        self,
+        *points: T,
+        write_options: WriteOptions = WriteOptions(),
+    ) -> None:
+        """
+        Delete the points from Qdrant.
+
+        Args:
+            points (T): Points to delete.
+            write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+        """
+        ids = [point.id for point in points]
+        await self._qdrant_client.delete(
+            self._point_model_type.__collection_name__,
+            points_selector=models.PointIdsList(points=ids),
+            **write_options._asdict(),
+        )
+        count_points(len(ids))
+        self._point_model_type._invalidate_cache(ids)
+
+    @instrumented("count")
+    async def count(
+        self,
+        count_filter: types.Filter | Expr | None = None,
+        exact: bool = True,
+        shard_key_selector: types.ShardKeySelector | None = None,
+        timeout: int | None = None,
+    ) -> int:
+        """
+        Count points in collection.
+
+        Args:
+            count_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            exact (bool, optional): Whether to use exact count. Defaults to True.
+            shard_key_selector (types.ShardKeySelector | None, optional): Shard key selector. Defaults to None.
+            timeout (int | None, optional): Timeout. Defaults to None.
+
+        Returns:
+            int: Number of points
+        """
+        result = await self._qdrant_client.count(
+            self._point_model_type.__collection_name__,
+            count_filter=as_filter(count_filter),
+            exact=exact,
+            shard_key_selector=shard_key_selector,
+            timeout=timeout,
+        )
+        return result.count
+
+    @instrumented("save")
+    async def save(
+        self,
+        point: T,
+        overwrite_vectors: bool = False,
+        write_options: WriteOptions = WriteOptions(),
+    ) -> None:
+        """
+        Save the point to Qdrant.
+
+        A persisted point only sends the fields changed since it was loaded or
+        saved, in a single request; nothing is sent if no field changed.
+
+        Args:
+            point (T): The point to save.
+            overwrite_vectors (bool, optional): Whether to write changed vectors of an already persisted point. Defaults to False.
+            write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+        """
+        write_kwargs = write_options._asdict()
+        client = self._qdrant_client
+        collection_name = self._point_model_type.__collection_name__
+        if point.__embedded_fields__:
+            await asyncio.to_thread(self._point_model_type.fill_embeddings, [point])
+
+        if point._persisted:
+            operations, written = point._update_operations(
+                overwrite_vectors, write_options.shard_key_selector
+            )
+            if not operations:
+                return
+
+            await client.batch_update_points(
+                collection_name,
+                update_operations=operations,
+                wait=write_options.wait,
+                ordering=write_options.ordering,
+            )
+            point._changed -= written
+        else:
+            await client.upsert(
+                collection_name,
+                points=point._encode_points([point]),
+                **write_kwargs,
+            )
+            point._persisted = True
+            point._changed.clear()
+
+        self._point_model_type._invalidate_cache([point.id])
+
+    @instrumented("delete")
+    async def delete(self, id: Any, write_options: WriteOptions = WriteOptions()) -> None:
+        """
+        Delete the point from Qdrant.
+
+        Args:
+            id (Any): The id of the point to delete.
+            write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+        """
+        await self._qdrant_client.delete(
+            self._point_model_type.__collection_name__,
+            points_selector=[id],
+            **write_options._asdict(),
+        )
+        count_points(1)
+        self._point_model_type._invalidate_cache([id])
+
+    @instrumented("neighbours")
+    async def neighbours(
+        self,
+        point: T,
+        using: str,
+        limit: int = 10,
+        score_threshold: float | None = None,
+        query_filter: types.Filter | Expr | None = None,
+        prefetch: types.Prefetch | list[types.Prefetch] | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        search_params: types.SearchParams | None = None,
+    ) -> list[tuple[T, float]]:
+        """
+        Get neighbours for the point.
+
+        Args:
+            point (T): The persisted point to find neighbours for.
+            using (str): which vector field to use
+            limit (int, optional): Limit. Defaults to 10.
+            score_threshold (float | None, optional): Score threshold. Defaults to None.
+            query_filter (types.Filter | Expr | None, optional): Query filter. Defaults to None.
+            prefetch (types.Prefetch | list[types.Prefetch] | None, optional): Prefetch. Defaults to the stages stacked with `point.prefetch(...)`.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            search_params (SearchParams, optional): Search params.
+
+        Returns:
+            list[tuple[T, float]]: Neighbours with their scores.
+        """
+        if not point._persisted:
+            raise ValueError(
+                "Cannot get neighbours for non-persisted point. You need to save it first."
+            )
+
+        response = await self._qdrant_client.query_points(
+            self._point_model_type.__collection_name__,
+            query=point.id,
+            using=using,
+            limit=limit,
+            score_threshold=score_threshold,
+            query_filter=as_filter(query_filter),
+            prefetch=prefetch or point._prefetch(),
+            search_params=search_params,
+            **read_options._client_kwargs(),
+        )
+        self._point_model_type._cache_records(
+            response.points, read_options.with_vectors, read_options.with_payload
+        )
+
+        return _with_scores(self._decoder(read_options), [response.points])[0]
+
+    @instrumented("neighbours_many")
+    async def neighbours_many(
+        self,
+        points_or_ids: Iterable[T | Any],
+        using: str,
+        limit: int = 10,
+        score_threshold: float | None = None,
+        query_filter: types.Filter | Expr | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        search_params: types.SearchParams | None = None,
+        chunk_size: int = 64,
+    ) -> list[list[tuple[T, float]]]:
+        """
+        Get neighbours for several points with `query_batch_points`, sending
+        the chunks of `chunk_size` queries concurrently.
+
+        Args:
+            points_or_ids (Iterable[T | Any]): Persisted points or point ids.
+            using (str): which vector field to use
+            limit (int, optional): Limit per point. Defaults to 10.
+            score_threshold (float | None, optional): Score threshold. Defaults to None.
+            query_filter (types.Filter | Expr | None, optional): Query filter. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            search_params (SearchParams, optional): Search params.
+            chunk_size (int, optional): Maximum number of queries per request. Defaults to 64.
+
+        Returns:
+            list[list[tuple[T, float]]]: Neighbours with their scores, in the order of `points_or_ids`.
+        """
+        model = self._point_model_type
+        requests = _neighbour_requests(
+            points_or_ids,
+            using,
+            limit,
+            score_threshold,
+            query_filter,
+            read_options,
+            search_params,
+        )
+        chunks = await asyncio.gather(
+            *(
+                self._qdrant_client.query_batch_points(
+                    model.__collection_name__,
+                    requests=chunk,
+                    consistency=read_options.consistency,
+                    timeout=read_options.timeout,
+                )
+                for chunk in batched(requests, chunk_size)
+            )
+        )
+        results = [response.points for response in chain.from_iterable(chunks)]
+
+        for points in results:
+            model._cache_records(
+                points, read_options.with_vectors, read_options.with_payload
+            )
+
+        return _with_scores(self._decoder(read_options), results)
+
+    @instrumented("query")
+    async def query(
+        self,
+        plan: QueryPlan[T],
+        query: QueryInput,
+        read_options: ReadOptions = ReadOptions(),
+    ) -> list[tuple[T, float]]:
+        """
+        Run a query plan.
+
+        Args:
+            plan (QueryPlan[T]): The plan to run.
+            query (QueryInput): Point id, persisted point, vector or mapping of vector fields to vectors.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+
+        Returns:
+            list[tuple[T, float]]: Points with their scores.
+        """
+        response = await self._qdrant_client.query_points(
+            **plan._query_kwargs(query, read_options)
+        )
+        return plan._decode([response.points], read_options, None)[0]
+
+    @instrumented("query_many")
+    async def query_many(
+        self,
+        plan: QueryPlan[T],
+        queries: Iterable[QueryInput],
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 64,
+    ) -> list[list[tuple[T, float]]]:
+        """
+        Run a query plan for several queries, sending the chunks of
+        `chunk_size` queries concurrently with `query_batch_points`.
+
+        Args:
+            plan (QueryPlan[T]): The plan to run.
+            queries (Iterable[QueryInput]): Queries, see `query`.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of queries per request. Defaults to 64.
+
+        Returns:
+            list[list[tuple[T, float]]]: Points with their scores, in the order of `queries`.
+        """
+        chunks = await asyncio.gather(
+            *(
+                self._qdrant_client.query_batch_points(
+                    plan.model.__collection_name__,
+                    requests=chunk,
+                    consistency=read_options.consistency,
+                    timeout=read_options.timeout,
+                )
+                for chunk in batched(plan._requests(queries, read_options), chunk_size)
+            )
+        )
+        results = [response.points for response in chain.from_iterable(chunks)]
+        return plan._decode(results, read_options, None)
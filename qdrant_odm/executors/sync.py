@@ -1,19 +1,58 @@
-from typing import Any, Iterator, Self
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, Sequence
 
 from qdrant_client import QdrantClient, models
 from qdrant_client.conversions import common_types as types
 
-from qdrant_odm.crud import ReadOptions, WriteOptions
+from qdrant_odm.bulk import RetryOptions, iter_points, with_embeddings, write_batches
+from qdrant_odm.crud import ReadOptions, WriteOptions, _fetch_fields, _hashable
+from qdrant_odm.filters import Expr, as_filter
+from qdrant_odm.instrument import count_points, instrumented, operation
+from qdrant_odm.lookup import GetBatcher, retrieve_many
 from qdrant_odm.model import PointModel
+from qdrant_odm.pool import ClientPool
+from qdrant_odm.scroll import Page, iter_pages
 
 
 
 class PointCRUD[T: PointModel]:
-    def __init__(self, point_model_type: type[T], qdrant_client: QdrantClient):
+    def __init__(
+        self,
+        point_model_type: type[T],
+        qdrant_client: QdrantClient | ClientPool,
+        get_batch_window: float | None = None,
+        max_get_batch_size: int = 256,
+    ):
+        """
+        Args:
+            point_model_type (type[T]): Model of the points.
+            qdrant_client (QdrantClient | ClientPool): Client, or pool of clients, to use.
+            get_batch_window (float | None, optional): If set, `get()` calls made concurrently within that many seconds are sent as one request. Defaults to None.
+            max_get_batch_size (int, optional): Maximum number of ids in a coalesced request. Defaults to 256.
+        """
         self._qdrant_client = qdrant_client
         self._point_model_type = point_model_type
-        
-    def get(self, id: Any, read_options: ReadOptions = ReadOptions()) -> T:
+        self._get_batcher = (
+            None
+            if get_batch_window is None
+            else GetBatcher(self.get_many, get_batch_window, max_get_batch_size)
+        )
+
+    def _decoder(
+        self, read_options: ReadOptions
+    ) -> Callable[[Sequence[types.Record]], list[T]]:
+        model = self._point_model_type
+        return partial(
+            model._decode_records,
+            with_payload=read_options.with_payload,
+            with_vectors=read_options.with_vectors,
+            fetch=_fetch_fields(self._qdrant_client, model, read_options),
+            lazy=read_options.lazy,
+        )
+
+    @instrumented("get")
+    def get(self, id: Any, read_options: ReadOptions = ReadOptions()) -> T | None:
         """
         Get a point from Qdrant.
 
@@ -22,70 +61,163 @@ class PointCRUD[T: PointModel]:
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
 
         Returns:
-            Self: The point.
+            T | None: The point, or None if it does not exist.
         """
-        record, *_ = self._qdrant_client.retrieve(
-            self._point_model_type.__collection_name__, ids=[id], **read_options._asdict()
-        )
-        return self._point_model_type._from_record(record, set_persisted=True)
-    
+        if self._get_batcher is not None and _hashable(read_options):
+            return self._get_batcher.get(id, read_options)
+
+        return self.get_many([id], read_options)[0]
+
+    @instrumented("get_many")
+    def get_many(
+        self,
+        ids: Iterable[Any],
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 256,
+    ) -> list[T | None]:
+        """
+        Get several points from Qdrant in as few requests as possible.
+
+        Args:
+            ids (Iterable[Any]): The ids of the points to get.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of ids per request. Defaults to 256.
+
+        Returns:
+            list[T | None]: The points in the order of `ids`, None for missing ones.
+        """
+
+        model = self._point_model_type
+        with_vectors = read_options.with_vectors
+
+        def retrieve(ids: list[Any]) -> Sequence[types.Record]:
+            records, missing = model._cached_records(ids, with_vectors)
+
+            if missing:
+                fetched = self._qdrant_client.retrieve(
+                    model.__collection_name__, ids=missing, **read_options._client_kwargs()
+                )
+                model._cache_records(fetched, with_vectors, read_options.with_payload)
+                records += fetched
+
+            return records  # type: ignore
+
+        return retrieve_many(retrieve, self._decoder(read_options), ids, chunk_size)
+
     def scroll(
         self,
-        scroll_filter: types.Filter | None = None,
-        limit: int = 10,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
         order_by: types.OrderBy | None = None,
         read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 0,
     ) -> Iterator[list[T]]:
         """
         Scroll points from Qdrant.
 
         Args:
-            scroll_filter (types.Filter | None, optional): Filter to apply. Defaults to None.
-            limit (int, optional): Number of points to fetch per scroll. Defaults to 10.
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
             order_by (types.OrderBy | None, optional): Order by. Defaults to None.
             read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched in background while the current one is processed. Defaults to 0.
 
         Yields:
             Iterator[list[T]]: Iterator of lists of points.
         """
-        offset = None
 
-        while True:
+        def fetch(offset: types.PointId | None, limit: int) -> Page:
             records, offset = self._qdrant_client.scroll(
                 self._point_model_type.__collection_name__,
-                scroll_filter=scroll_filter,
+                scroll_filter=as_filter(scroll_filter),
                 offset=offset,
                 limit=limit,
                 order_by=order_by,
-                **read_options._asdict(),
+                **read_options._client_kwargs(),
+            )
+            self._point_model_type._cache_records(
+                records, read_options.with_vectors, read_options.with_payload
             )
-            yield [self._point_model_type._from_record(record, set_persisted=True) for record in records]
+            return records, offset
 
-            if offset is None:
-                break
-    
+        return iter_pages(
+            fetch,
+            self._decoder(read_options),
+            limit,
+            read_ahead,
+            partial(operation, "scroll", self._point_model_type),
+        )
+
+    def scroll_points(
+        self,
+        scroll_filter: types.Filter | Expr | None = None,
+        limit: int | None = None,
+        order_by: types.OrderBy | None = None,
+        read_options: ReadOptions = ReadOptions(),
+        read_ahead: int = 1,
+    ) -> Iterator[T]:
+        """
+        Scroll points from Qdrant one by one, reading the next page ahead.
+
+        Args:
+            scroll_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
+            limit (int | None, optional): Number of points to fetch per scroll. Adapted to the response time if None. Defaults to None.
+            order_by (types.OrderBy | None, optional): Order by. Defaults to None.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            read_ahead (int, optional): Number of pages fetched in background while the current one is processed. Defaults to 1.
+
+        Yields:
+            Iterator[T]: Iterator of points.
+        """
+        pages = self.scroll(scroll_filter, limit, order_by, read_options, read_ahead)
+        return chain.from_iterable(pages)
+
+    @instrumented("insert_many")
     def insert_many(
         self,
-        *points: T,
+        *points: T | Iterable[T],
+        batch_size: int | None = None,
+        parallel: int = 1,
         write_options: WriteOptions = WriteOptions(),
+        retry: RetryOptions = RetryOptions(),
     ) -> None:
         """
         Save the points to Qdrant.
 
+        Points are consumed lazily and sent in chunks, so a generator of any
+        size can be inserted with flat memory usage. Failed chunks are retried
+        after a backoff when the error is transient, and split in halves when
+        too large for the server or timing out.
+
         Args:
+            points (T | Iterable[T]): Points or iterables of points.
+            batch_size (int | None, optional): Number of points per upsert request, adapted to the request time if None. Defaults to None.
+            parallel (int, optional): Number of batches sent concurrently. Defaults to 1.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+            retry (RetryOptions, optional): Retries of failed chunks. Defaults to RetryOptions().
+
+        Raises:
+            BulkWriteError: If some points could not be written, with their ids.
         """
-        self._qdrant_client.upsert(
-            self._point_model_type.__collection_name__,
-            points=[
-                models.PointStruct(
-                    id=point.id, payload=point.payload(), vector=point.vectors()
-                )
-                for point in points
-            ],
-            **write_options._asdict(),
+        write_kwargs = write_options._asdict()
+
+        def send(batch: Sequence[T]) -> None:
+            self._qdrant_client.upsert(
+                self._point_model_type.__collection_name__,
+                points=self._point_model_type._encode_points(batch),
+                **write_kwargs,
+            )
+            self._point_model_type._invalidate_cache(point.id for point in batch)
+
+        write_batches(
+            send,
+            with_embeddings(self._point_model_type, iter_points(points)),
+            batch_size,
+            parallel,
+            retry,
         )
-        
+
+    @instrumented("delete_many")
     def delete_many(
         self,
         *points: T,
@@ -98,15 +230,19 @@ class PointCRUD[T: PointModel]:
             points_selector (Iterable[T]): Points selector.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
         """
+        ids = [point.id for point in points]
         self._qdrant_client.delete(
             self._point_model_type.__collection_name__,
-            points_selector=models.PointIdsList(points=[point.id for point in points]),
+            points_selector=models.PointIdsList(points=ids),
             **write_options._asdict(),
         )
+        count_points(len(ids))
+        self._point_model_type._invalidate_cache(ids)
 
+    @instrumented("count")
     def count(
         self,
-        count_filter: types.Filter | None = None,
+        count_filter: types.Filter | Expr | None = None,
         exact: bool = True,
         shard_key_selector: types.ShardKeySelector | None = None,
         timeout: int | None = None,
@@ -115,7 +251,7 @@ class PointCRUD[T: PointModel]:
         Count points in collection.
 
         Args:
-            count_filter (types.Filter | None, optional): Filter to apply. Defaults to None.
+            count_filter (types.Filter | Expr | None, optional): Filter to apply. Defaults to None.
             exact (bool, optional): Whether to use exact count. Defaults to True.
             shard_key_selector (types.ShardKeySelector | None, optional): Shard key selector. Defaults to None.
             timeout (int | None, optional): Timeout. Defaults to None.
@@ -125,13 +261,14 @@ class PointCRUD[T: PointModel]:
         """
         result = self._qdrant_client.count(
             self._point_model_type.__collection_name__,
-            count_filter=count_filter,
+            count_filter=as_filter(count_filter),
             exact=exact,
             shard_key_selector=shard_key_selector,
             timeout=timeout,
         )
         return result.count
 
+    @instrumented("save")
     def save(
         self,
         point: T,
@@ -141,41 +278,44 @@ class PointCRUD[T: PointModel]:
         """
         Save the point to Qdrant.
 
+        A persisted point only sends the fields changed since it was loaded or
+        saved, in a single request; nothing is sent if no field changed.
+
         Args:
-            overwrite_vectors (bool, optional): Whether to overwrite the vectors if they already exist. Defaults to False.
+            overwrite_vectors (bool, optional): Whether to write changed vectors of an already persisted point. Defaults to False.
             write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
         """
         write_kwargs = write_options._asdict()
         client = self._qdrant_client
         collection_name = self._point_model_type.__collection_name__
-        payload = point.payload()
+        self._point_model_type.fill_embeddings([point])
 
         if point._persisted:
-            client.set_payload(
-                collection_name,
-                payload=payload,
-                points=[point.id],
-                **write_kwargs,
+            operations, written = point._update_operations(
+                overwrite_vectors, write_options.shard_key_selector
             )
+            if not operations:
+                return
 
-            if overwrite_vectors:
-                client.update_vectors(
-                    collection_name,
-                    points=[models.PointVectors(id=point.id, vector=point.vectors())],
-                    **write_kwargs,
-                )
+            client.batch_update_points(
+                collection_name,
+                update_operations=operations,
+                wait=write_options.wait,
+                ordering=write_options.ordering,
+            )
+            point._changed -= written
         else:
             client.upsert(
                 collection_name,
-                points=[
-                    models.PointStruct(
-                        id=point.id, payload=payload, vector=point.vectors()
-                    )
-                ],
+                points=point._encode_points([point]),
                 **write_kwargs,
             )
             point._persisted = True
+            point._changed.clear()
 
+        self._point_model_type._invalidate_cache([point.id])
+
+    @instrumented("delete")
     def delete(self, id: Any, write_options: WriteOptions = WriteOptions()) -> None:
         """
         Delete the point from Qdrant.
@@ -188,46 +328,8 @@ class PointCRUD[T: PointModel]:
             points_selector=[id],
             **write_options._asdict(),
         )
-
-    def prefetch(
-        self,
-        using: str,
-        limit: int | None = None,
-        score_threshold: float | None = None,
-        prefetch_filter: types.Filter | None = None,
-        params: types.SearchParams | None = None,
-    ) -> Self:
-        """
-        Prefetch points from Qdrant.
-
-        Args:
-            using (str): The using vector to use.
-            limit (int | None, optional): The limit of points to prefetch. Defaults to None.
-            score_threshold (float | None, optional): The score threshold to use. Defaults to None.
-            prefetch_filter (types.Filter | None, optional): The filter to use. Defaults to None.
-            params (types.SearchParams | None, optional): The search params to use. Defaults to None.
-        """
-
-        # if not self._context_prefetch_is_on:
-        #     raise ValueError(
-        #         "Prefetch must be used in context manager. "
-        #         "Use `with point.prefetch(...):`"
-        #     )
-
-        self._context_prefetch_is_on = False
-
-        prefetch_query = models.Prefetch(
-            query=self.id,
-            using=using,
-            limit=limit,
-            score_threshold=score_threshold,
-            filter=prefetch_filter,  # type: ignore
-            prefetch=self._current_prefetch,
-            params=params,  # type: ignore
-        )
-
-        self._current_prefetch = prefetch_query
-        return self
+        count_points(1)
+        self._point_model_type._invalidate_cache([id])
 
 if __name__ == "__main__":
     class CustomPoint(PointModel[int]):
@@ -0,0 +1,469 @@
+import json
+import os
+from pathlib import Path
+from types import get_original_bases
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterator,
+    Literal,
+    Sequence,
+    TypeVar,
+    get_args,
+    get_origin,
+)
+
+import numpy as np
+from qdrant_client import models
+from qdrant_client.conversions import common_types as types
+
+from .bulk import write_batches
+from .crud import ReadOptions, WriteOptions
+from .filters import Expr, as_filter
+from .model import PointModel
+from .scroll import iter_pages
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+type Format = Literal["parquet", "arrow"]
+
+MANIFEST = "manifest.json"
+# Column of the payload keys that are not fields of the model, as JSON.
+EXTRA_COLUMN = "__extra__"
+
+_TABLES = {"parquet": "payload.parquet", "arrow": "payload.arrow"}
+_SCALARS = {str: "string", int: "int64", float: "float64", bool: "bool_"}
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "Columnar export needs pyarrow: `pip install qdrant-odm[arrow]`"
+        ) from None
+    return pa
+
+
+def _encoding(type_: Any) -> str:
+    """
+    Arrow type of a payload field annotated `type_`, or "json" for fields
+    stored as JSON text.
+    """
+    args = get_args(type_)
+    if type(None) in args and len(args) == 2:
+        type_ = next(arg for arg in args if arg is not type(None))
+    return _SCALARS.get(type_, "json")
+
+
+def _declared_id_type(model: type[PointModel]) -> Any:
+    """
+    Type argument of the `PointModel[...]` base of `model`, None if it is
+    left generic.
+    """
+    for cls in model.__mro__:
+        for base in get_original_bases(cls):
+            origin = get_origin(base)
+            if isinstance(origin, type) and issubclass(origin, PointModel):
+                [id_type] = get_args(base)
+                return None if isinstance(id_type, TypeVar) else id_type
+    return None
+
+
+def _parse_id(value: str) -> types.PointId:
+    return int(value) if value.isdigit() else value
+
+
+def _layout(model: type[PointModel]) -> dict[str, Any]:
+    """
+    Columns of an export of `model`: the id encoding, payload fields with
+    their encoding, vector fields with their kind, size and dtype, and the
+    column of the undeclared payload keys.
+    """
+    fields = model.__schema__.fields
+    vectors_config = model.__index_config__["vectors_config"]
+    sparse_config = model.__index_config__["sparse_vectors_config"]
+    payload = {field: _encoding(fields[field]) for field in model.__payload_fields__}
+    vectors: dict[str, dict[str, Any]] = {}
+    for field, params in vectors_config.items():
+        if params.multivector_config is None:
+            dtype = model.__numpy_vectors__.get(field, np.dtype(np.float32))
+            vectors[field] = {
+                "kind": "dense",
+                "size": params.size,
+                "dtype": np.dtype(dtype).str,
+                "file": f"{field}.npy",
+            }
+        else:
+            vectors[field] = {"kind": "multi", "size": params.size}
+    for field in sparse_config:
+        vectors[field] = {"kind": "sparse"}
+
+    # Ids of other models, int ones included, are written as strings.
+    id_encoding = "int64" if _declared_id_type(model) is int else "string"
+    return {
+        "id": id_encoding,
+        "payload": payload,
+        "vectors": vectors,
+        "extra": EXTRA_COLUMN,
+    }
+
+
+def _schema(pa: Any, layout: dict[str, Any]) -> "pa.Schema":
+    columns = [pa.field("id", getattr(pa, layout["id"])(), nullable=False)]
+
+    for field, encoding in layout["payload"].items():
+        type_ = pa.large_string() if encoding == "json" else getattr(pa, encoding)()
+        columns.append(pa.field(field, type_))
+    columns.append(pa.field(layout["extra"], pa.large_string()))
+
+    for field, vector in layout["vectors"].items():
+        if vector["kind"] == "multi":
+            columns.append(pa.field(field, pa.list_(pa.list_(pa.float32()))))
+        elif vector["kind"] == "sparse":
+            columns.append(
+                pa.field(
+                    field,
+                    pa.struct(
+                        [
+                            ("indices", pa.list_(pa.uint32())),
+                            ("values", pa.list_(pa.float32())),
+                        ]
+                    ),
+                )
+            )
+
+    return pa.schema(columns)
+
+
+def _table_columns(
+    records: Sequence[types.Record], layout: dict[str, Any]
+) -> dict[str, list[Any]]:
+    columns: dict[str, list[Any]] = {
+        "id": [
+            record.id if layout["id"] == "int64" else str(record.id) for record in records
+        ]
+    }
+    payloads = [record.payload or {} for record in records]
+    vectors = [
+        record.vector if isinstance(record.vector, dict) else {} for record in records
+    ]
+
+    for field, encoding in layout["payload"].items():
+        values = [payload.get(field) for payload in payloads]
+        if encoding == "json":
+            values = [None if value is None else json.dumps(value) for value in values]
+        columns[field] = values
+
+    declared = layout["payload"]
+    extras = [
+        {key: value for key, value in payload.items() if key not in declared}
+        for payload in payloads
+    ]
+    columns[layout["extra"]] = [json.dumps(extra) if extra else None for extra in extras]
+
+    for field, vector in layout["vectors"].items():
+        if vector["kind"] == "multi":
+            columns[field] = [point.get(field) for point in vectors]
+        elif vector["kind"] == "sparse":
+            columns[field] = [
+                None
+                if (value := point.get(field)) is None
+                else {"indices": value.indices, "values": value.values}  # type: ignore
+                for point in vectors
+            ]
+
+    return columns
+
+
+def _write_manifest(path: Path, manifest: dict[str, Any]) -> None:
+    # Written last and atomically: a directory without a manifest is an
+    # interrupted export.
+    temporary = path / f"{MANIFEST}.tmp"
+    temporary.write_text(json.dumps(manifest, indent=2))
+    os.replace(temporary, path / MANIFEST)
+
+
+def export_collection(
+    model: type[PointModel],
+    path: str | os.PathLike,
+    scroll_filter: types.Filter | Expr | None = None,
+    format: Format = "parquet",
+    batch_size: int = 1024,
+    read_ahead: int = 1,
+    read_options: ReadOptions = ReadOptions(),
+) -> int:
+    """
+    Dump the points of a model into a directory, one column per field.
+
+    Payload fields and sparse and multi-vector fields go to a Parquet (or
+    Arrow IPC) file, one row group per scroll page, with the payload keys
+    that are not fields of the model as JSON in an extra column. Dense vector fields go
+    to one `.npy` file each, memory-mapped and filled page by page, so
+    memory use is bounded by `batch_size` whatever the collection size.
+    Points missing a dense vector get a row of NaN.
+
+    The number of points is counted first to size the vector files; points
+    inserted while the export runs may be left out.
+
+    Args:
+        model (type[PointModel]): Model of the exported collection.
+        path (str | os.PathLike): Output directory, created if needed.
+        scroll_filter (types.Filter | Expr | None, optional): Only export matching points. Defaults to None.
+        format (Format, optional): "parquet" or "arrow" for the payload table. Defaults to "parquet".
+        batch_size (int, optional): Points per scroll page and row group. Defaults to 1024.
+        read_ahead (int, optional): Pages fetched while the current one is written. Defaults to 1.
+        read_options (ReadOptions, optional): Consistency, shard keys and timeout of the reads; the selected fields are ignored. Defaults to ReadOptions().
+
+    Returns:
+        int: Number of exported points.
+    """
+    pa = _pyarrow()
+    client = model.__client__
+    collection_name = model.__collection_name__
+    scroll_filter = as_filter(scroll_filter)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    layout = _layout(model)
+    count = client.count(
+        collection_name,
+        count_filter=scroll_filter,
+        exact=True,
+        shard_key_selector=read_options.shard_key_selector,
+        timeout=read_options.timeout,
+    ).count
+    read_kwargs = read_options._replace(
+        with_payload=True, with_vectors=list(model.__vector_fields__) or False
+    )._client_kwargs()
+
+    def fetch(offset: types.PointId | None, limit: int):
+        return client.scroll(
+            collection_name,
+            scroll_filter=scroll_filter,
+            offset=offset,
+            limit=limit,
+            **read_kwargs,
+        )
+
+    arrays = {
+        field: np.lib.format.open_memmap(
+            path / vector["file"],
+            mode="w+",
+            dtype=np.dtype(vector["dtype"]),
+            shape=(count, vector["size"]),
+        )
+        for field, vector in layout["vectors"].items()
+        if vector["kind"] == "dense"
+    }
+    table_path = path / _TABLES[format]
+    schema = _schema(pa, layout)
+    writer, rows = None, 0
+
+    try:
+        for records in iter_pages(fetch, list, batch_size, read_ahead):
+            records = records[: count - rows]
+            if not records:
+                break
+
+            if writer is None:
+                writer = (
+                    pa.parquet.ParquetWriter(table_path, schema)
+                    if format == "parquet"
+                    else pa.ipc.new_file(table_path, schema)
+                )
+
+            writer.write_table(
+                pa.Table.from_pydict(_table_columns(records, layout), schema=schema)
+            )
+
+            for field, array in arrays.items():
+                missing = np.full(array.shape[1], np.nan, dtype=array.dtype)
+                array[rows : rows + len(records)] = [
+                    missing if vector is None else vector
+                    for vector in (
+                        record.vector.get(field)  # type: ignore
+                        if isinstance(record.vector, dict)
+                        else None
+                        for record in records
+                    )
+                ]
+            rows += len(records)
+    finally:
+        if writer is not None:
+            writer.close()
+        for array in arrays.values():
+            array.flush()
+
+    if writer is None:
+        empty = pa.Table.from_pylist([], schema=schema)
+        if format == "parquet":
+            pa.parquet.write_table(empty, table_path)
+        else:
+            with pa.ipc.new_file(table_path, schema) as writer:
+                writer.write_table(empty)
+
+    _write_manifest(
+        path,
+        {
+            "model": model.__name__,
+            "collection_name": collection_name,
+            "count": rows,
+            "format": format,
+            "table": _TABLES[format],
+            **layout,
+        },
+    )
+    return rows
+
+
+def _read_batches(
+    pa: Any, table_path: Path, format: Format, batch_size: int
+) -> Iterator["pa.RecordBatch"]:
+    if format == "parquet":
+        yield from pa.parquet.ParquetFile(table_path).iter_batches(batch_size)
+        return
+
+    with pa.memory_map(str(table_path)) as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            batch = reader.get_batch(index)
+            for offset in range(0, batch.num_rows, batch_size):
+                yield batch.slice(offset, batch_size)
+
+
+def read_manifest(path: str | os.PathLike) -> dict[str, Any]:
+    """
+    Manifest of an export directory.
+
+    Raises:
+        ValueError: If the directory holds no complete export.
+    """
+    try:
+        return json.loads((Path(path) / MANIFEST).read_text())
+    except FileNotFoundError:
+        raise ValueError(f"{path} holds no complete export, {MANIFEST} is missing") from None
+
+
+def _check_layout(model: type[PointModel], manifest: dict[str, Any]) -> None:
+    layout = _layout(model)
+
+    for field, vector in manifest["vectors"].items():
+        expected = layout["vectors"].get(field)
+        if expected is None:
+            raise ValueError(f"{field} is not a vector field of {model.__name__}")
+        if expected["kind"] != vector["kind"] or expected.get("size") != vector.get("size"):
+            raise ValueError(
+                f"Vector field {field} of the export does not match {model.__name__}: "
+                f"{vector} != {expected}"
+            )
+
+    unknown = set(manifest["payload"]) - set(layout["payload"])
+    if unknown:
+        raise ValueError(
+            f"Payload fields {sorted(unknown)} are not fields of {model.__name__}"
+        )
+
+
+def import_collection(
+    model: type[PointModel],
+    path: str | os.PathLike,
+    batch_size: int = 256,
+    parallel: int = 1,
+    write_options: WriteOptions = WriteOptions(),
+) -> int:
+    """
+    Upsert the points of an `export_collection` directory into the
+    collection of `model`.
+
+    Rows are read in batches and the vector files are memory-mapped, so the
+    import runs in bounded memory. Points are built straight from the
+    columns, without going through model instances.
+
+    Args:
+        model (type[PointModel]): Model of the collection to write to.
+        path (str | os.PathLike): Export directory.
+        batch_size (int, optional): Points per upsert request. Defaults to 256.
+        parallel (int, optional): Number of batches sent concurrently. Defaults to 1.
+        write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+
+    Returns:
+        int: Number of imported points.
+
+    Raises:
+        ValueError: If the export does not match the fields of `model`.
+        BulkWriteError: If some batches failed, with the ids of their points.
+    """
+    pa = _pyarrow()
+    path = Path(path)
+    manifest = read_manifest(path)
+    _check_layout(model, manifest)
+
+    payload_fields = manifest["payload"]
+    vector_fields = manifest["vectors"]
+    # Exports made before the id encoding and extra column were recorded
+    # have neither.
+    parse_id = _parse_id if manifest.get("id") == "string" else None
+    extra_column = manifest.get("extra")
+    arrays = {
+        field: np.load(path / vector["file"], mmap_mode="r")
+        for field, vector in vector_fields.items()
+        if vector["kind"] == "dense"
+    }
+    columns_fields = [field for field in vector_fields if field not in arrays]
+    count = manifest["count"]
+
+    def points() -> Iterator[models.PointStruct]:
+        rows = 0
+        batches = _read_batches(pa, path / manifest["table"], manifest["format"], batch_size)
+
+        for batch in batches:
+            size = min(batch.num_rows, count - rows)
+            columns = batch.to_pydict()
+            blocks = {field: array[rows : rows + size] for field, array in arrays.items()}
+
+            for index in range(size):
+                payload = {}
+                for field, encoding in payload_fields.items():
+                    value = columns[field][index]
+                    if value is not None:
+                        payload[field] = (
+                            json.loads(value) if encoding == "json" else value
+                        )
+                if extra_column and (extra := columns[extra_column][index]) is not None:
+                    payload |= json.loads(extra)
+
+                vector: dict[str, Any] = {}
+                for field, block in blocks.items():
+                    row = block[index]
+                    if not np.isnan(row).all():
+                        vector[field] = row.tolist()
+                for field in columns_fields:
+                    value = columns[field][index]
+                    if value is not None:
+                        vector[field] = (
+                            models.SparseVector(**value)
+                            if vector_fields[field]["kind"] == "sparse"
+                            else value
+                        )
+
+                id = columns["id"][index]
+                yield models.PointStruct(
+                    id=id if parse_id is None else parse_id(id),
+                    payload=payload,
+                    vector=vector,
+                )
+            rows += size
+
+    write_kwargs = write_options._asdict()
+
+    def send(batch: Sequence[models.PointStruct]) -> None:
+        model.__client__.upsert(
+            model.__collection_name__, points=list(batch), **write_kwargs
+        )
+        model._invalidate_cache(point.id for point in batch)
+
+    write_batches(send, points(), batch_size, parallel)  # type: ignore
+    return count
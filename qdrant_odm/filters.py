@@ -0,0 +1,423 @@
+import os
+import warnings
+from datetime import date
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, NamedTuple
+
+from qdrant_client import models
+from qdrant_client.conversions import common_types as types
+
+if TYPE_CHECKING:
+    from .model import PointModel
+
+
+class UnindexedFieldWarning(UserWarning):
+    """
+    A filter targets a payload field without a declared payload index, so
+    Qdrant has to check the payload of every candidate point.
+    """
+
+
+class Param(NamedTuple):
+    """
+    Placeholder for a value given when a filter is bound:
+
+        by_topic = Chunk.f.topic == Param("topic")
+        Chunk.scroll(by_topic.bind(topic="news"))
+    """
+
+    name: str
+
+
+type Builder = Callable[[Mapping[str, Any]], Any]
+
+_EQUALITY = (
+    models.KeywordIndexParams,
+    models.IntegerIndexParams,
+    models.UuidIndexParams,
+    models.BoolIndexParams,
+)
+_RANGE = (
+    models.IntegerIndexParams,
+    models.FloatIndexParams,
+    models.DatetimeIndexParams,
+)
+_TEXT = (models.TextIndexParams,)
+_GEO = (models.GeoIndexParams,)
+
+
+def _resolve(value: Any, params: Mapping[str, Any]) -> Any:
+    if not isinstance(value, Param):
+        return value
+    try:
+        return params[value.name]
+    except KeyError:
+        raise ValueError(f"Missing filter parameter {value.name}") from None
+
+
+class Expr:
+    """
+    Boolean filter expression, combined with `&`, `|` and `~`.
+
+    The `models.Filter` is built once by `compile()`; conditions without
+    `Param` placeholders are shared by all the filters bound from it.
+    """
+
+    __slots__ = ("_compiled",)
+
+    def __init__(self):
+        self._compiled: Builder | None = None
+
+    def __and__(self, other: "Expr") -> "Expr":
+        return And((self, other))
+
+    def __or__(self, other: "Expr") -> "Expr":
+        return Or((self, other))
+
+    def __invert__(self) -> "Expr":
+        return Not(self)
+
+    def __bool__(self):
+        raise TypeError("Combine filter expressions with &, | and ~, not and/or/not")
+
+    def compile(self) -> Builder:
+        if self._compiled is None:
+            builder, dynamic = _filter_builder(self)
+            self._compiled = builder if dynamic else lambda params: builder
+        return self._compiled
+
+    def bind(self, **params: Any) -> models.Filter:
+        """
+        Build the filter with values for its `Param` placeholders.
+        """
+        return self.compile()(params)
+
+    def to_filter(self) -> models.Filter:
+        return self.bind()
+
+
+class Condition(Expr):
+    __slots__ = ("make", "args")
+
+    def __init__(self, make: Callable[..., models.Condition], *args: Any):
+        super().__init__()
+        self.make = make
+        self.args = args
+
+
+class And(Expr):
+    __slots__ = ("items",)
+
+    def __init__(self, items: Iterable[Expr]):
+        super().__init__()
+        self.items = tuple(items)
+
+
+class Or(Expr):
+    __slots__ = ("items",)
+
+    def __init__(self, items: Iterable[Expr]):
+        super().__init__()
+        self.items = tuple(items)
+
+
+class Not(Expr):
+    __slots__ = ("expr",)
+
+    def __init__(self, expr: Expr):
+        super().__init__()
+        self.expr = expr
+
+
+def _flatten(expr: Expr, kind: type[And] | type[Or]) -> Iterable[Expr]:
+    for item in expr.items:  # type: ignore
+        if isinstance(item, kind):
+            yield from _flatten(item, kind)
+        else:
+            yield item
+
+
+def _node_builder(expr: Expr) -> tuple[Any, bool]:
+    if not isinstance(expr, Condition):
+        return _filter_builder(expr)
+
+    if not any(isinstance(arg, Param) for arg in expr.args):
+        return expr.make(*expr.args), False
+
+    make, args = expr.make, expr.args
+    return lambda params: make(*(_resolve(arg, params) for arg in args)), True
+
+
+def _filter_builder(expr: Expr) -> tuple[Any, bool]:
+    """
+    Returns the filter, or a function of the params building it if some
+    condition has parameters, and whether it is such a function.
+    """
+    must, should, must_not = [], [], []
+
+    if isinstance(expr, And):
+        for item in _flatten(expr, And):
+            if isinstance(item, Not):
+                must_not.append(_node_builder(item.expr))
+            else:
+                must.append(_node_builder(item))
+    elif isinstance(expr, Or):
+        should += map(_node_builder, _flatten(expr, Or))
+    elif isinstance(expr, Not):
+        must_not.append(_node_builder(expr.expr))
+    else:
+        must.append(_node_builder(expr))
+
+    parts = {"must": must, "should": should, "must_not": must_not}
+
+    if not any(dynamic for items in parts.values() for _, dynamic in items):
+        return (
+            models.Filter(
+                **{
+                    name: [value for value, _ in items]
+                    for name, items in parts.items()
+                    if items
+                }
+            ),
+            False,
+        )
+
+    def build(params: Mapping[str, Any]) -> models.Filter:
+        return models.Filter(
+            **{
+                name: [value(params) if dynamic else value for value, dynamic in items]
+                for name, items in parts.items()
+                if items
+            }
+        )
+
+    return build, True
+
+
+def as_filter(value: "Expr | types.Filter | None") -> types.Filter | None:
+    """
+    Compile filter expressions, pass `models.Filter` through.
+    """
+    if isinstance(value, Expr):
+        return value.to_filter()
+    if isinstance(value, bool):
+        # `Chunk.topic == "news"` compares the slot descriptor itself.
+        raise TypeError(
+            "Filter expressions are built on the fields of `Model.f`, "
+            'e.g. `Chunk.f.topic == "news"`'
+        )
+    return value
+
+
+class Fields:
+    """
+    Field accessor of a model, `Chunk.f`: its attributes are the fields of
+    the model as `FieldRef`, to build filter expressions.
+    """
+
+    __slots__ = ("model",)
+
+    def __init__(self, model: "type[PointModel]"):
+        self.model = model
+
+    def __repr__(self) -> str:
+        return f"{self.model.__name__}.f"
+
+    def __getattr__(self, name: str) -> "FieldRef":
+        if name not in self.model.__schema__.fields:
+            raise AttributeError(f"{self.model.__name__} has no field {name}")
+        return FieldRef(self.model, name)
+
+
+class FieldRef:
+    """
+    Model field used in a filter expression, returned by the field accessor
+    of the model: `Chunk.f.topic == "news"`, `Chunk.f.meta["lang"] == "en"`.
+
+    Operations are checked against the payload index declared for the
+    field: an incompatible index raises ValueError, a missing one emits an
+    `UnindexedFieldWarning`.
+    """
+
+    __slots__ = ("model", "path", "index")
+
+    def __init__(self, model: "type[PointModel]", path: str):
+        self.model = model
+        self.path = path
+        self.index = next(
+            (
+                index.params
+                for index in model.__payload_indexes__.values()
+                if index.key == path
+            ),
+            None,
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.model.__name__}.{self.path}"
+
+    def __getitem__(self, key: str) -> "FieldRef":
+        if key.startswith("["):
+            return FieldRef(self.model, f"{self.path}{key}")
+        return FieldRef(self.model, f"{self.path}.{key}")
+
+    def _check(self, allowed: tuple[type, ...], operation: str) -> None:
+        if self.index is None:
+            warnings.warn(
+                f"{self!r} has no payload index, filtering on it is a full scan",
+                UnindexedFieldWarning,
+                skip_file_prefixes=(os.path.dirname(__file__),),
+            )
+        elif not isinstance(self.index, allowed):
+            raise ValueError(
+                f"{operation} filter on {self!r} is not supported by its "
+                f"{type(self.index).__name__}"
+            )
+
+    def _match(self, match: Callable[[Any], models.Match], value: Any) -> Condition:
+        path = self.path
+        return Condition(
+            lambda value: models.FieldCondition(key=path, match=match(value)), value
+        )
+
+    def __eq__(self, value: Any) -> Condition:  # type: ignore
+        if self.path == "id":
+            return Condition(lambda id: models.HasIdCondition(has_id=[id]), value)
+
+        self._check(_EQUALITY, "Equality")
+        return self._match(lambda value: models.MatchValue(value=value), value)
+
+    def __ne__(self, value: Any) -> Expr:  # type: ignore
+        return ~(self == value)
+
+    __hash__ = None  # type: ignore
+
+    def in_(self, values: Iterable[Any] | Param) -> Condition:
+        if not isinstance(values, Param):
+            values = list(values)
+
+        if self.path == "id":
+            return Condition(lambda ids: models.HasIdCondition(has_id=list(ids)), values)
+
+        self._check(_EQUALITY, "Membership")
+        return self._match(lambda values: models.MatchAny(any=list(values)), values)
+
+    def not_in(self, values: Iterable[Any] | Param) -> Condition:
+        if not isinstance(values, Param):
+            values = list(values)
+
+        self._check(_EQUALITY, "Membership")
+        return self._match(
+            lambda values: models.MatchExcept(**{"except": list(values)}), values
+        )
+
+    def text(self, query: str | Param) -> Condition:
+        """
+        Full-text match, using the `Text` index of the field.
+        """
+        self._check(_TEXT, "Text")
+        return self._match(lambda query: models.MatchText(text=query), query)
+
+    def _range(self, **bounds: Any) -> Condition:
+        self._check(_RANGE, "Range")
+        path, names = self.path, tuple(bounds)
+        range_type = (
+            models.DatetimeRange
+            if isinstance(self.index, models.DatetimeIndexParams)
+            or any(isinstance(bound, date) for bound in bounds.values())
+            else models.Range
+        )
+
+        def make(*values: Any) -> models.FieldCondition:
+            return models.FieldCondition(
+                key=path, range=range_type(**dict(zip(names, values)))
+            )
+
+        return Condition(make, *bounds.values())
+
+    def __lt__(self, value: Any) -> Condition:
+        return self._range(lt=value)
+
+    def __le__(self, value: Any) -> Condition:
+        return self._range(lte=value)
+
+    def __gt__(self, value: Any) -> Condition:
+        return self._range(gt=value)
+
+    def __ge__(self, value: Any) -> Condition:
+        return self._range(gte=value)
+
+    def between(self, low: Any, high: Any) -> Condition:
+        """
+        `low <= field <= high`.
+        """
+        return self._range(gte=low, lte=high)
+
+    def within_radius(self, lat: float, lon: float, radius: float) -> Condition:
+        """
+        Geo points within `radius` meters of (`lat`, `lon`).
+        """
+        self._check(_GEO, "Geo")
+        path = self.path
+
+        def make(lat: float, lon: float, radius: float) -> models.FieldCondition:
+            return models.FieldCondition(
+                key=path,
+                geo_radius=models.GeoRadius(
+                    center=models.GeoPoint(lat=lat, lon=lon), radius=radius
+                ),
+            )
+
+        return Condition(make, lat, lon, radius)
+
+    def within_box(
+        self, top_left: tuple[float, float], bottom_right: tuple[float, float]
+    ) -> Condition:
+        """
+        Geo points within a box given by its (lat, lon) corners.
+        """
+        self._check(_GEO, "Geo")
+        path = self.path
+
+        def make(
+            top_left: tuple[float, float], bottom_right: tuple[float, float]
+        ) -> models.FieldCondition:
+            return models.FieldCondition(
+                key=path,
+                geo_bounding_box=models.GeoBoundingBox(
+                    top_left=models.GeoPoint(lat=top_left[0], lon=top_left[1]),
+                    bottom_right=models.GeoPoint(lat=bottom_right[0], lon=bottom_right[1]),
+                ),
+            )
+
+        return Condition(make, top_left, bottom_right)
+
+    def within_polygon(self, points: Iterable[tuple[float, float]]) -> Condition:
+        """
+        Geo points within a polygon given by its (lat, lon) vertices.
+        """
+        self._check(_GEO, "Geo")
+        path = self.path
+
+        def make(points: Iterable[tuple[float, float]]) -> models.FieldCondition:
+            return models.FieldCondition(
+                key=path,
+                geo_polygon=models.GeoPolygon(
+                    exterior=models.GeoLineString(
+                        points=[models.GeoPoint(lat=lat, lon=lon) for lat, lon in points]
+                    )
+                ),
+            )
+
+        return Condition(make, points if isinstance(points, Param) else list(points))
+
+    def is_empty(self) -> Condition:
+        return Condition(
+            lambda path: models.IsEmptyCondition(is_empty=models.PayloadField(key=path)),
+            self.path,
+        )
+
+    def is_null(self) -> Condition:
+        return Condition(
+            lambda path: models.IsNullCondition(is_null=models.PayloadField(key=path)),
+            self.path,
+        )
@@ -17,6 +17,11 @@ class BasePayloadIndex:
     _params: Any = None
     _key = None
 
+    def __new__(cls, *args: Any, **kwargs: Any):
+        # Markers subclass the type of their field for type checkers, whose
+        # constructor must not receive the index params.
+        return super().__new__(cls)
+
     @property
     def params(self) -> Any:
         return self._params
@@ -25,8 +30,20 @@ class BasePayloadIndex:
     def key(self) -> str | None:
         return self._key
 
+    def field_name(self, field: str) -> str:
+        """
+        Payload path indexed for `field`: the field itself, or the nested
+        `key` inside it (`meta` + `lang` -> `meta.lang`, `tags` + `[].name`
+        -> `tags[].name`).
+        """
+        if self._key is None:
+            return field
+        if self._key.startswith("["):
+            return f"{field}{self._key}"
+        return f"{field}.{self._key}"
+
 
-class Keyword(list[str], BasePayloadIndex):
+class Keyword(BasePayloadIndex, list[str]):
     def __init__(
         self,
         is_tenant: bool | None = None,
@@ -48,7 +65,7 @@ class Keyword(list[str], BasePayloadIndex):
         )
 
 
-class Integer(int, BasePayloadIndex):
+class Integer(BasePayloadIndex, int):
     def __init__(
         self,
         lookup: bool | None = None,
@@ -67,7 +84,7 @@ class Integer(int, BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.IntegerIndexParams(
+        self._params = models.IntegerIndexParams(
             type=models.IntegerIndexType.INTEGER,
             lookup=lookup,
             range=range,
@@ -76,7 +93,7 @@ class Integer(int, BasePayloadIndex):
         )
 
 
-class Float(float, BasePayloadIndex):
+class Float(BasePayloadIndex, float):
     def __init__(
         self,
         is_principal: bool | None = None,
@@ -91,20 +108,29 @@ class Float(float, BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.FloatIndexParams(
+        self._params = models.FloatIndexParams(
             type=models.FloatIndexType.FLOAT,
             is_principal=is_principal,
             on_disk=on_disk,
         )
 
 
-def Bool(key: str | None = None) -> Any:  # type: ignore
-    return key, models.BoolIndexParams(
-        type=models.BoolIndexType.BOOL,
-    )
+class Bool(BasePayloadIndex):
+    # `bool` cannot be subclassed, so this marker is not a `bool` itself.
+
+    def __init__(self, key: str | None = None):
+        """
+        Bool index
+
+        :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
+        """
+        self._key = key
+        self._params = models.BoolIndexParams(
+            type=models.BoolIndexType.BOOL,
+        )
 
 
-class Geo(tuple[float, float], BasePayloadIndex):
+class Geo(BasePayloadIndex, tuple[float, float]):
     def __init__(self, on_disk: bool | None = None, key: str | None = None):
         """
         Geo index
@@ -113,13 +139,13 @@ class Geo(tuple[float, float], BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.GeoIndexParams(
+        self._params = models.GeoIndexParams(
             type=models.GeoIndexType.GEO,
             on_disk=on_disk,
         )
 
 
-class MultiGeo(list[tuple[float, float]], BasePayloadIndex):
+class MultiGeo(BasePayloadIndex, list[tuple[float, float]]):
     def __init__(self, on_disk: bool | None = None, key: str | None = None):
         """
         Multiple geo index
@@ -128,13 +154,13 @@ class MultiGeo(list[tuple[float, float]], BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.GeoIndexParams(
+        self._params = models.GeoIndexParams(
             type=models.GeoIndexType.GEO,
             on_disk=on_disk,
         )
 
 
-class Datetime(int, BasePayloadIndex):
+class Datetime(BasePayloadIndex, int):
     def __init__(
         self,
         is_principal: bool | None = None,
@@ -149,14 +175,14 @@ class Datetime(int, BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.DatetimeIndexParams(
+        self._params = models.DatetimeIndexParams(
             type=models.DatetimeIndexType.DATETIME,
             is_principal=is_principal,
             on_disk=on_disk,
         )
 
 
-class Text(str, BasePayloadIndex):
+class Text(BasePayloadIndex, str):
     def __init__(
         self,
         tokenizer: models.TokenizerType = models.TokenizerType.WORD,
@@ -177,7 +203,7 @@ class Text(str, BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.TextIndexParams(
+        self._params = models.TextIndexParams(
             type=models.TextIndexType.TEXT,
             tokenizer=tokenizer,
             min_token_len=min_token_len,
@@ -187,7 +213,7 @@ class Text(str, BasePayloadIndex):
         )
 
 
-class Uuid(str, BasePayloadIndex):
+class Uuid(BasePayloadIndex, str):
     def __init__(
         self,
         is_tenant: bool | None = None,
@@ -202,7 +228,7 @@ class Uuid(str, BasePayloadIndex):
         :param key: Key for nested field. You can use dot notation to specify the path to the nested field.
         """
         self._key = key
-        self._index_params = models.UuidIndexParams(
+        self._params = models.UuidIndexParams(
             type=models.UuidIndexType.UUID,
             is_tenant=is_tenant,
             on_disk=on_disk,
@@ -1,8 +1,12 @@
-from typing import Mapping, TypeAlias, TypedDict
+from typing import Any, Mapping, TypeAlias, TypedDict, get_origin
 
+import numpy as np
+import numpy.typing as npt
 from qdrant_client import models
 from qdrant_client.conversions import common_types as types
 
+from ..embed import EmbedFunction, Embedder
+
 
 DenseVectorType: TypeAlias = list[float]
 DenseMultiVectorType: TypeAlias = list[DenseVectorType]
@@ -10,6 +14,16 @@ SparseVectorType: TypeAlias = tuple[list[int], list[float]]
 BaseVectorType = DenseVectorType | DenseMultiVectorType | SparseVectorType
 
 
+def is_ndarray_type(type_: Any) -> bool:
+    """
+    Whether a field is annotated as `np.ndarray` or `npt.NDArray[...]`.
+    """
+    origin = get_origin(type_) or type_
+    # Recent NumPy versions define `NDArray` as a `type` alias statement.
+    origin = get_origin(getattr(origin, "__value__", origin)) or origin
+    return origin is np.ndarray
+
+
 class BaseVectorIndex:
     _params: types.VectorParams | types.SparseVectorParams
 
@@ -18,9 +32,42 @@ class BaseVectorIndex:
         return self._params
 
 
-class Vector(DenseVectorType, BaseVectorIndex):
+class DenseVectorIndex(BaseVectorIndex):
+    as_numpy: bool | None
+    dtype: np.dtype
+    source: str | None
+    embedder: Embedder | None
+
+    def _set_embedding(
+        self, source: str | None, embedder: Embedder | EmbedFunction | None
+    ) -> None:
+        if (source is None) != (embedder is None):
+            raise ValueError("An embedded vector needs both a source and an embedder")
+        self.source = source
+        self.embedder = (
+            embedder
+            if embedder is None or isinstance(embedder, Embedder)
+            else Embedder(embedder)
+        )
+
+    def returns_numpy(self, type_: Any) -> bool:
+        """
+        Whether points read from Qdrant get this vector as an `np.ndarray`.
+        """
+        return is_ndarray_type(type_) if self.as_numpy is None else self.as_numpy
+
+
+class Vector(DenseVectorType, DenseVectorIndex):
     """
     Params of single vector data storage
+
+    The field accepts lists or `np.ndarray`. Points read from Qdrant get
+    an array of `dtype` if `as_numpy` is set, or by default if the field is
+    annotated as `np.ndarray`.
+
+    With `source` and `embedder`, the vector is derived from the payload
+    field `source`: it is computed on write for points without one, and
+    recomputed when `source` changed on a persisted point.
     """
 
     def __init__(
@@ -31,7 +78,14 @@ class Vector(DenseVectorType, BaseVectorIndex):
         quantization_config: models.QuantizationConfig | None = None,
         on_disk: bool | None = None,
         datatype: models.Datatype | None = None,
+        as_numpy: bool | None = None,
+        dtype: npt.DTypeLike = np.float32,
+        source: str | None = None,
+        embedder: Embedder | EmbedFunction | None = None,
     ):
+        self.as_numpy = as_numpy
+        self.dtype = np.dtype(dtype)
+        self._set_embedding(source, embedder)
         self._params = models.VectorParams(
             size=size,
             distance=distance,
@@ -42,9 +96,11 @@ class Vector(DenseVectorType, BaseVectorIndex):
         )
 
 
-class MultiVector(DenseMultiVectorType, BaseVectorIndex):
+class MultiVector(DenseMultiVectorType, DenseVectorIndex):
     """
     Params of multi vector data storage
+
+    Accepts and returns 2D arrays the same way as `Vector`.
     """
 
     def __init__(
@@ -58,7 +114,14 @@ class MultiVector(DenseMultiVectorType, BaseVectorIndex):
         quantization_config: models.QuantizationConfig | None = None,
         on_disk: bool | None = None,
         datatype: models.Datatype | None = None,
+        as_numpy: bool | None = None,
+        dtype: npt.DTypeLike = np.float32,
+        source: str | None = None,
+        embedder: Embedder | EmbedFunction | None = None,
     ):
+        self.as_numpy = as_numpy
+        self.dtype = np.dtype(dtype)
+        self._set_embedding(source, embedder)
         self._params = models.VectorParams(
             size=single_size,
             distance=distance,
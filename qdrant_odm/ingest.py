@@ -0,0 +1,386 @@
+import argparse
+import csv
+import importlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
+
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.conversions import common_types as types
+
+from .bulk import write_batches
+from .crud import WriteOptions
+from .export import _encoding, _parse_id
+from .instrument import operation
+from .model import PointModel, init_models
+
+type SourceFormat = Literal["jsonl", "csv"]
+type Transform = Callable[[dict[str, Any]], dict[str, Any] | None]
+
+
+class IngestResult(NamedTuple):
+    read: int
+    written: int
+    skipped: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """
+        Written points per second.
+        """
+        return self.written / self.seconds if self.seconds else 0.0
+
+
+class _Row(NamedTuple):
+    # `id` is read by `write_batches` to report the points of failed batches.
+    id: types.PointId
+    point: PointModel
+    index: int
+    offset: int
+    read: int
+
+
+class _SourceRecord(NamedTuple):
+    line: int
+    offset: int
+    record: dict[str, Any]
+
+
+def _lines(file: Any, offset: int, positions: list[int]) -> Iterator[str]:
+    """
+    Decoded lines of a binary file from `offset`, keeping the position after
+    the last line read in `positions[0]`.
+    """
+    file.seek(offset)
+    positions[0] = offset
+    while line := file.readline():
+        positions[0] += len(line)
+        yield line.decode()
+
+
+def _source_format(path: str | os.PathLike) -> SourceFormat:
+    return "csv" if Path(path).suffix.lower() == ".csv" else "jsonl"
+
+
+def read_source(
+    path: str | os.PathLike, format: SourceFormat | None = None, offset: int = 0
+) -> Iterator[_SourceRecord]:
+    """
+    Stream the records of a JSONL or CSV file, starting at byte `offset`.
+
+    Each record comes with the byte offset just after it, where reading can
+    resume. CSV values are strings, converted to field types by `ingest`.
+    """
+    format = format or _source_format(path)
+    positions = [offset]
+
+    with open(path, "rb") as file:
+        if format == "jsonl":
+            for line, text in enumerate(_lines(file, offset, positions), 1):
+                if text.strip():
+                    yield _SourceRecord(line, positions[0], json.loads(text))
+            return
+
+        header = next(csv.reader([file.readline().decode()]))
+        reader = csv.reader(_lines(file, max(offset, file.tell()), positions))
+        for row in reader:
+            yield _SourceRecord(reader.line_num, positions[0], dict(zip(header, row)))
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    raise ValueError(f"Invalid boolean {value!r}")
+
+
+_PARSERS: Mapping[str, Callable[[str], Any]] = {
+    "string": str,
+    "int64": int,
+    "float64": float,
+    "bool_": _parse_bool,
+    "json": json.loads,
+}
+
+
+def _csv_parsers(model: type[PointModel]) -> dict[str, Callable[[str], Any]]:
+    fields = model.__schema__.fields
+    parsers = {field: _PARSERS[_encoding(fields[field])] for field in fields}
+    parsers["id"] = _parse_id
+    return parsers
+
+
+def _validate(model: type[PointModel], record: dict[str, Any]) -> None:
+    fields = model.__schema__.fields
+    vectors_config = model.__index_config__["vectors_config"]
+
+    if record.get("id") is None:
+        raise ValueError("Missing id")
+    if unknown := set(record) - set(fields):
+        raise ValueError(f"Unknown fields {sorted(unknown)}")
+
+    for field, params in vectors_config.items():
+        vector = record.get(field)
+        if (
+            vector is not None
+            and params.multivector_config is None
+            and len(vector) != params.size
+        ):
+            raise ValueError(
+                f"Vector field {field} has size {len(vector)}, expected {params.size}"
+            )
+
+
+class Checkpoint:
+    """
+    Byte offset in the source up to which all records have been written,
+    saved atomically to a JSON file after each batch.
+
+    Batches may complete out of order when sent concurrently, or in parts
+    when split on retry; the offset only moves past rows once all the rows
+    before them are written, so resuming re-sends at most the batches that
+    were in flight. Upserts are idempotent, so re-sent points are simply
+    overwritten.
+    """
+
+    def __init__(self, path: str | os.PathLike | None, source: str | os.PathLike):
+        self.path = None if path is None else Path(path)
+        self.source = str(source)
+        self.offset = 0
+        self.read = 0
+        # Index of the first row not known to be written.
+        self._next_row = 0
+        self._done: dict[int, tuple[int, int, int]] = {}
+        self._lock = threading.Lock()
+
+        if self.path is not None and self.path.exists():
+            state = json.loads(self.path.read_text())
+            if state["source"] != self.source:
+                raise ValueError(
+                    f"Checkpoint {self.path} belongs to {state['source']}, not {self.source}"
+                )
+            self.offset, self.read = state["offset"], state["read"]
+
+    def done(self, first: int, last: int, offset: int, read: int) -> None:
+        """
+        Record that rows `first` to `last` were written, `offset` and `read`
+        being the source position after the last one.
+        """
+        with self._lock:
+            self._done[first] = last + 1, offset, read
+            if self._next_row not in self._done:
+                return
+
+            while self._next_row in self._done:
+                self._next_row, self.offset, self.read = self._done.pop(self._next_row)
+            self._save()
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.write_text(
+            json.dumps({"source": self.source, "offset": self.offset, "read": self.read})
+        )
+        os.replace(temporary, self.path)
+
+
+class _Progress:
+    def __init__(self, report_every: float, read: int):
+        self.started = time.perf_counter()
+        self.read = read
+        self.written = 0
+        self.skipped = 0
+        self._report_every = report_every
+        self._reported = self.started
+        self._lock = threading.Lock()
+
+    def wrote(self, count: int) -> None:
+        with self._lock:
+            self.written += count
+            now = time.perf_counter()
+            if self._report_every and now - self._reported >= self._report_every:
+                self._reported = now
+                self.report()
+
+    def report(self) -> None:
+        seconds = time.perf_counter() - self.started
+        logger.info(
+            f"Ingested {self.written} points ({self.written / seconds:.0f}/s), "
+            f"{self.skipped} skipped, {self.read} records read"
+        )
+
+    def result(self) -> IngestResult:
+        return IngestResult(
+            self.read, self.written, self.skipped, time.perf_counter() - self.started
+        )
+
+
+def ingest[P: PointModel](
+    model: type[P],
+    source: str | os.PathLike,
+    format: SourceFormat | None = None,
+    transform: Transform | None = None,
+    batch_size: int = 256,
+    parallel: int = 1,
+    checkpoint: str | os.PathLike | None = None,
+    skip_invalid: bool = False,
+    report_every: float = 10.0,
+    write_options: WriteOptions = WriteOptions(),
+) -> IngestResult:
+    """
+    Stream a JSONL or CSV file into the collection of `model`.
+
+    Records are read, validated, converted to points and upserted in
+    batches, holding at most `parallel` batches in memory whatever the file
+    size. With a `checkpoint` file, progress is saved after each written
+    batch and a later run with the same checkpoint resumes where it stopped.
+
+    Args:
+        model (type[P]): Model of the records, bound to a client by `init_models`.
+        source (str | os.PathLike): JSONL or CSV file.
+        format (SourceFormat | None, optional): "jsonl" or "csv", from the file extension if None. Defaults to None.
+        transform (Transform | None, optional): Maps a source record to model fields, or None to drop it. Defaults to None.
+        batch_size (int, optional): Number of points per upsert request. Defaults to 256.
+        parallel (int, optional): Number of batches sent concurrently. Defaults to 1.
+        checkpoint (str | os.PathLike | None, optional): File saving the progress. Defaults to None.
+        skip_invalid (bool, optional): Log and skip invalid records instead of raising. Defaults to False.
+        report_every (float, optional): Seconds between throughput logs, 0 to disable. Defaults to 10.0.
+        write_options (WriteOptions, optional): Write options. Defaults to WriteOptions().
+
+    Returns:
+        IngestResult: Records read, points written and records skipped.
+
+    Raises:
+        ValueError: If a record is invalid and `skip_invalid` is False.
+        BulkWriteError: If some batches failed; the checkpoint stops before the first of them.
+    """
+    state = Checkpoint(checkpoint, source)
+    progress = _Progress(report_every, state.read)
+    format = format or _source_format(source)
+    records = read_source(source, format, state.offset)
+    parsers = _csv_parsers(model) if format == "csv" else None
+
+    if state.offset:
+        logger.info(f"Resuming {source} after {state.read} records")
+
+    def rows() -> Iterator[_Row]:
+        index = 0
+
+        for line, offset, record in records:
+            progress.read += 1
+            try:
+                if transform is not None:
+                    record = transform(record)
+                    if record is None:
+                        progress.skipped += 1
+                        continue
+                if parsers is not None:
+                    record = {
+                        field: parsers[field](value) if field in parsers else value
+                        for field, value in record.items()
+                        if value != ""
+                    }
+                _validate(model, record)
+                point = model(**record)
+            except (TypeError, ValueError) as error:
+                if not skip_invalid:
+                    raise ValueError(f"Invalid record at line {line}: {error}") from error
+                logger.warning(f"Skipping record at line {line}: {error}")
+                progress.skipped += 1
+                continue
+
+            yield _Row(point.id, point, index, offset, progress.read)
+            index += 1
+
+    write_kwargs = write_options._asdict()
+
+    def send(batch: Sequence[_Row]) -> None:
+        with operation("ingest", model):
+            model.fill_embeddings(row.point for row in batch)
+            model.__client__.upsert(
+                model.__collection_name__,
+                points=model._encode_points(row.point for row in batch),
+                **write_kwargs,
+            )
+        model._invalidate_cache(row.id for row in batch)
+        state.done(batch[0].index, batch[-1].index, batch[-1].offset, batch[-1].read)
+        progress.wrote(len(batch))
+
+    write_batches(send, rows(), batch_size, parallel)  # type: ignore
+
+    if report_every:
+        progress.report()
+    return progress.result()
+
+
+def _load_model(path: str) -> type[PointModel]:
+    module_name, _, name = path.partition(":")
+    model = getattr(importlib.import_module(module_name), name, None)
+    if not (isinstance(model, type) and issubclass(model, PointModel)):
+        raise ValueError(f"{path} is not a PointModel, expected `package.module:Model`")
+    return model
+
+
+def _renamer(mapping: Iterable[str]) -> Transform:
+    renames = dict(item.split("=", 1) for item in mapping)
+    return lambda record: {renames.get(key, key): value for key, value in record.items()}
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="qdrant-odm-ingest",
+        description="Stream a JSONL or CSV file into the collection of a model.",
+    )
+    parser.add_argument("model", help="Model to ingest into, as package.module:Model")
+    parser.add_argument("source", help="JSONL or CSV file")
+    parser.add_argument("--url", default="http://localhost:6333", help="Qdrant URL")
+    parser.add_argument("--api-key", default=os.environ.get("QDRANT_API_KEY"))
+    parser.add_argument("--format", choices=("jsonl", "csv"))
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--parallel", type=int, default=1)
+    parser.add_argument("--checkpoint", help="File saving the progress, to resume")
+    parser.add_argument(
+        "--map",
+        action="append",
+        default=[],
+        metavar="SOURCE=FIELD",
+        help="Rename a source key to a model field, repeatable",
+    )
+    parser.add_argument("--skip-invalid", action="store_true")
+    parser.add_argument("--report-every", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    model = _load_model(args.model)
+    init_models(QdrantClient(url=args.url, api_key=args.api_key), [model])
+    ingest(
+        model,
+        args.source,
+        format=args.format,
+        transform=_renamer(args.map) if args.map else None,
+        batch_size=args.batch_size,
+        parallel=args.parallel,
+        checkpoint=args.checkpoint,
+        skip_invalid=args.skip_invalid,
+        report_every=args.report_every,
+    )
+
+
+if __name__ == "__main__":
+    main()
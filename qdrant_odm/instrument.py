@@ -0,0 +1,345 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Sequence
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .model import PointModel
+
+type Hook = Callable[["Span"], None]
+
+_hooks: list[Hook] = []
+_current: ContextVar["Span | None"] = ContextVar("qdrant_odm_span", default=None)
+
+
+class Span:
+    """
+    Measurements of one ODM operation, passed to the hooks when it ends.
+
+    `duration` is the wall time of the whole operation. `serialize` and
+    `decode` are the time spent encoding points for Qdrant and building
+    points from its responses; the rest, `network`, is spent in the Qdrant
+    client call. With concurrent batches the phases add up the time of all
+    the workers, so they can exceed `duration`.
+    """
+
+    __slots__ = (
+        "operation",
+        "model",
+        "collection",
+        "started",
+        "duration",
+        "serialize",
+        "decode",
+        "points",
+        "payload_bytes",
+        "vector_bytes",
+        "error",
+        "_lock",
+    )
+
+    def __init__(self, operation: str, model: "type[PointModel]"):
+        self.operation = operation
+        self.model = model.__name__
+        self.collection: str | None = getattr(model, "__collection_name__", None)
+        self.started = time.time()
+        self.duration = 0.0
+        self.serialize = 0.0
+        self.decode = 0.0
+        self.points = 0
+        self.payload_bytes = 0
+        self.vector_bytes = 0
+        self.error: BaseException | None = None
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return (
+            f"Span({self.operation} {self.model}: {self.duration * 1000:.2f} ms, "
+            f"serialize={self.serialize * 1000:.2f} ms, network={self.network * 1000:.2f} ms, "
+            f"decode={self.decode * 1000:.2f} ms, points={self.points}, error={self.error!r})"
+        )
+
+    @property
+    def network(self) -> float:
+        return max(self.duration - self.serialize - self.decode, 0.0)
+
+    def add(
+        self,
+        serialize: float = 0.0,
+        decode: float = 0.0,
+        points: int = 0,
+        payload_bytes: int = 0,
+        vector_bytes: int = 0,
+    ) -> None:
+        with self._lock:
+            self.serialize += serialize
+            self.decode += decode
+            self.points += points
+            self.payload_bytes += payload_bytes
+            self.vector_bytes += vector_bytes
+
+
+def add_hook(hook: Hook) -> Hook:
+    """
+    Call `hook` with the `Span` of every ODM operation, from the thread that
+    ran it. Operations are not measured at all while no hook is registered.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Hook) -> None:
+    _hooks.remove(hook)
+
+
+def current_span() -> Span | None:
+    return _current.get()
+
+
+def _finish(span: Span, started: float) -> None:
+    span.duration = time.perf_counter() - started
+    for hook in list(_hooks):
+        try:
+            hook(span)
+        except Exception:
+            logger.exception(f"Instrumentation hook {hook!r} failed")
+
+
+def _model_of(owner: Any) -> "type[PointModel]":
+    if isinstance(owner, type):
+        return owner
+    if (model := getattr(owner, "_point_model_type", None)) is not None:
+        return model
+    if isinstance(model := getattr(owner, "model", None), type):
+        return model
+    return type(owner)
+
+
+class _Operation:
+    __slots__ = ("_name", "_model", "_span", "_token", "_started")
+
+    def __init__(self, name: str, model: "type[PointModel]"):
+        self._name = name
+        self._model = model
+        self._span: Span | None = None
+
+    def __enter__(self) -> Span | None:
+        if _hooks and _current.get() is None:
+            self._span = Span(self._name, self._model)
+            self._token = _current.set(self._span)
+            self._started = time.perf_counter()
+        return self._span
+
+    def __exit__(self, exc_type: Any, error: BaseException | None, traceback: Any) -> None:
+        if (span := self._span) is not None:
+            span.error = error
+            _current.reset(self._token)
+            _finish(span, self._started)
+
+
+def operation(name: str, model: "type[PointModel]") -> _Operation:
+    """
+    Measure a block as the operation `name` of `model`. Operations run by
+    another one are counted in the outer one.
+
+        with operation("scroll", Chunk):
+            ...
+    """
+    return _Operation(name, model)
+
+
+def instrumented(name: str) -> Callable[[Callable], Callable]:
+    """
+    Measure the calls of a method as the operation `name`. The first
+    argument gives the model: a model class, a point or an executor.
+    """
+
+    def decorate(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def measure_async(owner: Any, *args: Any, **kwargs: Any) -> Any:
+                if not _hooks:
+                    return await function(owner, *args, **kwargs)
+                with operation(name, _model_of(owner)):
+                    return await function(owner, *args, **kwargs)
+
+            return measure_async
+
+        @functools.wraps(function)
+        def measure(owner: Any, *args: Any, **kwargs: Any) -> Any:
+            if not _hooks:
+                return function(owner, *args, **kwargs)
+            with operation(name, _model_of(owner)):
+                return function(owner, *args, **kwargs)
+
+        return measure
+
+    return decorate
+
+
+def count_points(count: int) -> None:
+    """
+    Add points to the current operation, for those neither encoded nor
+    decoded such as deleted ones.
+    """
+    if (span := _current.get()) is not None:
+        span.add(points=count)
+
+
+def payload_size(payload: Mapping[str, Any] | None) -> int:
+    """
+    Size of a payload as JSON, as sent over REST.
+    """
+    if not payload:
+        return 0
+    return len(json.dumps(payload, default=str, separators=(",", ":")))
+
+
+def vector_size(vectors: Any) -> int:
+    """
+    Size of vectors as float32 values; sparse entries count an index too.
+    """
+    if vectors is None:
+        return 0
+    if isinstance(vectors, Mapping):
+        return sum(vector_size(vector) for vector in vectors.values())
+    if hasattr(vectors, "indices"):
+        return 8 * len(vectors.indices)
+    if hasattr(vectors, "size") and hasattr(vectors, "dtype"):
+        return 4 * int(vectors.size)
+    if len(vectors) and isinstance(vectors[0], Sequence):
+        return sum(vector_size(vector) for vector in vectors)
+    return 4 * len(vectors)
+
+
+def record_sizes(items: Iterable[Any]) -> tuple[int, int]:
+    """
+    Payload and vector bytes of records or point structs.
+    """
+    payload_bytes = vector_bytes = 0
+    for item in items:
+        payload_bytes += payload_size(item.payload)
+        vector_bytes += vector_size(getattr(item, "vector", None))
+    return payload_bytes, vector_bytes
+
+
+class LoggingHook:
+    """
+    Log every operation with loguru.
+    """
+
+    def __init__(self, level: str = "DEBUG", slower_than: float = 0.0):
+        self.level = level
+        self.slower_than = slower_than
+
+    def __call__(self, span: Span) -> None:
+        if span.error is not None:
+            logger.warning(f"{span!r}")
+        elif span.duration >= self.slower_than:
+            logger.log(self.level, f"{span!r}")
+
+
+class PrometheusHook:
+    """
+    Export operations as Prometheus metrics with `prometheus_client`:
+
+        {namespace}_operation_seconds{operation, model, collection, phase}
+        {namespace}_points_total{operation, model, collection}
+        {namespace}_payload_bytes_total{...}, {namespace}_vector_bytes_total{...}
+        {namespace}_errors_total{operation, model, collection, error}
+    """
+
+    def __init__(self, registry: Any = None, namespace: str = "qdrant_odm"):
+        try:
+            import prometheus_client
+        except ImportError:
+            raise ImportError(
+                "PrometheusHook needs prometheus_client: `pip install qdrant-odm[metrics]`"
+            ) from None
+
+        kwargs = {} if registry is None else {"registry": registry}
+        labels = ("operation", "model", "collection")
+        self.seconds = prometheus_client.Histogram(
+            f"{namespace}_operation_seconds",
+            "Time of ODM operations by phase",
+            (*labels, "phase"),
+            **kwargs,
+        )
+        self.points = prometheus_client.Counter(
+            f"{namespace}_points", "Points read or written", labels, **kwargs
+        )
+        self.payload_bytes = prometheus_client.Counter(
+            f"{namespace}_payload_bytes", "Payload bytes read or written", labels, **kwargs
+        )
+        self.vector_bytes = prometheus_client.Counter(
+            f"{namespace}_vector_bytes", "Vector bytes read or written", labels, **kwargs
+        )
+        self.errors = prometheus_client.Counter(
+            f"{namespace}_errors", "Failed operations", (*labels, "error"), **kwargs
+        )
+
+    def __call__(self, span: Span) -> None:
+        labels = (span.operation, span.model, span.collection or "")
+        for phase in ("duration", "serialize", "network", "decode"):
+            self.seconds.labels(*labels, phase).observe(getattr(span, phase))
+        self.points.labels(*labels).inc(span.points)
+        self.payload_bytes.labels(*labels).inc(span.payload_bytes)
+        self.vector_bytes.labels(*labels).inc(span.vector_bytes)
+        if span.error is not None:
+            self.errors.labels(*labels, type(span.error).__name__).inc()
+
+
+class OpenTelemetryHook:
+    """
+    Report operations as OpenTelemetry spans named `qdrant_odm.{operation}`,
+    with the phases, sizes and error as attributes, and as a duration
+    histogram.
+    """
+
+    def __init__(self, tracer_provider: Any = None, meter_provider: Any = None):
+        try:
+            from opentelemetry import metrics, trace
+        except ImportError:
+            raise ImportError(
+                "OpenTelemetryHook needs opentelemetry-api: `pip install qdrant-odm[otel]`"
+            ) from None
+
+        self._trace = trace
+        self.tracer = trace.get_tracer("qdrant_odm", tracer_provider=tracer_provider)
+        meter = metrics.get_meter("qdrant_odm", meter_provider=meter_provider)
+        self.duration = meter.create_histogram(
+            "qdrant_odm.operation.duration", unit="s", description="Time of ODM operations"
+        )
+
+    def __call__(self, span: Span) -> None:
+        attributes = {
+            "qdrant_odm.operation": span.operation,
+            "qdrant_odm.model": span.model,
+            "db.system": "qdrant",
+            "db.collection.name": span.collection or "",
+        }
+        started = int(span.started * 1e9)
+        otel_span = self.tracer.start_span(
+            f"qdrant_odm.{span.operation}",
+            start_time=started,
+            attributes=attributes
+            | {
+                "qdrant_odm.serialize_seconds": span.serialize,
+                "qdrant_odm.network_seconds": span.network,
+                "qdrant_odm.decode_seconds": span.decode,
+                "qdrant_odm.points": span.points,
+                "qdrant_odm.payload_bytes": span.payload_bytes,
+                "qdrant_odm.vector_bytes": span.vector_bytes,
+            },
+        )
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        otel_span.end(end_time=started + int(span.duration * 1e9))
+        self.duration.record(span.duration, attributes)
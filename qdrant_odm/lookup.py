@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import uuid
+from concurrent.futures import Future
+from itertools import batched
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Sequence
+
+from qdrant_client.conversions import common_types as types
+
+
+def normalize_id(id: types.PointId) -> types.PointId:
+    """
+    Qdrant returns UUID ids in their canonical form, whatever form was sent.
+    """
+    if isinstance(id, str):
+        return str(uuid.UUID(id))
+    return id
+
+
+def order_by_ids[P](
+    ids: Sequence[types.PointId],
+    records: Iterable[types.Record],
+    decode: Callable[[Sequence[types.Record]], list[P]],
+) -> list[P | None]:
+    """
+    Decode `records` and line them up with `ids`, None for the missing ones.
+    """
+    records = list(records)
+    found = {record.id: point for record, point in zip(records, decode(records))}
+    return [found.get(normalize_id(id)) for id in ids]
+
+
+def retrieve_many[P](
+    retrieve: Callable[[list[types.PointId]], Sequence[types.Record]],
+    decode: Callable[[Sequence[types.Record]], list[P]],
+    ids: Iterable[types.PointId],
+    chunk_size: int,
+) -> list[P | None]:
+    ids = list(ids)
+    records = [
+        record
+        for chunk in batched(dict.fromkeys(ids), chunk_size)
+        for record in retrieve(list(chunk))
+    ]
+    return order_by_ids(ids, records, decode)
+
+
+class _Batch:
+    def __init__(self):
+        self.futures: dict[types.PointId, Any] = {}
+        self.full = threading.Event()
+
+
+class GetBatcher[P]:
+    """
+    Coalesces `get()` calls made from different threads within `window`
+    seconds into a single `get_many()`.
+
+    The first caller of a batch waits for the window (or until the batch
+    reaches `max_batch_size`) and then fetches for everyone. Calls with
+    the same id share the returned instance.
+    """
+
+    def __init__(
+        self,
+        get_many: Callable[[list[types.PointId], Any], list[P | None]],
+        window: float = 0.002,
+        max_batch_size: int = 256,
+    ):
+        self._get_many = get_many
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._lock = threading.Lock()
+        self._pending: dict[Hashable, _Batch] = {}
+
+    def get(self, id: types.PointId, read_options: Hashable) -> P | None:
+        with self._lock:
+            batch = self._pending.get(read_options)
+            leader = batch is None
+
+            if batch is None:
+                batch = self._pending[read_options] = _Batch()
+
+            if (future := batch.futures.get(id)) is None:
+                future = batch.futures[id] = Future()
+
+            if len(batch.futures) >= self._max_batch_size:
+                del self._pending[read_options]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self._window)
+            with self._lock:
+                if self._pending.get(read_options) is batch:
+                    del self._pending[read_options]
+            self._flush(batch, read_options)
+
+        return future.result()
+
+    def _flush(self, batch: _Batch, read_options: Hashable) -> None:
+        ids = list(batch.futures)
+
+        try:
+            points = self._get_many(ids, read_options)
+        except Exception as error:
+            for future in batch.futures.values():
+                future.set_exception(error)
+        else:
+            for id, point in zip(ids, points):
+                batch.futures[id].set_result(point)
+
+
+class _AsyncBatch:
+    def __init__(self):
+        self.futures: dict[types.PointId, asyncio.Future] = {}
+        self.full = asyncio.Event()
+
+
+class AsyncGetBatcher[P]:
+    """
+    Async counterpart of `GetBatcher`, coalescing `get()` calls awaited
+    concurrently on the same event loop.
+    """
+
+    def __init__(
+        self,
+        get_many: Callable[[list[types.PointId], Any], Awaitable[list[P | None]]],
+        window: float = 0.002,
+        max_batch_size: int = 256,
+    ):
+        self._get_many = get_many
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._pending: dict[Hashable, _AsyncBatch] = {}
+
+    async def get(self, id: types.PointId, read_options: Hashable) -> P | None:
+        batch = self._pending.get(read_options)
+        leader = batch is None
+
+        if batch is None:
+            batch = self._pending[read_options] = _AsyncBatch()
+
+        if (future := batch.futures.get(id)) is None:
+            future = batch.futures[id] = asyncio.get_running_loop().create_future()
+
+        if len(batch.futures) >= self._max_batch_size:
+            del self._pending[read_options]
+            batch.full.set()
+
+        if leader:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self._window)
+            except TimeoutError:
+                pass
+
+            if self._pending.get(read_options) is batch:
+                del self._pending[read_options]
+            await self._flush(batch, read_options)
+
+        return await future
+
+    async def _flush(self, batch: _AsyncBatch, read_options: Hashable) -> None:
+        ids = list(batch.futures)
+
+        try:
+            points = await self._get_many(ids, read_options)
+        except Exception as error:
+            for future in batch.futures.values():
+                future.set_exception(error)
+        else:
+            for id, point in zip(ids, points):
+                batch.futures[id].set_result(point)
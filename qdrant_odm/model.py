@@ -1,30 +1,65 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import MappingProxyType
 from typing import (
     Any,
+    Awaitable,
     Callable,
     ClassVar,
     Generic,
+    Iterable,
     Mapping,
     NamedTuple,
     Self,
+    Sequence,
     TypeVar,
     TypedDict,
 )
 
+import numpy as np
 from loguru import logger
 from pydantic import BaseModel
-from qdrant_client import QdrantClient, models as qmodels
+from qdrant_client import AsyncQdrantClient, QdrantClient, models as qmodels
 from qdrant_client.conversions import common_types as types
 
-from .dataclass import DataClass
+from . import codegen
+from .cache import CachedRecord, PointCache
+from .dataclass import DataClass, SchemaMeta, field_slot
+from .deferred import (
+    DeferredLoader,
+    FetchFields,
+    WithPayload,
+    WithVectors,
+    defer,
+    deferred_fields,
+    deferred_vectors,
+)
+from .filters import Fields
+from .instrument import current_span, payload_size, record_sizes, vector_size
+from .pool import ClientPool, is_local
+from .reconcile import (
+    CollectionDiff,
+    diff_collection,
+    log_unsafe,
+    reconcile_collection,
+    update_kwargs,
+)
+from .schema_cache import SchemaCache
 from .index.vectors import (
     SparseVectorType,
     BaseVectorIndex,
+    DenseVectorIndex,
     DenseVectorType,
     DenseMultiVectorType,
     SparseVectorType,
     SparseVector,
     Vector,
     MultiVector,
+    is_ndarray_type,
 )
 from .index.payload import (
     BasePayloadIndex,
@@ -81,67 +116,175 @@ class IndexConfig(NamedTuple):
     payloads: Mapping[str, PayloadParams]
 
 
-class PointModel(DataClass, Generic[T]):
-    __client__: ClassVar[QdrantClient]
+def _same_payload_index(info: qmodels.PayloadIndexInfo, params: BaseModel) -> bool:
+    """
+    Whether an existing index matches the declared params. Params left
+    unset in the declaration are not compared.
+    """
+    if str(info.data_type.value) != str(getattr(params, "type").value):
+        return False
+
+    return all(
+        getattr(info.params, name, None) == value
+        for name, value in params
+        if name != "type" and value is not None
+    )
+
+
+class ModelMeta(SchemaMeta):
+    """
+    Gives models the field accessor `f`, so that `Chunk.f.topic == "news"`
+    builds a filter expression. Being defined on the metaclass, it is not an
+    attribute of the points and leaves the class and instance attribute
+    lookups of the fields alone.
+    """
+
+    @property
+    def f(cls) -> Fields:
+        return Fields(cls)  # type: ignore
+
+
+class PointModel(DataClass, Generic[T], metaclass=ModelMeta):
+    __slots__ = (
+        "_persisted",
+        "_plan",
+        "_changed",
+        "_loader",
+    )
+
+    __client__: ClassVar[QdrantClient | ClientPool]
+    __async_client__: ClassVar[AsyncQdrantClient]
     __collection_name__: ClassVar[str]
-    __non_payload_fields__: ClassVar[set[str]] = {"id"}
+    __indexes__: ClassVar[Mapping[str, Any]] = MappingProxyType({})
+    __index_config__: ClassVar[VectorConfigs] = {
+        "vectors_config": {},
+        "sparse_vectors_config": {},
+    }
+    __non_payload_fields__: ClassVar[frozenset[str]] = frozenset({"id"})
+    __payload_fields__: ClassVar[tuple[str, ...]] = ()
+    __vector_fields__: ClassVar[tuple[str, ...]] = ()
+    __numpy_vectors__: ClassVar[Mapping[str, np.dtype]] = MappingProxyType({})
+    __payload_indexes__: ClassVar[Mapping[str, PayloadParams]] = MappingProxyType({})
+    __tracked_fields__: ClassVar[frozenset[str]] = frozenset()
+    __embedded_fields__: ClassVar[Mapping[str, DenseVectorIndex]] = MappingProxyType({})
+    __cache__: ClassVar[PointCache | None] = None
+    __field_setters__: ClassVar[tuple[tuple[str, Callable, Any], ...]] = ()
 
     collection_config: ClassVar[CollectionConfig] = CollectionConfig()
 
     id: T
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        schema = cls.__schema__
+
+        # Index declarations (`index.Vector(...)` etc.) are not field values,
+        # so they are kept apart from the defaults used to build instances.
+        indexes, defaults = dict(cls.__indexes__), {}
+        for field, value in schema.defaults.items():
+            if isinstance(value, (BaseVectorIndex, BasePayloadIndex)):
+                indexes[field] = value
+            else:
+                indexes.pop(field, None)
+                defaults[field] = value
+
+        cls.__indexes__ = MappingProxyType(indexes)
+        cls.__schema__ = schema._replace(defaults=MappingProxyType(defaults))
+        cls.__field_setters__ = tuple(
+            (field, field_slot(cls, field).__set__, defaults.get(field))
+            for field in schema.fields
+        )
+
+        index_config = cls._build_index_config()
+        cls.__index_config__ = index_config
+        cls.__payload_indexes__ = MappingProxyType(
+            {
+                field: PayloadParams(value.params, value.field_name(field))
+                for field, value in indexes.items()
+                if isinstance(value, BasePayloadIndex)
+            }
+        )
+        cls.__vector_fields__ = (
+            *index_config["vectors_config"],
+            *index_config["sparse_vectors_config"],
+        )
+        cls.__numpy_vectors__ = MappingProxyType(
+            {
+                field: value.dtype
+                for field, value in indexes.items()
+                if isinstance(value, DenseVectorIndex)
+                and value.returns_numpy(schema.fields[field])
+            }
+        )
+        cls.__non_payload_fields__ = frozenset(("id", *cls.__vector_fields__))
+        cls.__payload_fields__ = tuple(
+            field for field in schema.fields if field not in cls.__non_payload_fields__
+        )
+        cls.__tracked_fields__ = frozenset(
+            (*cls.__payload_fields__, *cls.__vector_fields__)
+        )
+        cls.__embedded_fields__ = MappingProxyType(
+            {
+                field: value
+                for field, value in indexes.items()
+                if isinstance(value, DenseVectorIndex) and value.embedder is not None
+            }
+        )
+        for field, value in cls.__embedded_fields__.items():
+            if value.source not in cls.__payload_fields__:
+                raise ValueError(
+                    f"Source {value.source} of {field} is not a payload field of {cls.__name__}"
+                )
+
+        custom = cls._custom_serializers()
+        for name, make in (
+            ("payload", codegen.make_payload),
+            ("vectors", codegen.make_vectors),
+            (
+                "_to_point_struct",
+                partial(
+                    codegen.make_to_point_struct,
+                    call_payload="payload" in custom,
+                    call_vectors="vectors" in custom,
+                ),
+            ),
+            ("_from_record", codegen.make_from_record),
+        ):
+            if name not in custom:
+                setattr(cls, name, make(cls))
+
+    @classmethod
+    def _custom_serializers(cls) -> set[str]:
+        """
+        Serialization methods written by hand on `cls` or one of its bases.
+        The closest definition in the MRO decides: generated methods of a
+        parent model and the generic ones of `PointModel` are replaced.
+        """
+        custom = set()
+        for name in ("payload", "vectors", "_to_point_struct", "_from_record"):
+            owner = next(klass for klass in cls.__mro__ if name in klass.__dict__)
+            if owner is not PointModel and not codegen.is_generated(owner.__dict__[name]):
+                custom.add(name)
+        return custom
+
     @classmethod
     def _build_index_config(cls) -> VectorConfigs:
         vectors_config, sparse_vectors_config = {}, {}
-        payload_indicies = {}
-
-        for field, type_ in cls.__annotations__.items():
-            if not hasattr(cls, field):
-                continue
+        fields = cls.__schema__.fields
 
-            # value = getattr(cls, field)
-
-            # if isinstance(value, BasePayloadIndex):
-            #     pass
-            #     # msg = f"Payload field {field} must be of type {{}}. Got {type_}"
-
-            #     # if isinstance(value, Keyword):
-            #     #     assert type_ == KeywordType, msg.format(KeywordType)
-            #     #     payload_indicies[field] = value.params
-            #     # elif isinstance(value, Integer):
-            #     #     assert type_ == IntegerType, msg.format(IntegerType)
-            #     #     payload_indicies[field] = value.params
-            #     # elif isinstance(value, Text):
-            #     #     assert type_ == TextType, msg.format(TextType)
-            #     #     payload_indicies[field] = value.params
-
-            #     # elif isinstance(value, Uuid):
-            #     #     assert type_ == UuidType, msg.format(UuidType)
-            #     #     payload_indicies[field] = value.params
-            #     # elif isinstance(value, Geo):
-            #     #     assert type_ == GeoType, msg.format(GeoType)
-            #     #     payload_indicies[field] = value.params
-            #     # elif isinstance(value, MultiGeo):
-            #     #     assert type_ == MultiGeoType, msg.format(MultiGeoType)
-            #     #     payload_indicies[field] = value.params
-            #     # elif isinstance(value, Float):
-            #     #     assert type_ == FloatType, msg.format(FloatType)
-            #     #     payload_indicies[field] = value.params
-
-            # elif isinstance(value, Callable) and value.__name__ == "Bool":
-            #     msg = f"Payload field {field} must be of type {{}}. Got {type_}"
-            #     assert type_ == BoolType, msg.format(BoolType)
-            #     payload_indicies[field] = value
-
-            # elif isinstance(cls, BaseVectorIndex):
+        for field, value in cls.__indexes__.items():
+            type_ = fields[field]
             msg = f"Vector field {field} must be of type {{}}. Got {type_}"
-            value = getattr(cls, field)
 
             if isinstance(value, Vector):
-                assert type_ == DenseVectorType, msg.format(DenseVectorType)
+                assert type_ == DenseVectorType or is_ndarray_type(type_), msg.format(
+                    f"{DenseVectorType} or np.ndarray"
+                )
                 vectors_config[field] = value.params
             elif isinstance(value, MultiVector):
-                assert type_ == DenseMultiVectorType, msg.format(DenseMultiVectorType)
+                assert type_ == DenseMultiVectorType or is_ndarray_type(
+                    type_
+                ), msg.format(f"{DenseMultiVectorType} or np.ndarray")
                 vectors_config[field] = value.params
             elif isinstance(value, SparseVector):
                 assert type_ == SparseVectorType, msg.format(SparseVectorType)
@@ -153,66 +296,599 @@ class PointModel(DataClass, Generic[T]):
         }
 
     @classmethod
-    def init_collection(cls, client: QdrantClient):
-        cls.__client__ = client
+    def _collection_kwargs(cls) -> dict[str, Any]:
+        # The default `collection_config` instance is shared by all models,
+        # so the resolved name is never written back into it.
+        collection_name = cls.collection_config.collection_name or cls.__name__
+        cls.__collection_name__ = collection_name
+
+        return (
+            cls.__index_config__
+            | cls.collection_config.to_dict()
+            | {"collection_name": collection_name}
+        )
 
-        if cls.collection_config.collection_name is None:
-            cls.collection_config.collection_name = cls.__name__
+    @classmethod
+    def _payload_index_changes(
+        cls, payload_schema: Mapping[str, qmodels.PayloadIndexInfo]
+    ) -> tuple[list[str], list[PayloadParams]]:
+        """
+        Payload indexes to drop and to create for the collection to match the
+        declared ones. Indexes with other params are recreated, undeclared
+        indexes are left alone.
+        """
+        drop, create = [], []
+
+        for index in cls.__payload_indexes__.values():
+            if (info := payload_schema.get(index.key)) is None:  # type: ignore
+                create.append(index)
+            elif not _same_payload_index(info, index.params):
+                logger.info(
+                    f"Recreating payload index {index.key} of {cls.__collection_name__}"
+                )
+                drop.append(index.key)
+                create.append(index)
+
+        return drop, create  # type: ignore
 
-        cls.__collection_name__ = cls.collection_config.collection_name
+    @classmethod
+    def _check_config(cls, info: qmodels.CollectionInfo, reconcile: bool) -> dict[str, Any]:
+        """
+        Compare an existing collection with the declaration, returning the
+        `update_collection` arguments to apply if `reconcile`, or logging the
+        differences otherwise.
+        """
+        changes = diff_collection(cls, info)
+        if not changes:
+            return {}
+
+        if reconcile:
+            log_unsafe(cls.__collection_name__, changes)
+            return update_kwargs(cls, changes)
+
+        logger.warning(
+            f"{len(changes)} setting(s) of {cls.__collection_name__} differ from "
+            f"{cls.__name__}, see {cls.__name__}.reconcile_collection(dry_run=True)"
+        )
+        return {}
 
-        index_config = cls._build_index_config()
+    @classmethod
+    def reconcile_collection(cls, dry_run: bool = False) -> CollectionDiff:
+        """
+        Apply the declared `collection_config` and vector params that differ
+        on the existing collection and can be changed in place, such as HNSW,
+        quantization or optimizer settings. Other differences are reported.
+
+        Args:
+            dry_run (bool, optional): Only report the differences. Defaults to False.
+
+        Returns:
+            CollectionDiff: The differences, and whether they were applied.
+        """
+        return reconcile_collection(cls, cls.__client__, dry_run)
+
+    @classmethod
+    def init_collection(cls, client: QdrantClient | ClientPool, reconcile: bool = False):
+        """
+        Create the collection if it does not exist, and its declared payload
+        indexes if they are missing or differ.
+
+        The config of an existing collection is compared with the declaration;
+        with `reconcile` the settings that can be changed in place are
+        updated, otherwise the differences are logged.
+        """
+        cls.__client__ = client
+        collection_kwargs = cls._collection_kwargs()
+        collection_name = cls.__collection_name__
+
+        if client.collection_exists(collection_name):
+            info = client.get_collection(collection_name)
+            payload_schema = info.payload_schema
+            if update := cls._check_config(info, reconcile):
+                client.update_collection(**update)
+        else:
+            client.create_collection(**collection_kwargs)  # type: ignore
+            payload_schema = {}
+
+        drop, create = cls._payload_index_changes(payload_schema)
 
-        cls.__non_payload_fields__.update(index_config["vectors_config"])
-        cls.__non_payload_fields__.update(index_config["sparse_vectors_config"])
+        for field_name in drop:
+            client.delete_payload_index(collection_name, field_name)
+        for params, field_name in create:
+            client.create_payload_index(
+                collection_name, field_name=field_name, field_schema=params  # type: ignore
+            )
 
-        if client.collection_exists(cls.collection_config.collection_name):
-            pass
-            # logger.info(
-            #     "Collection already exists, if you want to update it use update_collection manually",
-            # )
+    @classmethod
+    async def init_collection_async(cls, client: AsyncQdrantClient, reconcile: bool = False):
+        """
+        Async counterpart of `init_collection`. The client is kept as
+        `__async_client__`, used by `AsyncPointCRUD` when not given one.
+        """
+        cls.__async_client__ = client
+        collection_kwargs = cls._collection_kwargs()
+        collection_name = cls.__collection_name__
+
+        if await client.collection_exists(collection_name):
+            info = await client.get_collection(collection_name)
+            payload_schema = info.payload_schema
+            if update := cls._check_config(info, reconcile):
+                await client.update_collection(**update)
         else:
-            index_config |= cls.collection_config.to_dict()
-            client.create_collection(**index_config)  # type: ignore
+            await client.create_collection(**collection_kwargs)  # type: ignore
+            payload_schema = {}
+
+        drop, create = cls._payload_index_changes(payload_schema)
+
+        await asyncio.gather(
+            *(client.delete_payload_index(collection_name, name) for name in drop)
+        )
+        await asyncio.gather(
+            *(
+                client.create_payload_index(
+                    collection_name, field_name=field_name, field_schema=params  # type: ignore
+                )
+                for params, field_name in create
+            )
+        )
+
+    @classmethod
+    def enable_cache(
+        cls,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+        max_bytes: int | None = None,
+    ) -> PointCache:
+        """
+        Cache the records read for this model and serve `get` and `get_many`
+        from it. Writes made through the model or its executors invalidate
+        the written ids.
+
+        Args:
+            max_entries (int, optional): Maximum number of cached points. Defaults to 10_000.
+            ttl (float | None, optional): Seconds an entry stays valid. Defaults to None (no expiry).
+            max_bytes (int | None, optional): Approximate memory limit of the cache. Defaults to None.
+
+        Returns:
+            PointCache: The cache, e.g. to read its `stats`.
+        """
+        cls.__cache__ = PointCache(max_entries, ttl, max_bytes)
+        return cls.__cache__
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        cls.__cache__ = None
+
+    @classmethod
+    def _cached_records(
+        cls, ids: Sequence[T], with_vectors: bool | Sequence[str]
+    ) -> tuple[list[CachedRecord], list[T]]:
+        """
+        Split `ids` into cached records and ids that have to be fetched.
+        """
+        if (cache := cls.__cache__) is None:
+            return [], list(ids)
+
+        records, missing = [], []
+        for id in ids:
+            if (record := cache.get(cls.__collection_name__, id, with_vectors)) is None:
+                missing.append(id)
+            else:
+                records.append(record)
+
+        return records, missing
+
+    @classmethod
+    def _cache_records(
+        cls,
+        records: Iterable[types.Record | types.ScoredPoint],
+        with_vectors: bool | Sequence[str],
+        with_payload: WithPayload = True,
+    ) -> None:
+        # Projected records would be served later as whole points.
+        if (cache := cls.__cache__) is not None and with_payload is True:
+            cache.put(cls.__collection_name__, records, with_vectors)
+
+    @classmethod
+    def _invalidate_cache(cls, ids: Iterable[T]) -> None:
+        if (cache := cls.__cache__) is not None:
+            cache.invalidate(cls.__collection_name__, ids)
 
     @classmethod
     def _from_record(
         cls, record: types.Record | types.ScoredPoint, set_persisted: bool = False
     ) -> Self:
-        point = cls(id=record.id, **record.payload or {}, **record.vector or {})  # type: ignore
+        vectors = dict(record.vector or {})  # type: ignore
+        for field, dtype in cls.__numpy_vectors__.items():
+            vectors[field] = codegen._array(vectors.get(field), dtype)
+
+        point = cls(id=record.id, **record.payload or {}, **vectors)  # type: ignore
         point._persisted = set_persisted
+        point._changed.clear()
         return point
 
+    @classmethod
+    def _decode_records(
+        cls,
+        records: Sequence[types.Record | types.ScoredPoint],
+        with_payload: WithPayload = True,
+        with_vectors: WithVectors = False,
+        fetch: FetchFields | None = None,
+        lazy: bool = False,
+    ) -> list[Self]:
+        """
+        Decode persisted points. With `lazy`, fields left out by
+        `with_payload` and `with_vectors` are deferred: they are loaded for
+        all the points with `fetch` when first read on any of them.
+        Otherwise they keep their default, vectors None.
+        """
+        span = current_span()
+        started = time.perf_counter()
+        points = [cls._from_record(record, set_persisted=True) for record in records]
+
+        if lazy:
+            fields = deferred_fields(cls, with_payload)
+            vectors = deferred_vectors(cls, with_vectors)
+            if fields or vectors:
+                defer(cls, points, records, fields, vectors, fetch)
+
+        if span is not None:
+            elapsed = time.perf_counter() - started
+            payload_bytes, vector_bytes = record_sizes(records)
+            span.add(
+                decode=elapsed,
+                points=len(points),
+                payload_bytes=payload_bytes,
+                vector_bytes=vector_bytes,
+            )
+        return points
+
+    @classmethod
+    def _encode_points(cls, points: Iterable[Self]) -> list[qmodels.PointStruct]:
+        """
+        Encode points for an upsert, measured by the current operation.
+        """
+        if (span := current_span()) is None:
+            return [point._to_point_struct() for point in points]
+
+        started = time.perf_counter()
+        structs = [point._to_point_struct() for point in points]
+        elapsed = time.perf_counter() - started
+        payload_bytes, vector_bytes = record_sizes(structs)
+        span.add(
+            serialize=elapsed,
+            points=len(structs),
+            payload_bytes=payload_bytes,
+            vector_bytes=vector_bytes,
+        )
+        return structs
+
+    def __init__(self, **kwargs):
+        # Fields are written through their slot descriptors, which skips the
+        # change tracking of `__setattr__`: only assignments made once the
+        # point is built are changes.
+        changed = set()
+        object.__setattr__(self, "_changed", changed)
+        for field, set_field, default in self.__field_setters__:
+            set_field(self, kwargs.get(field, default))
+        self.__post_init__()
+        changed.clear()
+
     def __post_init__(self):
-        self._persisted = False
-        self._current_prefetch: types.Prefetch | None = None
-        self._context_prefetch_is_on = False
+        # Not fields, so not tracked: set without going through `__setattr__`.
+        object.__setattr__(self, "_persisted", False)
+        object.__setattr__(self, "_plan", None)
+        object.__setattr__(self, "_loader", None)
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached when a slot is unset, i.e. for deferred fields.
+        if name in self.__schema__.fields and (loader := self._loader) is not None:
+            loader.load(name)
+            return getattr(self, name)
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name in self.__tracked_fields__:
+            self._changed.add(name)
 
     @property
     def persisted(self) -> bool:
         return self._persisted
 
-    def payload(self) -> dict[str, Any]:
-        return self.to_dict(exclude=self.__non_payload_fields__)
+    def _prefetch(self) -> qmodels.Prefetch | None:
+        """
+        Stages stacked with `prefetch()`, for a query of the point.
+        """
+        return None if self._plan is None else self._plan._stage(self.id)
 
-    def vectors(self) -> dict[str, types.Vector]:
-        result = {}
+    @property
+    def changed(self) -> frozenset[str]:
+        """
+        Fields assigned since the point was built, loaded or saved.
+        """
+        return frozenset(self._changed)
+
+    def mark_changed(self, *fields: str) -> None:
+        """
+        Mark fields as changed, e.g. after mutating a list payload in place,
+        which attribute tracking cannot see.
+        """
+        for field in fields:
+            if field not in self.__tracked_fields__:
+                raise ValueError(f"{field} is not a payload or vector field")
+        self._changed.update(fields)
 
-        for field in self.__non_payload_fields__:
-            if field == "id":
+    @classmethod
+    def fill_embeddings(cls, points: Iterable[Self]) -> None:
+        """
+        Compute the embedded vector fields of `points` that need it, with one
+        `Embedder.embed` call per field for all the points.
+
+        New points are embedded when their vector is None, persisted ones
+        when their source field changed and their vector was not assigned.
+        """
+        points = list(points)
+
+        for field, index in cls.__embedded_fields__.items():
+            source, dtype = index.source, cls.__numpy_vectors__.get(field)
+            targets = [
+                point
+                for point in points
+                if (
+                    source in point._changed and field not in point._changed
+                    if point._persisted
+                    else getattr(point, field) is None
+                )
+            ]
+            embedded = []
+            for point in targets:
+                if (value := getattr(point, source)) is not None:
+                    embedded.append((point, value))
+                elif point._persisted:
+                    setattr(point, field, None)
+
+            if not embedded:
                 continue
 
-            if vector := getattr(self, field, None):
-                if type(vector) is SparseVectorType:
-                    result[field] = qmodels.SparseVector(
-                        indices=vector[0], values=vector[1]
+            vectors = index.embedder.embed([value for _, value in embedded])  # type: ignore
+            for (point, _), vector in zip(embedded, vectors):
+                setattr(
+                    point,
+                    field,
+                    np.asarray(vector, dtype)
+                    if dtype is not None
+                    else np.asarray(vector).tolist(),
+                )
+
+    def _update_operations(
+        self,
+        overwrite_vectors: bool = False,
+        shard_key_selector: types.ShardKeySelector | None = None,
+    ) -> tuple[list[types.UpdateOperation], set[str]]:
+        """
+        Build the operations writing the changed fields of a persisted point.
+
+        Payload fields set to None are deleted, as are vectors set to None.
+        Vectors are only included with `overwrite_vectors`, except embedded
+        ones which always follow their source field.
+
+        Returns:
+            tuple[list[types.UpdateOperation], set[str]]: Operations and the fields they write.
+        """
+        span = current_span()
+        started = time.perf_counter()
+        payload, deleted_keys, vectors, deleted_vectors = {}, [], {}, []
+        written = set()
+        sparse_fields = self.__index_config__["sparse_vectors_config"]
+
+        for field in self._changed:
+            value = getattr(self, field)
+
+            if field in self.__non_payload_fields__:
+                if not overwrite_vectors and field not in self.__embedded_fields__:
+                    continue
+                if value is None:
+                    deleted_vectors.append(field)
+                else:
+                    vectors[field] = (
+                        codegen._sparse(value)
+                        if field in sparse_fields
+                        else codegen._dense(value)
+                    )
+            elif value is None:
+                deleted_keys.append(field)
+            else:
+                payload[field] = value
+
+            written.add(field)
+
+        points, operations = [self.id], []
+
+        if payload:
+            operations.append(
+                qmodels.SetPayloadOperation(
+                    set_payload=qmodels.SetPayload(
+                        payload=payload, points=points, shard_key=shard_key_selector
+                    )
+                )
+            )
+        if deleted_keys:
+            operations.append(
+                qmodels.DeletePayloadOperation(
+                    delete_payload=qmodels.DeletePayload(
+                        keys=deleted_keys, points=points, shard_key=shard_key_selector
+                    )
+                )
+            )
+        if vectors:
+            operations.append(
+                qmodels.UpdateVectorsOperation(
+                    update_vectors=qmodels.UpdateVectors(
+                        points=[qmodels.PointVectors(id=self.id, vector=vectors)],
+                        shard_key=shard_key_selector,
                     )
+                )
+            )
+        if deleted_vectors:
+            operations.append(
+                qmodels.DeleteVectorsOperation(
+                    delete_vectors=qmodels.DeleteVectors(
+                        vector=deleted_vectors, points=points, shard_key=shard_key_selector
+                    )
+                )
+            )
+
+        if span is not None:
+            span.add(
+                serialize=time.perf_counter() - started,
+                points=1,
+                payload_bytes=payload_size(payload),
+                vector_bytes=vector_size(vectors),
+            )
+        return operations, written
+
+    # The generic implementations below are replaced on every subclass by
+    # specialized versions from `codegen` (see `__init_subclass__`), unless
+    # the subclass or one of its bases overrides them.
+
+    def payload(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__payload_fields__}
+
+    def vectors(self) -> dict[str, types.Vector]:
+        result = {}
+        sparse_fields = self.__index_config__["sparse_vectors_config"]
+
+        for field in self.__vector_fields__:
+            if (vector := getattr(self, field)) is not None:
+                if field in sparse_fields:
+                    result[field] = codegen._sparse(vector)
                 else:
-                    result[field] = vector
+                    result[field] = codegen._dense(vector)
 
         return result
 
-
-def init_models(client: QdrantClient, models: list[type[PointModel[T]]]):
-    for model in models:
-        model.init_collection(client)
+    def _to_point_struct(self) -> qmodels.PointStruct:
+        return qmodels.PointStruct(
+            id=self.id, payload=self.payload(), vector=self.vectors()
+        )
+
+
+class _LazyClient:
+    """
+    Client of a model initialized lazily: reading any attribute, as the
+    first request does, initializes the collection and hands the model its
+    actual client.
+    """
+
+    def __init__(
+        self,
+        model: type[PointModel],
+        client: QdrantClient | ClientPool,
+        init: Callable[[type[PointModel]], None],
+    ):
+        self._model = model
+        self._client = client
+        self._init = init
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        with self._lock:
+            if self._model.__dict__.get("__client__") is self:
+                try:
+                    self._init(self._model)
+                except BaseException:
+                    # Tried again on the next request.
+                    self._model.__client__ = self  # type: ignore
+                    raise
+        return getattr(self._client, name)
+
+
+def init_models(
+    client: QdrantClient | AsyncQdrantClient | ClientPool,
+    models: list[type[PointModel[T]]],
+    parallel: int = 8,
+    cache: str | os.PathLike | None = None,
+    lazy: bool = False,
+    reconcile: bool = False,
+) -> Awaitable[None] | None:
+    """
+    Create the collections of `models` if they do not exist yet.
+
+    Collections are checked and created concurrently. With an
+    `AsyncQdrantClient` an awaitable is returned:
+    `await init_models(async_client, [...])`. With a `ClientPool` the models
+    read from its replicas and write to its primary.
+
+    Args:
+        client (QdrantClient | AsyncQdrantClient | ClientPool): Client of the models.
+        models (list[type[PointModel[T]]]): Models to initialize.
+        parallel (int, optional): Number of collections initialized at once; local clients initialize them one by one. Defaults to 8.
+        cache (str | os.PathLike | None, optional): `SchemaCache` file; models whose declaration did not change since they were initialized are trusted without any request. Defaults to None.
+        lazy (bool, optional): Initialize each collection on the first request of its model instead. Defaults to False.
+        reconcile (bool, optional): Update the settings of existing collections that differ from the declarations and can be changed in place. Defaults to False.
+    """
+    if parallel < 1:
+        raise ValueError("parallel must be positive")
+
+    schema_cache = None if cache is None else SchemaCache(cache)
+
+    if isinstance(client, AsyncQdrantClient):
+        if lazy:
+            raise ValueError("Lazy initialization needs a synchronous client")
+        return _init_models_async(client, models, schema_cache, reconcile)
+
+    def init(model: type[PointModel]) -> None:
+        if schema_cache is not None and schema_cache.fresh(model, client):
+            model.__client__ = client
+            return
+
+        model.init_collection(client, reconcile)
+        if schema_cache is not None:
+            schema_cache.add(model, client)
+            if lazy:
+                schema_cache.save()
+
+    if lazy:
+        for model in models:
+            model._collection_kwargs()
+            model.__client__ = _LazyClient(model, client, init)  # type: ignore
+        return
+
+    if parallel == 1 or len(models) < 2 or is_local(client):
+        for model in models:
+            init(model)
+    else:
+        with ThreadPoolExecutor(min(parallel, len(models))) as executor:
+            for _ in executor.map(init, models):
+                pass
+
+    if schema_cache is not None:
+        schema_cache.save()
+
+
+async def _init_models_async(
+    client: AsyncQdrantClient,
+    models: list[type[PointModel[T]]],
+    schema_cache: SchemaCache | None,
+    reconcile: bool,
+) -> None:
+    if schema_cache is not None:
+        fresh = [model for model in models if schema_cache.fresh(model, client)]
+        for model in fresh:
+            model.__async_client__ = client
+        models = [model for model in models if model not in fresh]
+
+    await asyncio.gather(
+        *(model.init_collection_async(client, reconcile) for model in models)
+    )
+
+    if schema_cache is not None:
+        for model in models:
+            schema_cache.add(model, client)
+        schema_cache.save()
@@ -0,0 +1,296 @@
+from functools import partial
+from itertools import batched
+from typing import Any, Iterable, Mapping, Sequence
+
+from qdrant_client import models
+from qdrant_client.conversions import common_types as types
+
+from . import codegen
+from .crud import ReadOptions, _fetch_fields, _with_scores
+from .deferred import FetchFields
+from .filters import Expr, as_filter
+from .instrument import instrumented
+from .model import PointModel
+
+type QueryInput = types.PointId | Sequence[float] | Sequence[Sequence[float]] | Any
+
+
+class QueryPlan[P: PointModel]:
+    """
+    Immutable multi-stage query of a model: prefetch stages, fusion, filter,
+    search params and limit.
+
+    The `models.Prefetch` tree is validated once when the plan is built; each
+    run only copies it with the query of the run filled in. A plan holds no
+    per-run state, so one instance can be shared by any number of threads.
+
+    The query is a point id, a persisted point, a vector, or a mapping of
+    vector field names to vectors for plans searching several fields.
+
+        plan = QueryPlan(
+            Chunk,
+            prefetch=[
+                QueryPlan(Chunk, using="dense", limit=100),
+                QueryPlan(Chunk, using="sparse", limit=100),
+            ],
+            fusion=models.Fusion.RRF,
+            limit=10,
+        )
+        plan.query({"dense": dense_vector, "sparse": sparse_vector})
+    """
+
+    __slots__ = (
+        "model",
+        "using",
+        "limit",
+        "score_threshold",
+        "query_filter",
+        "search_params",
+        "prefetch",
+        "fusion",
+        "_prefetch_template",
+        "_request_template",
+    )
+
+    model: type[P]
+    using: str | None
+    limit: int
+    score_threshold: float | None
+    query_filter: types.Filter | None
+    search_params: types.SearchParams | None
+    prefetch: "tuple[QueryPlan[P], ...]"
+    fusion: models.Fusion | None
+
+    def __init__(
+        self,
+        model: type[P],
+        using: str | None = None,
+        limit: int = 10,
+        score_threshold: float | None = None,
+        query_filter: types.Filter | Expr | None = None,
+        search_params: types.SearchParams | None = None,
+        prefetch: "Iterable[QueryPlan[P]]" = (),
+        fusion: models.Fusion | None = None,
+    ):
+        """
+        Args:
+            model (type[P]): Model of the queried points.
+            using (str | None, optional): Vector field searched by this stage. Defaults to None.
+            limit (int, optional): Number of points returned by this stage. Defaults to 10.
+            score_threshold (float | None, optional): Score threshold. Defaults to None.
+            query_filter (types.Filter | Expr | None, optional): Filter, compiled once. Defaults to None.
+            search_params (types.SearchParams | None, optional): Search params. Defaults to None.
+            prefetch (Iterable[QueryPlan[P]], optional): Stages whose results this one rescores or fuses. Defaults to ().
+            fusion (models.Fusion | None, optional): Fuse the results of `prefetch` instead of searching. Defaults to None.
+        """
+        prefetch = tuple(prefetch)
+        query_filter = as_filter(query_filter)
+
+        if using is not None and using not in model.__vector_fields__:
+            raise ValueError(f"{using} is not a vector field of {model.__name__}")
+        if fusion is not None and (using is not None or not prefetch):
+            raise ValueError("A fusion stage needs prefetch stages and no vector field")
+
+        for name, value in (
+            ("model", model),
+            ("using", using),
+            ("limit", limit),
+            ("score_threshold", score_threshold),
+            ("query_filter", query_filter),
+            ("search_params", search_params),
+            ("prefetch", prefetch),
+            ("fusion", fusion),
+        ):
+            object.__setattr__(self, name, value)
+
+        stage = {
+            "query": None if fusion is None else models.FusionQuery(fusion=fusion),
+            "using": using,
+            "limit": limit,
+            "score_threshold": score_threshold,
+            "filter": query_filter,
+            "params": search_params,
+        }
+        object.__setattr__(self, "_prefetch_template", models.Prefetch(**stage))
+        object.__setattr__(self, "_request_template", models.QueryRequest(**stage))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("QueryPlan is immutable, use replace() instead")
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryPlan({self.model.__name__}, using={self.using!r}, "
+            f"limit={self.limit}, fusion={self.fusion!r}, prefetch={list(self.prefetch)!r})"
+        )
+
+    def replace(self, **changes: Any) -> "QueryPlan[P]":
+        """
+        Return a copy of the plan with some arguments changed.
+        """
+        arguments = {
+            "model": self.model,
+            "using": self.using,
+            "limit": self.limit,
+            "score_threshold": self.score_threshold,
+            "query_filter": self.query_filter,
+            "search_params": self.search_params,
+            "prefetch": self.prefetch,
+            "fusion": self.fusion,
+        }
+        return QueryPlan(**arguments | changes)
+
+    def then(
+        self,
+        using: str,
+        limit: int = 10,
+        score_threshold: float | None = None,
+        query_filter: types.Filter | Expr | None = None,
+        search_params: types.SearchParams | None = None,
+    ) -> "QueryPlan[P]":
+        """
+        Return a plan rescoring the results of this one with another vector field.
+        """
+        return QueryPlan(
+            self.model,
+            using,
+            limit,
+            score_threshold,
+            query_filter,
+            search_params,
+            prefetch=(self,),
+        )
+
+    def _query(self, query: QueryInput) -> models.NearestQuery:
+        if isinstance(query, PointModel):
+            if not query._persisted:
+                raise ValueError(
+                    "Cannot query with a non-persisted point. You need to save it first."
+                )
+            query = query.id
+        elif isinstance(query, Mapping):
+            try:
+                query = query[self.using]
+            except KeyError:
+                raise ValueError(f"No query given for vector field {self.using}") from None
+
+        if isinstance(query, (int, str)):
+            return models.NearestQuery(nearest=query)
+        if self.using in self.model.__index_config__["sparse_vectors_config"]:
+            return models.NearestQuery(nearest=codegen._sparse(query))
+        return models.NearestQuery(nearest=codegen._dense(query))
+
+    def _update(self, query: QueryInput) -> dict[str, Any]:
+        update = {}
+        if self.fusion is None:
+            update["query"] = self._query(query)
+        if self.prefetch:
+            update["prefetch"] = [stage._stage(query) for stage in self.prefetch]
+        return update
+
+    def _stage(self, query: QueryInput) -> models.Prefetch:
+        """
+        The plan as a prefetch stage of another query.
+        """
+        return self._prefetch_template.model_copy(update=self._update(query))
+
+    def _query_kwargs(
+        self, query: QueryInput, read_options: ReadOptions
+    ) -> dict[str, Any]:
+        update = self._update(query)
+        return {
+            "collection_name": self.model.__collection_name__,
+            "query": update.get("query", self._request_template.query),
+            "prefetch": update.get("prefetch"),
+            "using": self.using,
+            "limit": self.limit,
+            "score_threshold": self.score_threshold,
+            "query_filter": self.query_filter,
+            "search_params": self.search_params,
+            **read_options._client_kwargs(),
+        }
+
+    def _requests(
+        self, queries: Iterable[QueryInput], read_options: ReadOptions
+    ) -> list[models.QueryRequest]:
+        shared = {
+            "with_vector": read_options.with_vectors,
+            "with_payload": read_options.with_payload,
+            "shard_key": read_options.shard_key_selector,
+        }
+        return [
+            self._request_template.model_copy(update=self._update(query) | shared)
+            for query in queries
+        ]
+
+    def _decode(
+        self,
+        results: Sequence[Sequence[types.ScoredPoint]],
+        read_options: ReadOptions,
+        fetch: FetchFields | None,
+    ) -> list[list[tuple[P, float]]]:
+        model = self.model
+        for points in results:
+            model._cache_records(
+                points, read_options.with_vectors, read_options.with_payload
+            )
+
+        decode = partial(
+            model._decode_records,
+            with_payload=read_options.with_payload,
+            with_vectors=read_options.with_vectors,
+            fetch=fetch,
+            lazy=read_options.lazy,
+        )
+        return _with_scores(decode, results)
+
+    @instrumented("query")
+    def query(
+        self, query: QueryInput, read_options: ReadOptions = ReadOptions()
+    ) -> list[tuple[P, float]]:
+        """
+        Run the plan with the client of the model.
+
+        Args:
+            query (QueryInput): Point id, persisted point, vector or mapping of vector fields to vectors.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+
+        Returns:
+            list[tuple[P, float]]: Points with their scores.
+        """
+        client = self.model.__client__
+        response = client.query_points(**self._query_kwargs(query, read_options))
+        fetch = _fetch_fields(client, self.model, read_options)
+        return self._decode([response.points], read_options, fetch)[0]
+
+    @instrumented("query_many")
+    def query_many(
+        self,
+        queries: Iterable[QueryInput],
+        read_options: ReadOptions = ReadOptions(),
+        chunk_size: int = 64,
+    ) -> list[list[tuple[P, float]]]:
+        """
+        Run the plan for several queries with `query_batch_points`.
+
+        Args:
+            queries (Iterable[QueryInput]): Queries, see `query`.
+            read_options (ReadOptions, optional): Read options. Defaults to ReadOptions().
+            chunk_size (int, optional): Maximum number of queries per request. Defaults to 64.
+
+        Returns:
+            list[list[tuple[P, float]]]: Points with their scores, in the order of `queries`.
+        """
+        client = self.model.__client__
+        results = []
+
+        for chunk in batched(self._requests(queries, read_options), chunk_size):
+            responses = client.query_batch_points(
+                self.model.__collection_name__,
+                requests=chunk,
+                consistency=read_options.consistency,
+                timeout=read_options.timeout,
+            )
+            results += [response.points for response in responses]
+
+        fetch = _fetch_fields(client, self.model, read_options)
+        return self._decode(results, read_options, fetch)
@@ -0,0 +1,261 @@
+import itertools
+import threading
+import time
+from functools import partial
+from typing import Any, Literal, Sequence
+
+import grpc
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+type RoutingPolicy = Literal["round_robin", "least_inflight"]
+
+# Client methods that only read points, routed over the readers. Everything
+# else, including collection management, goes to the primary.
+READ_METHODS = frozenset(
+    {
+        "retrieve",
+        "scroll",
+        "count",
+        "facet",
+        "query_points",
+        "query_batch_points",
+        "query_points_groups",
+        "search",
+        "search_batch",
+        "search_groups",
+        "recommend",
+        "recommend_batch",
+        "recommend_groups",
+        "discover",
+        "discover_batch",
+        "search_matrix_pairs",
+        "search_matrix_offsets",
+    }
+)
+
+_UNAVAILABLE_CODES = frozenset(
+    {grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED}
+)
+
+
+def _unavailable(error: Exception) -> bool:
+    """
+    Whether `error` means the node could not serve the request, as opposed
+    to the request being invalid.
+    """
+    if isinstance(error, (ResponseHandlingException, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code is None or error.status_code >= 500
+    if isinstance(error, grpc.RpcError):
+        return error.code() in _UNAVAILABLE_CODES  # type: ignore
+    return False
+
+
+def _init_options(client: Any) -> dict[str, Any]:
+    options = getattr(client, "init_options", None)
+    return options if isinstance(options, dict) else {}
+
+
+def endpoint_name(client: Any) -> str:
+    """
+    URL, host, location or path a client was created with.
+    """
+    options = _init_options(client)
+    return str(
+        next(
+            (options[key] for key in ("url", "host", "location", "path") if options.get(key)),
+            repr(client),
+        )
+    )
+
+
+def is_local(client: Any) -> bool:
+    """
+    Whether `client` runs Qdrant in process, in memory or on disk. Local
+    clients are not thread-safe.
+    """
+    options = _init_options(client)
+    return options.get("location") == ":memory:" or options.get("path") is not None
+
+
+class _Member:
+    __slots__ = ("client", "name", "inflight", "failures", "ejected_until")
+
+    def __init__(self, client: QdrantClient, name: str):
+        self.client = client
+        self.name = name
+        self.inflight = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+
+class ClientPool:
+    """
+    Several Qdrant clients used as one: writes go to the primary, reads are
+    spread over the replicas.
+
+    A pool stands in for a `QdrantClient` wherever the ODM takes one, e.g.
+    `init_models(ClientPool(...), [...])`. Point reads (`retrieve`, `scroll`,
+    `count`, `query_points`, ...) are routed to a reader chosen by `policy`;
+    any other call is made on the primary. Replicas may lag behind the
+    primary, so a point read right after being written may be stale.
+
+    A reader failing `eject_after` times in a row with a connection error or
+    a server error is ejected for `eject_for` seconds, then tried again. A
+    failed read is retried on another reader, and on ejected ones when no
+    healthy reader is left.
+
+        pool = ClientPool(
+            "http://qdrant-0:6334",
+            ["http://qdrant-1:6334", "http://qdrant-2:6334"],
+            policy="least_inflight",
+            connections=2,
+            prefer_grpc=True,
+        )
+        init_models(pool, [Chunk])
+    """
+
+    def __init__(
+        self,
+        primary: QdrantClient | str,
+        replicas: Sequence[QdrantClient | str] = (),
+        policy: RoutingPolicy = "round_robin",
+        read_from_primary: bool = True,
+        connections: int = 1,
+        eject_after: int = 3,
+        eject_for: float = 30.0,
+        **client_kwargs: Any,
+    ):
+        """
+        Args:
+            primary (QdrantClient | str): Client, or URL, receiving the writes.
+            replicas (Sequence[QdrantClient | str], optional): Clients, or URLs, of the other nodes serving reads. Defaults to ().
+            policy (RoutingPolicy, optional): "round_robin", or "least_inflight" to pick the reader with the fewest running requests. Defaults to "round_robin".
+            read_from_primary (bool, optional): Whether the primary serves reads too; always True without replicas. Defaults to True.
+            connections (int, optional): Number of clients created per URL, each with its own connections, to spread reads over several channels. Defaults to 1.
+            eject_after (int, optional): Consecutive failures ejecting a reader. Defaults to 3.
+            eject_for (float, optional): Seconds an ejected reader is skipped. Defaults to 30.0.
+            client_kwargs (Any): Arguments of the clients created from URLs, e.g. `api_key` or `prefer_grpc`.
+        """
+        if policy not in ("round_robin", "least_inflight"):
+            raise ValueError(f"Unknown routing policy {policy!r}")
+        if connections < 1 or eject_after < 1:
+            raise ValueError("connections and eject_after must be positive")
+
+        primaries = self._members(primary, connections, client_kwargs)
+        self.primary = primaries[0].client
+        self.policy = policy
+        self._eject_after = eject_after
+        self._eject_for = eject_for
+        self._readers = [
+            member
+            for replica in replicas
+            for member in self._members(replica, connections, client_kwargs)
+        ]
+        if read_from_primary or not self._readers:
+            self._readers = primaries + self._readers
+
+        self._lock = threading.Lock()
+        self._turns = itertools.count()
+
+    @staticmethod
+    def _members(
+        endpoint: QdrantClient | str, connections: int, client_kwargs: dict[str, Any]
+    ) -> list[_Member]:
+        if not isinstance(endpoint, str):
+            return [_Member(endpoint, endpoint_name(endpoint))]
+        return [
+            _Member(QdrantClient(url=endpoint, **client_kwargs), endpoint)
+            for _ in range(connections)
+        ]
+
+    def __repr__(self) -> str:
+        return f"ClientPool({len(self._readers)} readers, policy={self.policy!r})"
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__") or name == "primary":
+            raise AttributeError(name)
+
+        attribute = getattr(self.primary, name)
+        if not callable(attribute):
+            return attribute
+
+        # Bound once: later lookups find it on the instance.
+        method = partial(self._read, name) if name in READ_METHODS else attribute
+        self.__dict__[name] = method
+        return method
+
+    def healthy(self) -> dict[str, bool]:
+        """
+        Whether each reader is currently in rotation, by endpoint.
+        """
+        now = time.monotonic()
+        health: dict[str, bool] = {}
+        for member in self._readers:
+            health[member.name] = health.get(member.name, False) or member.ejected_until <= now
+        return health
+
+    def _choose(self, tried: list[_Member]) -> _Member | None:
+        now = time.monotonic()
+        candidates = [member for member in self._readers if member not in tried]
+        if not candidates:
+            return None
+        candidates = [
+            member for member in candidates if member.ejected_until <= now
+        ] or candidates
+
+        # Rotating first spreads ties of least_inflight too.
+        turn = next(self._turns) % len(candidates)
+        candidates = candidates[turn:] + candidates[:turn]
+        if self.policy == "round_robin":
+            return candidates[0]
+        return min(candidates, key=lambda member: member.inflight)
+
+    def _read(self, name: str, *args: Any, **kwargs: Any) -> Any:
+        tried: list[_Member] = []
+        error: Exception
+
+        while True:
+            with self._lock:
+                member = self._choose(tried)
+                if member is None:
+                    raise error
+                member.inflight += 1
+
+            try:
+                result = getattr(member.client, name)(*args, **kwargs)
+            except Exception as exception:
+                if not _unavailable(exception):
+                    raise
+                error = exception
+                tried.append(member)
+                self._failed(member, error)
+            else:
+                member.failures = 0
+                return result
+            finally:
+                with self._lock:
+                    member.inflight -= 1
+
+    def _failed(self, member: _Member, error: Exception) -> None:
+        with self._lock:
+            member.failures += 1
+            if member.failures < self._eject_after:
+                return
+            member.ejected_until = time.monotonic() + self._eject_for
+
+        logger.warning(
+            f"Ejected {member.name} from reads for {self._eject_for:g}s "
+            f"after {member.failures} failures: {error}"
+        )
+
+    def close(self, **kwargs: Any) -> None:
+        """
+        Close all the clients of the pool.
+        """
+        clients = [self.primary] + [member.client for member in self._readers]
+        for client in {id(client): client for client in clients}.values():
+            client.close(**kwargs)
@@ -0,0 +1,284 @@
+import argparse
+import os
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple, Sequence
+
+from loguru import logger
+from pydantic import BaseModel
+from qdrant_client import QdrantClient, models
+
+if TYPE_CHECKING:
+    from .model import PointModel
+    from .pool import ClientPool
+
+# Collection-wide settings compared with the declaration, and whether
+# `update_collection` can change them on an existing collection.
+COLLECTION_SETTINGS = {
+    "hnsw_config": True,
+    "optimizers_config": True,
+    "quantization_config": True,
+    "replication_factor": True,
+    "write_consistency_factor": True,
+    "on_disk_payload": True,
+    "shard_number": False,
+    "sharding_method": False,
+    "wal_config": False,
+}
+VECTOR_SETTINGS = {
+    "hnsw_config": True,
+    "quantization_config": True,
+    "on_disk": True,
+    "size": False,
+    "distance": False,
+    "datatype": False,
+    "multivector_config": False,
+}
+SPARSE_VECTOR_SETTINGS = {
+    "index": True,
+    "modifier": True,
+}
+
+
+class ConfigChange(NamedTuple):
+    """
+    A setting of a collection differing from its declaration. `vector` is
+    None for collection-wide settings; `safe` changes are applied in place,
+    the others need the collection to be recreated.
+    """
+
+    vector: str | None
+    setting: str
+    current: Any
+    declared: Any
+    safe: bool
+
+
+class CollectionDiff(NamedTuple):
+    collection: str
+    changes: tuple[ConfigChange, ...]
+    applied: bool
+
+    @property
+    def unsafe(self) -> tuple[ConfigChange, ...]:
+        return tuple(change for change in self.changes if not change.safe)
+
+    def report(self) -> str:
+        """
+        Human-readable list of the changes, as printed by a dry run.
+        """
+        if not self.changes:
+            return f"{self.collection}: up to date"
+
+        status = "applied" if self.applied else "not applied"
+        lines = [f"{self.collection}: {len(self.changes)} change(s), {status}"]
+        for change in self.changes:
+            target = "collection" if change.vector is None else f"vector {change.vector}"
+            flag = "" if change.safe else "  (needs recreating the collection)"
+            lines.append(
+                f"  {target} {change.setting}: {change.current!r} -> {change.declared!r}{flag}"
+            )
+        return "\n".join(lines)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    return getattr(value, "value", value)
+
+
+def _leaves(declared: Any, current: Any, path: str) -> Iterator[tuple[str, Any, Any]]:
+    if isinstance(declared, dict):
+        current = current if isinstance(current, dict) else {}
+        for key, value in declared.items():
+            yield from _leaves(value, current.get(key), f"{path}.{key}")
+    elif declared != current:
+        yield path, current, declared
+
+
+def _changes(
+    vector: str | None, setting: str, current: Any, declared: Any, safe: bool
+) -> list[ConfigChange]:
+    # Settings left unset in the declaration are not compared.
+    if declared is None:
+        return []
+    return [
+        ConfigChange(vector, path, current_value, declared_value, safe)
+        for path, current_value, declared_value in _leaves(
+            _dump(declared), _dump(current), setting
+        )
+    ]
+
+
+def diff_collection(
+    model: "type[PointModel]", info: models.CollectionInfo
+) -> list[ConfigChange]:
+    """
+    Settings of the collection described by `info` that differ from the
+    declaration of `model`: its `collection_config` and the params of its
+    vector fields. Vectors of the collection that are not declared are left
+    alone.
+    """
+    config, params = info.config, info.config.params
+    declared = model.collection_config.to_dict()
+    current = {setting: getattr(params, setting, None) for setting in COLLECTION_SETTINGS}
+    current |= {
+        "hnsw_config": config.hnsw_config,
+        "optimizers_config": config.optimizer_config,
+        "quantization_config": config.quantization_config,
+        "wal_config": config.wal_config,
+    }
+    changes = [
+        change
+        for setting, safe in COLLECTION_SETTINGS.items()
+        for change in _changes(None, setting, current.get(setting), declared[setting], safe)
+    ]
+
+    vectors = params.vectors if isinstance(params.vectors, dict) else {}
+    sparse_vectors = params.sparse_vectors or {}
+    index_config = model.__index_config__
+
+    for declared_vectors, current_vectors, settings in (
+        (index_config["vectors_config"], vectors, VECTOR_SETTINGS),
+        (index_config["sparse_vectors_config"], sparse_vectors, SPARSE_VECTOR_SETTINGS),
+    ):
+        for name, declared_params in declared_vectors.items():
+            if (current_params := current_vectors.get(name)) is None:
+                changes.append(ConfigChange(name, "params", None, _dump(declared_params), False))
+                continue
+
+            for setting, safe in settings.items():
+                changes += _changes(
+                    name,
+                    setting,
+                    getattr(current_params, setting),
+                    getattr(declared_params, setting),
+                    safe,
+                )
+
+    return changes
+
+
+def update_kwargs(
+    model: "type[PointModel]", changes: Sequence[ConfigChange]
+) -> dict[str, Any]:
+    """
+    Arguments of `update_collection` applying the safe `changes`, or an
+    empty dict if there are none.
+    """
+    config = model.collection_config
+    index_config = model.__index_config__
+    settings = {
+        change.setting.split(".")[0]
+        for change in changes
+        if change.safe and change.vector is None
+    }
+    vectors = {change.vector for change in changes if change.safe and change.vector}
+    kwargs: dict[str, Any] = {}
+
+    for setting in ("hnsw_config", "optimizers_config", "quantization_config"):
+        if setting in settings:
+            kwargs[setting] = getattr(config, setting)
+
+    collection_params = {
+        setting: getattr(config, setting)
+        for setting in ("replication_factor", "write_consistency_factor", "on_disk_payload")
+        if setting in settings
+    }
+    if collection_params:
+        kwargs["collection_params"] = models.CollectionParamsDiff(**collection_params)
+
+    vectors_config, sparse_vectors_config = {}, {}
+    for name in sorted(vectors):
+        if (params := index_config["vectors_config"].get(name)) is not None:
+            vectors_config[name] = models.VectorParamsDiff(
+                hnsw_config=params.hnsw_config,
+                quantization_config=params.quantization_config,
+                on_disk=params.on_disk,
+            )
+        else:
+            sparse_vectors_config[name] = index_config["sparse_vectors_config"][name]
+
+    if vectors_config:
+        kwargs["vectors_config"] = vectors_config
+    if sparse_vectors_config:
+        kwargs["sparse_vectors_config"] = sparse_vectors_config
+
+    if kwargs:
+        kwargs["collection_name"] = model.__collection_name__
+        kwargs["timeout"] = config.timeout
+    return kwargs
+
+
+def log_unsafe(collection: str, changes: Sequence[ConfigChange]) -> None:
+    for change in changes:
+        if change.safe:
+            continue
+        target = "collection" if change.vector is None else f"vector {change.vector}"
+        logger.warning(
+            f"{collection}: {target} {change.setting} is {change.current!r}, "
+            f"declared {change.declared!r}; recreate the collection to change it"
+        )
+
+
+def reconcile_collection(
+    model: "type[PointModel]",
+    client: "QdrantClient | ClientPool | None" = None,
+    dry_run: bool = False,
+) -> CollectionDiff:
+    """
+    Compare the existing collection of `model` with its declaration and
+    apply the changes `update_collection` can make in place, such as new
+    HNSW, quantization or optimizer settings. Changes that would need the
+    collection to be recreated are only reported.
+
+    Args:
+        model (type[PointModel]): Model of the collection.
+        client (QdrantClient | ClientPool | None, optional): Client, the one of `model` if None. Defaults to None.
+        dry_run (bool, optional): Only report the changes. Defaults to False.
+
+    Returns:
+        CollectionDiff: The changes, and whether they were applied.
+    """
+    client = client or model.__client__
+    model._collection_kwargs()
+    info = client.get_collection(model.__collection_name__)
+    changes = diff_collection(model, info)
+    kwargs = {} if dry_run else update_kwargs(model, changes)
+
+    if kwargs:
+        logger.info(f"Updating the config of {model.__collection_name__}")
+        client.update_collection(**kwargs)
+
+    if not dry_run:
+        log_unsafe(model.__collection_name__, changes)
+    return CollectionDiff(model.__collection_name__, tuple(changes), bool(kwargs))
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    from .ingest import _load_model
+
+    parser = argparse.ArgumentParser(
+        prog="qdrant-odm-reconcile",
+        description="Report, and with --apply update, collection settings "
+        "differing from their model declarations.",
+    )
+    parser.add_argument("models", nargs="+", help="Models, as package.module:Model")
+    parser.add_argument("--url", default="http://localhost:6333", help="Qdrant URL")
+    parser.add_argument("--api-key", default=os.environ.get("QDRANT_API_KEY"))
+    parser.add_argument("--apply", action="store_true", help="Apply the safe changes")
+    args = parser.parse_args(argv)
+
+    client = QdrantClient(url=args.url, api_key=args.api_key)
+    diffs = [
+        reconcile_collection(_load_model(path), client, dry_run=not args.apply)
+        for path in args.models
+    ]
+    for diff in diffs:
+        print(diff.report())
+
+    # Non-zero while some collection still differs, e.g. in a CI check: any
+    # change after a dry run, and changes --apply cannot make.
+    return int(any(diff.unsafe or (diff.changes and not args.apply) for diff in diffs))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from .pool import endpoint_name
+
+if TYPE_CHECKING:
+    from .model import PointModel
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", exclude_none=True)
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    return str(value)
+
+
+class SchemaCache:
+    """
+    Fingerprints of the collections found to match their declared models,
+    kept in a local JSON file so that later starts trust them without any
+    request to Qdrant.
+
+    A fingerprint covers the collection name, vectors, collection config
+    and payload indexes of a model, and the endpoint of the client, so any
+    change to the declaration checks the collection again. Changes made to
+    the collection from outside the ODM are not noticed: delete the file
+    after dropping or altering collections by hand.
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._fingerprints: dict[str, str] = {}
+
+        try:
+            self._fingerprints = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable schema cache {self.path}: {error}")
+
+    @staticmethod
+    def _key(model: "type[PointModel]", client: Any) -> str:
+        return f"{endpoint_name(client)}/{model.__collection_name__}"
+
+    @staticmethod
+    def fingerprint(model: "type[PointModel]") -> str:
+        declaration = {
+            "collection": model._collection_kwargs(),
+            "payload_indexes": sorted(
+                model.__payload_indexes__.values(), key=lambda index: index.key
+            ),
+        }
+        return hashlib.sha256(
+            json.dumps(declaration, sort_keys=True, default=_jsonable).encode()
+        ).hexdigest()
+
+    def fresh(self, model: "type[PointModel]", client: Any) -> bool:
+        """
+        Whether the collection of `model` was initialized with its current
+        declaration.
+        """
+        # An in-memory collection does not outlive the process.
+        if endpoint_name(client) == ":memory:":
+            return False
+
+        fingerprint = self.fingerprint(model)
+        with self._lock:
+            return self._fingerprints.get(self._key(model, client)) == fingerprint
+
+    def add(self, model: "type[PointModel]", client: Any) -> None:
+        fingerprint = self.fingerprint(model)
+        with self._lock:
+            self._fingerprints[self._key(model, client)] = fingerprint
+
+    def save(self) -> None:
+        with self._lock:
+            content = json.dumps(self._fingerprints, indent=1, sort_keys=True)
+
+        # Unique per writer, as several processes may start at once.
+        temporary = self.path.with_name(
+            f"{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        temporary.write_text(content)
+        os.replace(temporary, self.path)
@@ -0,0 +1,189 @@
+import asyncio
+import queue
+import threading
+import time
+from contextlib import AbstractContextManager, nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    Sequence,
+)
+
+from qdrant_client.conversions import common_types as types
+
+type Page = tuple[Sequence[types.Record], types.PointId | None]
+type Fetch = Callable[[types.PointId | None, int], Page]
+type AsyncFetch = Callable[[types.PointId | None, int], Awaitable[Page]]
+type Decode[P] = Callable[[Sequence[types.Record]], list[P]]
+type Measure = Callable[[], AbstractContextManager[Any]]
+
+
+class PageSize:
+    """
+    Scroll page size, fixed or adapted to the observed round-trip time.
+
+    The adaptive size doubles while pages come back well under
+    `target_seconds` and halves when they take much longer, within
+    `[minimum, maximum]`.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = None,
+        initial: int = 64,
+        minimum: int = 16,
+        maximum: int = 2048,
+        target_seconds: float = 0.25,
+    ):
+        self.adaptive = limit is None
+        self.value = initial if limit is None else limit
+        self._minimum = minimum
+        self._maximum = maximum
+        self._target_seconds = target_seconds
+
+    def observe(self, elapsed: float, received: int) -> None:
+        if not self.adaptive or received < self.value:
+            return
+
+        if elapsed < self._target_seconds / 2:
+            self.value = min(self.value * 2, self._maximum)
+        elif elapsed > self._target_seconds * 2:
+            self.value = max(self.value // 2, self._minimum)
+
+
+def iter_pages[P](
+    fetch: Fetch,
+    decode: Decode[P],
+    limit: int | None = None,
+    read_ahead: int = 0,
+    measure: Measure = nullcontext,
+) -> Iterator[list[P]]:
+    """
+    Iterate over decoded scroll pages.
+
+    Args:
+        fetch (Fetch): `(offset, limit) -> (records, next_offset)`.
+        decode (Decode[P]): Page decoder.
+        limit (int | None, optional): Page size, adaptive if None. Defaults to None.
+        read_ahead (int, optional): Number of pages fetched and decoded in a
+            background thread while the current one is processed. Defaults to 0.
+        measure (Measure, optional): Context manager entered around the fetch
+            and decoding of each page. Defaults to nullcontext.
+    """
+    pages = _fetch_pages(fetch, decode, PageSize(limit), measure)
+    return _read_ahead(pages, read_ahead) if read_ahead > 0 else pages
+
+
+def _fetch_pages[P](
+    fetch: Fetch, decode: Decode[P], page_size: PageSize, measure: Measure
+) -> Iterator[list[P]]:
+    offset = None
+
+    while True:
+        with measure():
+            started = time.perf_counter()
+            records, offset = fetch(offset, page_size.value)
+            page_size.observe(time.perf_counter() - started, len(records))
+            page = decode(records)
+        yield page
+
+        if offset is None:
+            break
+
+
+_DONE = object()
+
+
+def _read_ahead[P](pages: Iterator[P], size: int) -> Iterator[P]:
+    buffer: queue.Queue[Any] = queue.Queue(maxsize=size)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put(page):
+                    return
+        except BaseException as error:
+            put(error)
+        else:
+            put(_DONE)
+
+    thread = threading.Thread(target=produce, name="qdrant-odm-scroll", daemon=True)
+    thread.start()
+
+    try:
+        while (item := buffer.get()) is not _DONE:
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
+async def aiter_pages[P](
+    fetch: AsyncFetch,
+    decode: Decode[P],
+    limit: int | None = None,
+    read_ahead: int = 0,
+    measure: Measure = nullcontext,
+) -> AsyncIterator[list[P]]:
+    """
+    Async counterpart of `iter_pages`; read-ahead pages are fetched by a
+    task on the running event loop.
+    """
+    pages = _afetch_pages(fetch, decode, PageSize(limit), measure)
+
+    if read_ahead <= 0:
+        async for page in pages:
+            yield page
+        return
+
+    buffer: asyncio.Queue[Any] = asyncio.Queue(maxsize=read_ahead)
+
+    async def produce() -> None:
+        try:
+            async for page in pages:
+                await buffer.put(page)
+        except Exception as error:
+            await buffer.put(error)
+        else:
+            await buffer.put(_DONE)
+
+    task = asyncio.create_task(produce())
+
+    try:
+        while (item := await buffer.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+async def _afetch_pages[P](
+    fetch: AsyncFetch, decode: Decode[P], page_size: PageSize, measure: Measure
+) -> AsyncIterator[list[P]]:
+    offset = None
+
+    while True:
+        with measure():
+            started = time.perf_counter()
+            records, offset = await fetch(offset, page_size.value)
+            page_size.observe(time.perf_counter() - started, len(records))
+            page = decode(records)
+        yield page
+
+        if offset is None:
+            break
@@ -0,0 +1,171 @@
+from collections import defaultdict
+from types import TracebackType
+from typing import Any, Literal, NamedTuple, Self
+
+from qdrant_client import QdrantClient, models
+
+from .crud import WriteOptions
+from .instrument import count_points, operation
+from .lookup import normalize_id
+from .model import PointModel
+
+
+class _Pending(NamedTuple):
+    kind: Literal["upsert", "update", "delete"]
+    point: PointModel
+    overwrite_vectors: bool = False
+
+
+class Session:
+    """
+    Unit of work collecting writes of any number of points and collections,
+    sent on exit with one `batch_update_points` request per collection.
+
+    Only the last state of each point is written: saving a point twice sends
+    it once, deleting a saved point only deletes it and deleting a point that
+    was never persisted sends nothing. New points are upserted as a whole,
+    persisted ones only send their changed fields. Points are encoded at
+    flush time, so changes made after `save()` are included.
+
+    Nothing is sent if the block raises.
+
+        with Session() as session:
+            session.save(chunk)
+            session.delete(old_chunk)
+    """
+
+    def __init__(self, write_options: WriteOptions = WriteOptions()):
+        self._write_options = write_options
+        self._pending: dict[tuple[type[PointModel], Any], _Pending] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self._pending.clear()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _key(self, point: PointModel) -> tuple[type[PointModel], Any]:
+        return type(point), normalize_id(point.id)
+
+    def save(self, *points: PointModel, overwrite_vectors: bool = False) -> None:
+        """
+        Schedule an upsert of new points or an update of persisted ones.
+
+        Args:
+            points (PointModel): Points to save.
+            overwrite_vectors (bool, optional): Whether to write changed vectors of persisted points. Defaults to False.
+        """
+        for point in points:
+            key = self._key(point)
+            previous = self._pending.pop(key, None)
+
+            if not point._persisted or (previous and previous.kind != "update"):
+                self._pending[key] = _Pending("upsert", point)
+            else:
+                overwrite = overwrite_vectors or bool(
+                    previous and previous.overwrite_vectors
+                )
+                self._pending[key] = _Pending("update", point, overwrite)
+
+    def delete(self, *points: PointModel) -> None:
+        """
+        Schedule the deletion of points.
+
+        Args:
+            points (PointModel): Points to delete.
+        """
+        for point in points:
+            key = self._key(point)
+            previous = self._pending.pop(key, None)
+
+            if point._persisted:
+                self._pending[key] = _Pending("delete", point)
+            elif previous is None:
+                raise ValueError(
+                    "Cannot delete non-persisted point. You need to save it first."
+                )
+
+    def flush(self) -> None:
+        """
+        Send the pending writes, one request per collection.
+        """
+        groups: defaultdict[
+            tuple[QdrantClient, str], list[_Pending]
+        ] = defaultdict(list)
+
+        embedded: defaultdict[type[PointModel], list[PointModel]] = defaultdict(list)
+
+        for (model, _), pending in self._pending.items():
+            groups[model.__client__, model.__collection_name__].append(pending)
+            if model.__embedded_fields__ and pending.kind != "delete":
+                embedded[model].append(pending.point)
+
+        for model, points in embedded.items():
+            model.fill_embeddings(points)
+
+        for (client, collection_name), group in groups.items():
+            with operation("flush", type(group[0].point)):
+                self._flush_collection(client, collection_name, group)
+
+            for pending in group:
+                del self._pending[self._key(pending.point)]
+
+    def _flush_collection(
+        self, client: QdrantClient, collection_name: str, group: list[_Pending]
+    ) -> None:
+        shard_key = self._write_options.shard_key_selector
+        upserts = [pending.point for pending in group if pending.kind == "upsert"]
+        deletes = [pending.point for pending in group if pending.kind == "delete"]
+        operations, written = [], {}
+
+        if upserts:
+            operations.append(
+                models.UpsertOperation(
+                    upsert=models.PointsList(
+                        points=PointModel._encode_points(upserts),
+                        shard_key=shard_key,
+                    )
+                )
+            )
+        if deletes:
+            count_points(len(deletes))
+            operations.append(
+                models.DeleteOperation(
+                    delete=models.PointIdsList(
+                        points=[point.id for point in deletes], shard_key=shard_key
+                    )
+                )
+            )
+        for pending in group:
+            if pending.kind == "update":
+                point_operations, written[pending.point] = (
+                    pending.point._update_operations(pending.overwrite_vectors, shard_key)
+                )
+                operations += point_operations
+
+        if operations:
+            client.batch_update_points(
+                collection_name,
+                update_operations=operations,
+                wait=self._write_options.wait,
+                ordering=self._write_options.ordering,
+            )
+
+        for point in upserts:
+            point._persisted = True
+            point._changed.clear()
+        for point, fields in written.items():
+            point._changed -= fields
+        for pending in group:
+            type(pending.point)._invalidate_cache([pending.point.id])
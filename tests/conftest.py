@@ -0,0 +1,9 @@
+import pytest
+from qdrant_client import QdrantClient
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    yield client
+    client.close()
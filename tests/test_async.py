@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException
+
+from qdrant_odm import PointModel, ReadOptions, RetryOptions, index, init_models
+from qdrant_odm.executors import AsyncPointCRUD
+
+
+class Doc(PointModel[int]):
+    text: str
+    rank: int = index.Integer()
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _crud() -> AsyncPointCRUD[Doc]:
+    client = AsyncQdrantClient(":memory:")
+    await init_models(client, [Doc])  # type: ignore
+    return AsyncPointCRUD(Doc)
+
+
+def test_init_models_assigns_the_async_client():
+    async def check():
+        client = AsyncQdrantClient(":memory:")
+        await init_models(client, [Doc])  # type: ignore
+        assert Doc.__async_client__ is client
+        assert await client.collection_exists("Doc")
+
+    run(check())
+
+
+def test_crud_without_init_needs_a_client():
+    class Unbound(PointModel[int]):
+        text: str
+
+    with pytest.raises(ValueError):
+        AsyncPointCRUD(Unbound)
+
+
+def test_write_and_read():
+    async def check():
+        crud = await _crud()
+        await crud.insert_many(Doc(id=i, text=f"doc {i}", rank=i) for i in range(10))
+
+        assert await crud.count() == 10
+        assert (await crud.get(3)).text == "doc 3"  # type: ignore
+        assert [point and point.id for point in await crud.get_many([5, 42, 1])] == [5, None, 1]
+        assert await crud.count(Doc.f.rank >= 7) == 3
+
+        ids = [point.id async for point in crud.scroll_points(limit=3)]
+        assert sorted(ids) == list(range(10))
+
+        await crud.delete(0)
+        assert await crud.get(0) is None
+
+    run(check())
+
+
+def test_save_sends_changed_fields():
+    async def check():
+        crud = await _crud()
+        await crud.save(Doc(id=1, text="a", rank=1))
+
+        point = await crud.get(1)
+        assert point is not None
+        point.rank = 2
+        await crud.save(point)
+
+        assert (await crud.get(1)).to_dict() == {"id": 1, "text": "a", "rank": 2}  # type: ignore
+        assert not point.changed
+
+    run(check())
+
+
+def test_insert_many_retries_transient_errors():
+    async def check():
+        crud = await _crud()
+        upsert = crud._qdrant_client.upsert
+        calls = []
+
+        async def flaky_upsert(*args, **kwargs):
+            calls.append(len(kwargs["points"]))
+            if len(calls) == 1:
+                raise ResponseHandlingException(ConnectionError("reset"))
+            return await upsert(*args, **kwargs)
+
+        crud._qdrant_client.upsert = flaky_upsert  # type: ignore
+        await crud.insert_many(
+            [Doc(id=i, text="x", rank=i) for i in range(5)],
+            retry=RetryOptions(attempts=2, backoff=0.0),
+        )
+
+        assert calls == [5, 5]
+        assert await crud.count() == 5
+
+    run(check())
+
+
+def test_load_deferred():
+    async def check():
+        crud = await _crud()
+        await crud.insert_many(Doc(id=i, text=f"doc {i}", rank=i) for i in range(3))
+
+        points = await crud.get_many([0, 1, 2], ReadOptions().only("rank"))
+        await crud.load_deferred(points)
+
+        assert [point.text for point in points] == ["doc 0", "doc 1", "doc 2"]  # type: ignore
+
+    run(check())
@@ -0,0 +1,87 @@
+from benchmarks.serializers import make_model, make_point
+from benchmarks.suite import (
+    Config,
+    Result,
+    bench_io,
+    bench_micro,
+    compare,
+    get_points,
+    insert,
+)
+from qdrant_odm import init_models
+
+TINY = Config(
+    widths=(10,),
+    vector_sizes=(4,),
+    batch_sizes=(3,),
+    io_width=10,
+    points=7,
+    micro_number=5,
+    queries=4,
+)
+
+
+def baseline(**values: float) -> dict:
+    return {
+        "environment": {"version": "before"},
+        "results": [
+            Result(benchmark, {"width": 5}, value, unit)._asdict()
+            for (benchmark, unit), value in zip(
+                [("insert_many", "points/s"), ("neighbours_p50", "ms")], values.values()
+            )
+        ],
+    }
+
+
+def test_result_key_sorts_params():
+    result = Result("scroll", {"width": 5, "batch_size": 64}, 1.0, "points/s")
+
+    assert result.key == "scroll[batch_size=64,width=5]"
+
+
+def test_compare_flags_regressions_by_unit(capsys):
+    results = [
+        Result("insert_many", {"width": 5}, 80.0, "points/s"),
+        Result("neighbours_p50", {"width": 5}, 1.05, "ms"),
+        Result("scroll", {"width": 5}, 1.0, "points/s"),
+    ]
+
+    assert compare(results, baseline(insert=100.0, p50=1.0), 0.1) == [
+        "insert_many[width=5]"
+    ]
+    assert compare(results, baseline(insert=80.0, p50=0.5), 0.1) == [
+        "neighbours_p50[width=5]"
+    ]
+    assert "Compared with before" in capsys.readouterr().out
+
+
+def test_models_and_points(client):
+    model = make_model(10, 4, "BenchModel")
+    points = [make_point(model, id, 4) for id in range(1, 6)]
+
+    assert points[0].vector_9 == [0.6] * 4
+
+    init_models(client, [model])
+    assert model.__collection_name__ == "BenchModel"
+    insert(model, points, 2)
+    assert [point.id for point in get_points(model, [2, 4])] == [2, 4]
+
+
+def test_benchmarks_run_on_a_tiny_config(client):
+    micro = bench_micro(TINY)
+    io = bench_io(client, TINY)
+
+    assert [result.benchmark for result in micro] == [
+        "construct",
+        "payload",
+        "vectors",
+        "from_record",
+    ]
+    assert [result.benchmark for result in io] == [
+        "insert_many",
+        "scroll",
+        "neighbours_p50",
+        "neighbours_p95",
+    ]
+    assert all(result.value > 0 for result in micro + io)
+    assert not client.get_collections().collections
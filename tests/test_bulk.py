@@ -0,0 +1,204 @@
+import threading
+
+import pytest
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from qdrant_odm import BulkWriteError, PointModel, RetryOptions, init_models
+from qdrant_odm import bulk
+from qdrant_odm.bulk import BatchSize, write_batches
+
+
+class Item(PointModel[int]):
+    name: str
+
+
+def items(count: int, start: int = 0):
+    for i in range(start, start + count):
+        yield Item(id=i, name=f"item {i}")
+
+
+@pytest.fixture
+def delays(monkeypatch):
+    delays = []
+    monkeypatch.setattr(bulk.time, "sleep", delays.append)
+    return delays
+
+
+def too_large() -> Exception:
+    return UnexpectedResponse(400, "Bad Request", b"Payload is larger than allowed", {})  # type: ignore
+
+
+def test_insert_many_streams_points_and_iterables(client):
+    init_models(client, [Item])
+    Item.insert_many(Item(id=100, name="single"), items(50), [Item(id=200, name="listed")])
+
+    assert Item.count() == 52
+    assert Item.get(200).name == "listed"  # type: ignore
+
+
+def test_insert_many_batches(client, monkeypatch):
+    init_models(client, [Item])
+    sizes = []
+    upsert = client.upsert
+
+    def record_upsert(collection_name, points, **kwargs):
+        sizes.append(len(points))
+        return upsert(collection_name, points=points, **kwargs)
+
+    monkeypatch.setattr(client, "upsert", record_upsert)
+    Item.insert_many(items(25), batch_size=10)
+
+    assert sizes == [10, 10, 5]
+    assert Item.count() == 25
+
+
+def test_insert_many_parallel(client):
+    init_models(client, [Item])
+    Item.insert_many(items(100), batch_size=7, parallel=4)
+
+    assert Item.count() == 100
+
+
+def test_write_batches_holds_at_most_parallel_batches():
+    consumed, sent = [], []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def points():
+        for point in items(40):
+            consumed.append(point.id)
+            yield point
+
+    def send(batch):
+        release.wait(1)
+        with lock:
+            sent.extend(point.id for point in batch)
+
+    thread = threading.Thread(target=write_batches, args=(send, points(), 5, 2))
+    thread.start()
+    thread.join(0.2)
+    # Two batches in flight, the third one read and waiting for a worker.
+    assert len(consumed) <= 15
+    release.set()
+    thread.join()
+
+    assert sorted(sent) == list(range(40))
+
+
+def test_write_batches_reports_failed_ids():
+    def send(batch):
+        if any(point.id == 12 for point in batch):
+            raise ValueError("rejected")
+
+    with pytest.raises(BulkWriteError) as raised:
+        write_batches(send, items(30), 10, retry=RetryOptions(attempts=0))
+
+    assert raised.value.failed_ids == list(range(10, 20))
+    assert isinstance(raised.value.failures[0].error, ValueError)
+
+
+def test_write_batches_validates_arguments():
+    with pytest.raises(ValueError):
+        write_batches(lambda batch: None, items(1), 0)
+    with pytest.raises(ValueError):
+        write_batches(lambda batch: None, items(1), 10, parallel=0)
+
+
+def test_transient_errors_are_retried(delays):
+    attempts, sent = [], []
+
+    def send(batch):
+        attempts.append(len(batch))
+        if len(attempts) <= 2:
+            raise ResponseHandlingException(ConnectionError("refused"))
+        sent.extend(point.id for point in batch)
+
+    write_batches(send, items(4), 4, retry=RetryOptions(attempts=3, backoff=1.0))
+
+    assert attempts == [4, 4, 4]
+    assert sent == [0, 1, 2, 3]
+    assert 0.5 <= delays[0] <= 1.0 and 1.0 <= delays[1] <= 2.0
+
+
+def test_retries_give_up_after_the_attempts(delays):
+    def send(batch):
+        raise UnexpectedResponse(503, "Unavailable", b"", {})  # type: ignore
+
+    with pytest.raises(BulkWriteError) as raised:
+        write_batches(send, items(3), 10, retry=RetryOptions(attempts=2))
+
+    assert len(delays) == 2
+    assert raised.value.failed_ids == [0, 1, 2]
+
+
+def test_invalid_points_are_not_retried(delays):
+    def send(batch):
+        raise UnexpectedResponse(400, "Bad Request", b"wrong vector", {})  # type: ignore
+
+    with pytest.raises(BulkWriteError):
+        write_batches(send, items(3), 10)
+
+    assert delays == []
+
+
+def test_too_large_batches_are_split_and_the_size_lowered(delays):
+    sizes = []
+    batch_size = BatchSize(8)
+
+    def send(batch):
+        sizes.append(len(batch))
+        if len(batch) > 2:
+            raise too_large()
+
+    write_batches(send, items(12), batch_size)
+
+    # The halves of the first batch are split in turn, later batches start at 2.
+    assert sizes == [8, 4, 2, 2, 4, 2, 2, 2, 2]
+    assert batch_size.value == 2
+    assert delays == []
+
+
+def test_splitting_isolates_the_failing_points(delays):
+    def send(batch):
+        if any(point.id == 5 for point in batch):
+            raise too_large()
+
+    with pytest.raises(BulkWriteError) as raised:
+        write_batches(send, items(8), 8)
+
+    assert raised.value.failed_ids == [5]
+
+
+def test_adaptive_batch_size():
+    batch_size = BatchSize(target_seconds=1.0)
+    assert batch_size.value == 64
+
+    batch_size.observe(0.1, 64)
+    assert batch_size.value == 128
+    batch_size.observe(3.0, 128)
+    assert batch_size.value == 64
+
+    batch_size.split(64, too_large=True)
+    batch_size.observe(0.1, 32)
+    assert batch_size.value == 32
+
+    fixed = BatchSize(10)
+    fixed.observe(0.1, 10)
+    assert fixed.value == 10
+
+
+def test_insert_many_retries_failed_upserts(client, monkeypatch, delays):
+    init_models(client, [Item])
+    upsert, calls = client.upsert, []
+
+    def flaky_upsert(collection_name, points, **kwargs):
+        calls.append(len(points))
+        if len(calls) == 1:
+            raise ResponseHandlingException(TimeoutError("timed out"))
+        return upsert(collection_name, points=points, **kwargs)
+
+    monkeypatch.setattr(client, "upsert", flaky_upsert)
+    Item.insert_many(items(6), batch_size=6, retry=RetryOptions(backoff=0.0))
+
+    assert calls == [6, 6]
+    assert Item.count() == 6
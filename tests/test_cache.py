@@ -0,0 +1,136 @@
+from qdrant_client import models
+
+from qdrant_odm import PointCache, PointModel, ReadOptions, index, init_models
+from qdrant_odm import cache as cache_module
+
+
+class Page(PointModel[int]):
+    title: str
+    tags: list[str] = []
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+def record(id: int, title: str = "t", vector=None) -> models.Record:
+    return models.Record(
+        id=id, payload={"title": title, "tags": ["a"]}, vector=vector or {"vector": [1.0, 0.0]}
+    )
+
+
+def counting_retrieve(client, monkeypatch) -> list:
+    retrieve, calls = client.retrieve, []
+
+    def record_retrieve(collection_name, ids, **kwargs):
+        calls.append(list(ids))
+        return retrieve(collection_name, ids=ids, **kwargs)
+
+    monkeypatch.setattr(client, "retrieve", record_retrieve)
+    return calls
+
+
+def test_lru_eviction():
+    cache = PointCache(max_entries=2)
+    cache.put("c", [record(1), record(2)])
+    cache.get("c", 1)
+    cache.put("c", [record(3)])
+
+    assert cache.get("c", 2) is None
+    assert cache.get("c", 1) is not None
+    assert cache.stats.evictions == 1
+    assert cache.stats.entries == 2
+
+
+def test_max_bytes():
+    cache = PointCache(max_bytes=1)
+    cache.put("c", [record(1)])
+
+    assert cache.stats.entries == 0
+    assert cache.stats.bytes == 0
+
+
+def test_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = PointCache(ttl=10)
+    cache.put("c", [record(1)])
+
+    now[0] = 109.0
+    assert cache.get("c", 1) is not None
+    now[0] = 111.0
+    assert cache.get("c", 1) is None
+    assert cache.stats.entries == 0
+
+
+def test_vectors_must_be_covered():
+    cache = PointCache()
+    cache.put("c", [record(1)], with_vectors=["vector"])
+
+    assert cache.get("c", 1) is not None
+    assert cache.get("c", 1, with_vectors=["vector"]) is not None
+    assert cache.get("c", 1, with_vectors=True) is None
+
+
+def test_hits_are_copies():
+    cache = PointCache()
+    original = record(1)
+    cache.put("c", [original])
+    original.payload["tags"].append("changed")  # type: ignore
+    original.vector["vector"][0] = 5.0  # type: ignore
+
+    hit = cache.get("c", 1)
+    assert hit is not None
+    hit.payload["tags"].append("x")  # type: ignore
+    hit.vector["vector"][1] = 9.0
+
+    assert cache.get("c", 1) == (1, {"title": "t", "tags": ["a"]}, {"vector": [1.0, 0.0]})
+
+
+def test_model_reads_through_the_cache(client, monkeypatch):
+    init_models(client, [Page])
+    Page.insert_many(Page(id=i, title=str(i), vector=[1.0, 0.0]) for i in range(3))
+    Page.enable_cache()
+    calls = counting_retrieve(client, monkeypatch)
+    try:
+        Page.get(1)
+        Page.get_many([1, 2])
+        point = Page.get(1, ReadOptions(with_vectors=True))
+
+        assert calls == [[1], [2], [1]]
+        assert point is not None
+        point.vector[0] = 3.0  # type: ignore
+        assert Page.get(1, ReadOptions(with_vectors=True)).vector == [1.0, 0.0]  # type: ignore
+        assert Page.__cache__.stats.hits == 2  # type: ignore
+    finally:
+        Page.disable_cache()
+
+
+def test_writes_invalidate(client, monkeypatch):
+    init_models(client, [Page])
+    Page.insert_many(Page(id=i, title=str(i)) for i in range(3))
+    Page.enable_cache()
+    calls = counting_retrieve(client, monkeypatch)
+    try:
+        point = Page.get(1)
+        assert point is not None
+        point.title = "changed"
+        point.save()
+        assert Page.get(1).title == "changed"  # type: ignore
+
+        Page.insert_many(Page(id=1, title="inserted"))
+        assert Page.get(1).title == "inserted"  # type: ignore
+
+        Page.get(1).delete()  # type: ignore
+        assert Page.get(1) is None
+        assert len(calls) == 4
+    finally:
+        Page.disable_cache()
+
+
+def test_projected_reads_are_not_cached(client):
+    init_models(client, [Page])
+    Page(id=1, title="a").save()
+    cache = Page.enable_cache()
+    try:
+        Page.get(1, ReadOptions().only("title"))
+        assert cache.stats.entries == 0
+    finally:
+        Page.disable_cache()
@@ -0,0 +1,102 @@
+from typing import Any
+
+from qdrant_client import models
+
+from qdrant_odm import PointModel, ReadOptions, index, init_models
+from qdrant_odm.codegen import is_generated
+
+
+class Article(PointModel[int]):
+    title: str
+    tags: list[str] = []
+    dense: list[float] = index.Vector(3, models.Distance.DOT)
+    sparse: tuple[list[int], list[float]] = index.SparseVector()
+
+
+class Upper(PointModel[int]):
+    title: str
+
+    def payload(self) -> dict[str, Any]:
+        return {"title": self.title.upper()}
+
+
+class UpperChild(Upper):
+    summary: str = ""
+
+
+class Hooked(PointModel[int]):
+    title: str
+    length: int = 0
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.length = len(self.title or "")
+
+
+def test_generated_encoders():
+    point = Article(id=1, title="a", dense=[1.0, 0.0, 0.0], sparse=([3], [0.5]))
+
+    assert is_generated(Article.payload)
+    assert point.payload() == {"title": "a", "tags": []}
+    assert point.vectors() == {
+        "dense": [1.0, 0.0, 0.0],
+        "sparse": models.SparseVector(indices=[3], values=[0.5]),
+    }
+
+    struct = point._to_point_struct()
+    assert struct.id == 1
+    assert struct.payload == point.payload()
+    assert struct.vector == point.vectors()
+
+
+def test_none_vectors_are_left_out():
+    assert Article(id=1, title="a").vectors() == {}
+
+
+def test_from_record_fills_defaults():
+    record = models.Record(id=7, payload={"title": "t"}, vector={"dense": [1.0, 2.0, 3.0]})
+    point = Article._from_record(record, set_persisted=True)
+
+    assert point.to_dict() == {
+        "id": 7,
+        "title": "t",
+        "tags": [],
+        "dense": [1.0, 2.0, 3.0],
+        "sparse": None,
+    }
+    assert point.persisted
+    assert not point.changed
+
+
+def test_payload_override_is_used_for_upserts():
+    assert not is_generated(Upper.payload)
+    assert Upper(id=1, title="a")._to_point_struct().payload == {"title": "A"}
+
+
+def test_payload_override_is_inherited():
+    point = UpperChild(id=1, title="a", summary="s")
+
+    assert UpperChild.payload is Upper.payload
+    assert point._to_point_struct().payload == {"title": "A"}
+
+
+def test_from_record_runs_post_init_override():
+    point = Hooked._from_record(models.Record(id=1, payload={"title": "abc"}))
+
+    assert point.length == 3
+
+
+def test_round_trip(client):
+    init_models(client, [Article])
+    Article(id=1, title="a", tags=["x"], dense=[0.0, 1.0, 0.0], sparse=([1], [2.0])).save()
+
+    point = Article.get(1, read_options=ReadOptions(with_vectors=True))
+
+    assert point is not None
+    assert point.to_dict() == {
+        "id": 1,
+        "title": "a",
+        "tags": ["x"],
+        "dense": [0.0, 1.0, 0.0],
+        "sparse": models.SparseVector(indices=[1], values=[2.0]),
+    }
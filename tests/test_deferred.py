@@ -0,0 +1,129 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, init_models, index
+from qdrant_odm.crud import ReadOptions
+
+
+class Listing(PointModel[int]):
+    title: str
+    price: float = 0.0
+    body: str = ""
+    vector: list[float] = index.Vector(2, models.Distance.COSINE)
+
+
+@pytest.fixture
+def listings(client):
+    init_models(client, [Listing])
+    Listing.insert_many(
+        Listing(id=id, title=f"t{id}", price=id * 1.5, body="x" * 100, vector=[1.0, id])
+        for id in range(1, 6)
+    )
+    return client
+
+
+@pytest.fixture
+def retrieves(listings, monkeypatch):
+    retrieve, calls = listings.retrieve, []
+
+    def record_retrieve(collection_name, ids, **kwargs):
+        calls.append((sorted(ids), kwargs["with_payload"], kwargs["with_vectors"]))
+        return retrieve(collection_name, ids=ids, **kwargs)
+
+    monkeypatch.setattr(listings, "retrieve", record_retrieve)
+    return calls
+
+
+def test_only_maps_to_an_include_selector():
+    options = ReadOptions().only("title", "price")
+
+    assert options.with_payload == ["title", "price"]
+    assert options.lazy
+    assert "lazy" not in options._client_kwargs()
+
+
+def test_defer_maps_to_an_exclude_selector():
+    options = ReadOptions().defer("body")
+
+    assert options.with_payload == models.PayloadSelectorExclude(exclude=["body"])
+
+
+def test_only_reads_the_listed_fields(retrieves):
+    points = Listing.get_many(range(1, 6), ReadOptions().only("title"))
+
+    assert [point.title for point in points] == [f"t{id}" for id in range(1, 6)]
+    assert retrieves == [([1, 2, 3, 4, 5], ["title"], False)]
+
+
+def test_deferred_fields_load_once_for_the_result_set(retrieves):
+    points = Listing.get_many(range(1, 6), ReadOptions().only("title"))
+
+    assert points[2].price == 4.5
+    assert [point.body for point in points] == ["x" * 100] * 5
+    assert [point.price for point in points] == [id * 1.5 for id in range(1, 6)]
+
+    assert len(retrieves) == 2
+    ids, with_payload, with_vectors = retrieves[1]
+    assert ids == [1, 2, 3, 4, 5]
+    assert sorted(with_payload) == ["body", "price"]
+    assert with_vectors is False
+
+
+def test_defer_leaves_out_only_the_deferred_fields(retrieves):
+    [point] = Listing.get_many([2], ReadOptions().defer("body"))
+
+    assert (point.title, point.price) == ("t2", 3.0)
+    assert len(retrieves) == 1
+    assert point.body == "x" * 100
+    assert len(retrieves) == 2
+
+
+def test_assigned_deferred_fields_are_kept(retrieves):
+    first, second = Listing.get_many([1, 2], ReadOptions().only("title"))
+    first.body = "edited"
+
+    assert second.body == "x" * 100
+    assert first.body == "edited"
+
+
+def test_projected_scroll_defers_fields(listings):
+    [page] = list(Listing.scroll(limit=10, read_options=ReadOptions().only("price")))
+
+    assert [point.price for point in page] == [id * 1.5 for id in range(1, 6)]
+    assert [point.title for point in page] == [f"t{id}" for id in range(1, 6)]
+
+
+def test_plain_reads_do_not_defer(retrieves):
+    [point] = Listing.get_many([3])
+
+    assert point._loader is None
+    assert point.vector is None
+    assert retrieves == [([3], True, False)]
+
+
+def test_lazy_vectors_load_for_the_result_set(retrieves):
+    points = Listing.get_many(range(1, 6), ReadOptions(lazy=True))
+
+    assert points[0].vector == pytest.approx([1 / 2**0.5, 1 / 2**0.5])
+    assert all(point.vector is not None for point in points)
+    assert retrieves[1] == ([1, 2, 3, 4, 5], False, ["vector"])
+    assert len(retrieves) == 2
+
+
+def test_sync_keeps_local_vectors(listings, retrieves):
+    point = Listing(id=1, title="local", vector=[0.0, 1.0])
+
+    point.sync()
+
+    assert point.title == "t1"
+    assert point.vector == [0.0, 1.0]
+    assert len(retrieves) == 1
+
+
+def test_sync_does_not_load_deferred_fields(listings, retrieves):
+    point = Listing(id=2, title="local", body="local body", vector=[0.0, 1.0])
+
+    point.sync(ReadOptions().only("title"))
+
+    assert (point.title, point.body) == ("t2", "local body")
+    assert len(retrieves) == 1
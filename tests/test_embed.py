@@ -0,0 +1,123 @@
+import threading
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import Embedder, EmbeddingCache, PointModel, ReadOptions, index, init_models
+
+calls: list[list[str]] = []
+lock = threading.Lock()
+
+
+def fake_embed(texts: list[str]) -> list[list[float]]:
+    with lock:
+        calls.append(list(texts))
+    return [[float(len(text)), 1.0] for text in texts]
+
+
+embedder = Embedder(fake_embed, batch_size=2)
+
+
+class Chunk(PointModel[int]):
+    text: str | None = None
+    text_vector: list[float] = index.Vector(
+        2, models.Distance.DOT, source="text", embedder=embedder
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_embed_batches_and_deduplicates():
+    vectors = Embedder(fake_embed, batch_size=2).embed(["a", "bb", "a", "ccc", "dddd"])
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0], [3.0, 1.0], [4.0, 1.0]]
+    assert calls == [["a", "bb"], ["ccc", "dddd"]]
+
+
+def test_workers_embed_chunks_concurrently():
+    worker_embedder = Embedder(fake_embed, batch_size=1, workers=3)
+
+    assert worker_embedder.embed(["a", "bb", "ccc"]) == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
+    assert sorted(map(tuple, calls)) == [("a",), ("bb",), ("ccc",)]
+    worker_embedder.close()
+
+
+def test_wrong_number_of_vectors_raises():
+    broken = Embedder(lambda values: [[1.0]], name="broken")
+
+    with pytest.raises(ValueError, match="returned 1 vectors for 2 values"):
+        broken.embed(["a", "b"])
+
+
+def test_cache_is_shared_across_embedders(tmp_path):
+    path = tmp_path / "embeddings.db"
+    first = Embedder(fake_embed, cache=path)
+    first.embed(["a", "bb"])
+    calls.clear()
+
+    second = Embedder(fake_embed, cache=EmbeddingCache(path))
+    vectors = second.embed(["bb", "ccc"])
+
+    assert calls == [["ccc"]]
+    assert np.asarray(vectors[0]).tolist() == [2.0, 1.0]
+    assert len(second.cache) == 3
+
+
+def test_names_namespace_the_cache():
+    cache = EmbeddingCache()
+    Embedder(fake_embed, cache=cache, name="v1").embed(["a"])
+    Embedder(fake_embed, cache=cache, name="v2").embed(["a"])
+
+    assert calls == [["a"], ["a"]]
+
+
+def test_default_name_includes_the_module():
+    assert Embedder(fake_embed).name == f"{__name__}.fake_embed"
+
+
+def test_cached_lambdas_need_a_name():
+    def local_embed(values):
+        return values
+
+    for function in (lambda values: values, local_embed):
+        with pytest.raises(ValueError, match="needs a `name`"):
+            Embedder(function, cache=EmbeddingCache())
+        assert Embedder(function, cache=EmbeddingCache(), name="named").name == "named"
+        Embedder(function)
+
+
+def test_embedded_vectors_are_filled_on_insert(client):
+    init_models(client, [Chunk])
+    Chunk.insert_many([Chunk(id=1, text="abc"), Chunk(id=2, text="abc"), Chunk(id=3)])
+
+    assert calls == [["abc"]]
+    point = Chunk.get(1, ReadOptions(with_vectors=True))
+    assert point.text_vector == pytest.approx([3.0, 1.0])
+    assert Chunk.get(3, ReadOptions(with_vectors=True)).text_vector is None
+
+
+def test_changed_sources_are_embedded_again(client):
+    init_models(client, [Chunk])
+    Chunk.insert_many([Chunk(id=1, text="abc")])
+    point = Chunk.get(1)
+    calls.clear()
+
+    point.save()
+    assert calls == []
+
+    point.text = "abcdef"
+    point.save()
+
+    assert calls == [["abcdef"]]
+    assert Chunk.get(1, ReadOptions(with_vectors=True)).text_vector == pytest.approx(
+        [6.0, 1.0]
+    )
+
+
+def test_embedding_needs_a_source_and_an_embedder():
+    with pytest.raises(ValueError, match="both a source and an embedder"):
+        index.Vector(2, models.Distance.DOT, source="text")
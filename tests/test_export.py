@@ -0,0 +1,171 @@
+import json
+import uuid
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from qdrant_odm import (
+    PointModel,
+    ReadOptions,
+    export_collection,
+    import_collection,
+    index,
+    init_models,
+)
+from qdrant_odm.export import EXTRA_COLUMN, read_manifest
+
+pytest.importorskip("pyarrow")
+
+
+class Review(PointModel[int]):
+    text: str
+    stars: int = index.Integer()
+    tags: list[str] = []
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+    sparse: tuple[list[int], list[float]] = index.SparseVector()
+
+
+class Note(PointModel[int | str]):
+    text: str
+
+
+class Event(PointModel[str]):
+    text: str
+
+
+def reviews(count: int) -> list[Review]:
+    return [
+        Review(
+            id=id,
+            text=f"review {id}",
+            stars=id % 5,
+            tags=["a", str(id)],
+            vector=[1.0, float(id)],
+            sparse=([id], [0.5]),
+        )
+        for id in range(1, count + 1)
+    ]
+
+
+def reimport(model, path, **kwargs):
+    client = QdrantClient(":memory:")
+    init_models(client, [model])
+    return client, import_collection(model, path, **kwargs)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_round_trip(client, tmp_path, format):
+    init_models(client, [Review])
+    Review.insert_many(reviews(25))
+
+    assert export_collection(Review, tmp_path, format=format, batch_size=10) == 25
+    target, count = reimport(Review, tmp_path, batch_size=7)
+
+    assert count == 25 and Review.count() == 25
+    point = Review.get(3, ReadOptions(with_vectors=True))
+    assert (point.text, point.stars, point.tags) == ("review 3", 3, ["a", "3"])
+    assert point.vector == [1.0, 3.0]
+    assert point.sparse == models.SparseVector(indices=[3], values=[0.5])
+    target.close()
+
+
+def test_points_without_a_vector_round_trip(client, tmp_path):
+    init_models(client, [Review])
+    bare = Review(id=9, text="no vector", stars=1)
+    Review.insert_many([*reviews(2), bare])
+
+    export_collection(Review, tmp_path)
+    target, count = reimport(Review, tmp_path)
+
+    assert count == 3
+    vectors = {
+        record.id: record.vector
+        for record in target.retrieve("Review", [1, 9], with_vectors=True)
+    }
+    assert vectors[9] == {}
+    assert vectors[1]["vector"] == [1.0, 1.0]
+    target.close()
+
+
+def test_filtered_export(client, tmp_path):
+    init_models(client, [Review])
+    Review.insert_many(reviews(10))
+
+    assert export_collection(Review, tmp_path, Review.f.stars == 1) == 2
+    assert read_manifest(tmp_path)["count"] == 2
+
+
+def test_undeclared_payload_keys_round_trip(client, tmp_path):
+    init_models(client, [Review])
+    Review.insert_many(reviews(3))
+    client.set_payload(Review.__collection_name__, {"legacy": {"score": 7}}, points=[2])
+
+    export_collection(Review, tmp_path)
+    target, _ = reimport(Review, tmp_path)
+
+    [record] = target.retrieve(Review.__collection_name__, [2])
+    assert record.payload["legacy"] == {"score": 7}
+    [record] = target.retrieve(Review.__collection_name__, [1])
+    assert "legacy" not in record.payload
+    target.close()
+
+
+def test_id_column_follows_the_declared_id_type(client, tmp_path):
+    init_models(client, [Review, Event])
+    Review.insert_many(reviews(2))
+    id = str(uuid.uuid4())
+    Event.insert_many([Event(id=id, text="event")])
+
+    export_collection(Review, tmp_path / "reviews")
+    export_collection(Event, tmp_path / "events")
+
+    assert read_manifest(tmp_path / "reviews")["id"] == "int64"
+    assert read_manifest(tmp_path / "events")["id"] == "string"
+    target, _ = reimport(Event, tmp_path / "events")
+    assert [record.id for record in target.retrieve("Event", [id])] == [id]
+    target.close()
+
+
+def test_mixed_ids_fall_back_to_strings(client, tmp_path):
+    init_models(client, [Note])
+    id = str(uuid.uuid4())
+    Note.insert_many([Note(id=1, text="int"), Note(id=id, text="uuid")])
+
+    export_collection(Note, tmp_path)
+    target, count = reimport(Note, tmp_path)
+
+    assert read_manifest(tmp_path)["id"] == "string"
+    assert count == 2
+    assert {record.id for record in target.scroll("Note")[0]} == {1, id}
+    target.close()
+
+
+def test_empty_export(client, tmp_path):
+    init_models(client, [Review])
+
+    assert export_collection(Review, tmp_path) == 0
+    assert reimport(Review, tmp_path)[1] == 0
+
+
+def test_exports_without_the_extra_column_still_import(client, tmp_path):
+    init_models(client, [Review])
+    Review.insert_many(reviews(2))
+    export_collection(Review, tmp_path)
+
+    manifest = read_manifest(tmp_path)
+    del manifest["extra"], manifest["id"]
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+
+    assert EXTRA_COLUMN not in manifest.values()
+    assert reimport(Review, tmp_path)[1] == 2
+
+
+def test_import_checks_the_layout(client, tmp_path):
+    init_models(client, [Review])
+    Review.insert_many(reviews(2))
+    export_collection(Review, tmp_path)
+
+    with pytest.raises(ValueError, match="not a vector field"):
+        import_collection(Note, tmp_path)
+    with pytest.raises(ValueError, match="no complete export"):
+        import_collection(Review, tmp_path / "missing")
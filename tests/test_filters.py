@@ -0,0 +1,119 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import Param, PointModel, UnindexedFieldWarning, init_models, index
+from qdrant_odm.dataclass import field_slot
+
+
+class Offer(PointModel[int]):
+    topic: str = index.Keyword()
+    price: int = index.Integer(range=True)
+    body: str = index.Text()
+    location: dict = index.Geo()
+    meta: dict = {}
+
+
+class Letter(PointModel[int]):
+    f: str = index.Keyword()
+
+
+def test_field_access_is_explicit():
+    assert repr(Offer.f.topic) == "Offer.topic"
+    assert type(Offer.topic).__name__ == "member_descriptor"
+
+    with pytest.raises(AttributeError):
+        Offer.f.missing
+
+
+def test_a_field_named_f_is_still_a_field():
+    letter = Letter(id=1, f="a")
+
+    assert letter.f == "a"
+    assert field_slot(Letter, "f").__get__(letter) == "a"
+    assert (Letter.f.f == "a").to_filter().must[0].key == "f"
+
+
+def test_conditions_compile_to_a_filter():
+    expr = (Offer.f.topic == "news") & (Offer.f.price > 3) & ~(Offer.f.price == 7)
+
+    assert expr.to_filter() == models.Filter(
+        must=[
+            models.FieldCondition(key="topic", match=models.MatchValue(value="news")),
+            models.FieldCondition(key="price", range=models.Range(gt=3)),
+        ],
+        must_not=[models.FieldCondition(key="price", match=models.MatchValue(value=7))],
+    )
+
+
+def test_or_and_ranges():
+    expr = (Offer.f.topic == "news") | Offer.f.price.between(1, 2)
+
+    assert expr.to_filter() == models.Filter(
+        should=[
+            models.FieldCondition(key="topic", match=models.MatchValue(value="news")),
+            models.FieldCondition(key="price", range=models.Range(gte=1, lte=2)),
+        ]
+    )
+
+
+def test_id_and_geo_conditions():
+    assert (Offer.f.id == 3).to_filter().must == [models.HasIdCondition(has_id=[3])]
+
+    [condition] = Offer.f.location.within_radius(1, 2, 100).to_filter().must
+    assert condition.geo_radius == models.GeoRadius(
+        center=models.GeoPoint(lat=1, lon=2), radius=100
+    )
+
+
+def test_comparing_the_class_attribute_is_not_a_filter(client):
+    init_models(client, [Offer])
+
+    with pytest.raises(TypeError, match="Model.f"):
+        Offer.count(Offer.topic == "news")  # type: ignore
+
+
+def test_expressions_are_not_booleans():
+    with pytest.raises(TypeError):
+        (Offer.f.topic == "a") and (Offer.f.price > 1)
+
+
+def test_incompatible_index_raises():
+    with pytest.raises(ValueError, match="Range filter on Offer.body"):
+        Offer.f.body < 3
+
+
+def test_unindexed_field_warns():
+    with pytest.warns(UnindexedFieldWarning, match="Offer.meta.lang"):
+        Offer.f.meta["lang"] == "en"
+
+
+def test_compiled_filters_are_cached():
+    expr = Offer.f.topic == "news"
+
+    assert expr.compile() is expr.compile()
+    assert expr.to_filter() is expr.to_filter()
+
+
+def test_params_are_bound_per_call():
+    expr = (Offer.f.topic == Param("topic")) & (Offer.f.price >= 2)
+
+    news, sport = expr.bind(topic="news"), expr.bind(topic="sport")
+
+    assert news.must[0].match.value == "news"
+    assert sport.must[0].match.value == "sport"
+    assert news.must[1] is sport.must[1]
+
+    with pytest.raises(ValueError, match="Missing filter parameter topic"):
+        expr.bind()
+
+
+def test_expressions_filter_reads(client):
+    init_models(client, [Offer])
+    Offer.insert_many(
+        Offer(id=id, topic="ab"[id % 2], price=id, location={"lat": 0, "lon": 0})
+        for id in range(1, 11)
+    )
+
+    assert Offer.count(Offer.f.topic == "a") == 5
+    [page] = list(Offer.scroll((Offer.f.topic == "b") & (Offer.f.price < 5), limit=10))
+    assert [point.id for point in page] == [1, 3]
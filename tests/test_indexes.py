@@ -0,0 +1,137 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, init_models, index
+
+
+class Product(PointModel[int]):
+    tenant: str = index.Keyword(is_tenant=True)
+    price: float = index.Float(is_principal=True, on_disk=True)
+    meta: dict = index.Keyword(key="lang")
+    tags: list = index.Keyword(key="[].name")
+    description: str = index.Text(lowercase=True)
+    available: bool = index.Bool()
+    name: str = ""
+
+
+def keyword_info(**params) -> models.PayloadIndexInfo:
+    return models.PayloadIndexInfo(
+        data_type=models.PayloadSchemaType.KEYWORD,
+        params=models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD, **params),
+        points=0,
+    )
+
+
+@pytest.fixture
+def index_calls(client, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        client,
+        "create_payload_index",
+        lambda collection_name, field_name, field_schema: calls.append(
+            ("create", field_name, field_schema)
+        ),
+    )
+    monkeypatch.setattr(
+        client,
+        "delete_payload_index",
+        lambda collection_name, field_name: calls.append(("delete", field_name)),
+    )
+    return calls
+
+
+def test_payload_indexes_follow_the_declarations():
+    indexes = Product.__payload_indexes__
+
+    assert {params.key for params in indexes.values()} == {
+        "tenant",
+        "price",
+        "meta.lang",
+        "tags[].name",
+        "description",
+        "available",
+    }
+    assert indexes["tenant"].params.is_tenant
+    assert indexes["price"].params.is_principal and indexes["price"].params.on_disk
+    assert indexes["description"].params.lowercase
+    assert "name" not in indexes
+
+
+@pytest.mark.parametrize(
+    "marker",
+    [
+        index.Keyword(),
+        index.Integer(),
+        index.Float(),
+        index.Bool(),
+        index.Geo(),
+        index.MultiGeo(),
+        index.Datetime(),
+        index.Text(),
+        index.Uuid(),
+    ],
+)
+def test_every_payload_index_has_params(marker):
+    assert marker.params is not None
+
+
+def test_indexed_fields_are_not_vectors():
+    assert Product.__vector_fields__ == ()
+    assert Product(id=1, tenant="a").payload()["tenant"] == "a"
+
+
+def test_init_collection_creates_the_payload_indexes(client, index_calls):
+    init_models(client, [Product])
+
+    created = {call[1]: call[2] for call in index_calls}
+    assert set(created) == {params.key for params in Product.__payload_indexes__.values()}
+    assert created["meta.lang"] == Product.__payload_indexes__["meta"].params
+    assert all(call[0] == "create" for call in index_calls)
+
+
+def test_matching_indexes_are_kept():
+    schema = {
+        params.key: models.PayloadIndexInfo(
+            data_type=params.params.type.value, params=params.params, points=0
+        )
+        for params in Product.__payload_indexes__.values()
+    }
+
+    assert Product._payload_index_changes(schema) == ([], [])
+
+
+def test_differing_indexes_are_recreated():
+    schema = {"tenant": keyword_info(is_tenant=False), "other": keyword_info()}
+
+    drop, create = Product._payload_index_changes(schema)
+
+    assert drop == ["tenant"]
+    assert {params.key for params in create} == {
+        params.key for params in Product.__payload_indexes__.values()
+    }
+
+
+def test_unset_params_are_not_compared():
+    class Tagged(PointModel[int]):
+        tag: str = index.Keyword()
+
+    drop, create = Tagged._payload_index_changes({"tag": keyword_info(on_disk=True)})
+
+    assert (drop, create) == ([], [])
+
+
+def test_init_collection_reconciles_existing_indexes(client, index_calls, monkeypatch):
+    init_models(client, [Product])
+    index_calls.clear()
+    get_collection = client.get_collection
+
+    def with_schema(collection_name):
+        info = get_collection(collection_name)
+        info.payload_schema = {"tenant": keyword_info(is_tenant=False)}
+        return info
+
+    monkeypatch.setattr(client, "get_collection", with_schema)
+    init_models(client, [Product])
+
+    assert index_calls[0] == ("delete", "tenant")
+    assert len(index_calls) == 1 + len(Product.__payload_indexes__)
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import BulkWriteError, PointModel, index, ingest, init_models
+from qdrant_odm.ingest import Checkpoint, read_source
+
+
+class Book(PointModel[int]):
+    title: str
+    year: int = 0
+    price: float = 0.0
+    available: bool = False
+    tags: list[str] = []
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records))
+    return path
+
+
+def books(count: int) -> list[dict]:
+    return [
+        {"id": id, "title": f"book {id}", "year": 2000 + id, "vector": [1.0, id]}
+        for id in range(1, count + 1)
+    ]
+
+
+@pytest.fixture
+def upserted(client, monkeypatch):
+    init_models(client, [Book])
+    upsert, calls = client.upsert, []
+
+    def record_upsert(collection_name, points, **kwargs):
+        calls.append([point.id for point in points])
+        return upsert(collection_name, points=points, **kwargs)
+
+    monkeypatch.setattr(client, "upsert", record_upsert)
+    return calls
+
+
+def test_ingest_jsonl(upserted, tmp_path):
+    source = write_jsonl(tmp_path / "books.jsonl", books(10))
+
+    result = ingest(Book, source, batch_size=4, report_every=0)
+
+    assert (result.read, result.written, result.skipped) == (10, 10, 0)
+    assert upserted == [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+    assert Book.get(7).year == 2007
+
+
+def test_ingest_csv_parses_field_types(upserted, tmp_path):
+    source = tmp_path / "books.csv"
+    source.write_text(
+        "id,title,year,price,available,tags\n"
+        '1,first,1999,9.5,yes,"[""a"", ""b""]"\n'
+        "2,second,,,false,\n"
+    )
+
+    assert ingest(Book, source, report_every=0).written == 2
+
+    first, second = Book.get_many([1, 2])
+    assert (first.year, first.price, first.available) == (1999, 9.5, True)
+    assert first.tags == ["a", "b"]
+    assert (second.year, second.available, second.tags) == (0, False, [])
+
+
+def test_transform_renames_and_drops_records(upserted, tmp_path):
+    source = write_jsonl(tmp_path / "books.jsonl", [{"key": 1, "name": "a"}, {"key": 2}])
+
+    def transform(record):
+        if "name" not in record:
+            return None
+        return {"id": record["key"], "title": record["name"]}
+
+    result = ingest(Book, source, transform=transform, report_every=0)
+
+    assert (result.written, result.skipped) == (1, 1)
+    assert Book.get(1).title == "a"
+
+
+def test_invalid_records(upserted, tmp_path):
+    records = [*books(2), {"id": 3, "title": "x", "vector": [1.0]}, {"title": "no id"}]
+    source = write_jsonl(tmp_path / "books.jsonl", records)
+
+    with pytest.raises(ValueError, match="line 3: Vector field vector has size 1"):
+        ingest(Book, source, report_every=0)
+
+    result = ingest(Book, source, skip_invalid=True, report_every=0)
+    assert (result.read, result.written, result.skipped) == (4, 2, 2)
+
+
+def test_checkpoint_resumes_after_the_last_written_batch(
+    upserted, client, monkeypatch, tmp_path
+):
+    source = write_jsonl(tmp_path / "books.jsonl", books(10))
+    checkpoint = tmp_path / "checkpoint.json"
+    upsert = client.upsert
+
+    def fail_from_the_third_batch(collection_name, points, **kwargs):
+        if len(upserted) == 2:
+            raise ValueError("rejected")
+        return upsert(collection_name, points=points, **kwargs)
+
+    monkeypatch.setattr(client, "upsert", fail_from_the_third_batch)
+    with pytest.raises(BulkWriteError):
+        ingest(Book, source, batch_size=3, checkpoint=checkpoint, report_every=0)
+
+    state = json.loads(checkpoint.read_text())
+    assert state["read"] == 6
+    assert upserted == [[1, 2, 3], [4, 5, 6]]
+
+    monkeypatch.setattr(client, "upsert", upsert)
+    upserted.clear()
+    result = ingest(Book, source, batch_size=3, checkpoint=checkpoint, report_every=0)
+
+    assert upserted == [[7, 8, 9], [10]]
+    assert (result.read, result.written) == (10, 4)
+    assert Book.count() == 10
+    assert json.loads(checkpoint.read_text())["offset"] == source.stat().st_size
+
+
+def test_checkpoint_of_another_source_is_rejected(tmp_path):
+    checkpoint = tmp_path / "checkpoint.json"
+    checkpoint.write_text(json.dumps({"source": "other.jsonl", "offset": 10, "read": 1}))
+
+    with pytest.raises(ValueError, match="belongs to other.jsonl"):
+        Checkpoint(checkpoint, tmp_path / "books.jsonl")
+
+
+def test_checkpoint_waits_for_earlier_batches(tmp_path):
+    checkpoint = Checkpoint(tmp_path / "checkpoint.json", "books.jsonl")
+
+    checkpoint.done(3, 5, 60, 6)
+    assert (checkpoint.offset, checkpoint.read) == (0, 0)
+    assert not checkpoint.path.exists()
+
+    checkpoint.done(0, 2, 30, 3)
+    assert (checkpoint.offset, checkpoint.read) == (60, 6)
+    assert json.loads(checkpoint.path.read_text())["offset"] == 60
+
+
+def test_read_source_resumes_at_an_offset(tmp_path):
+    source = write_jsonl(tmp_path / "books.jsonl", books(3))
+    records = list(read_source(source))
+
+    resumed = list(read_source(source, offset=records[0].offset))
+
+    assert [record.record["id"] for record in resumed] == [2, 3]
+    assert resumed[-1].offset == source.stat().st_size
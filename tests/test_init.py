@@ -0,0 +1,133 @@
+import asyncio
+import json
+
+import pytest
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
+
+from qdrant_odm import CollectionConfig, PointModel, index, init_models
+from qdrant_odm.schema_cache import SchemaCache
+
+
+class Author(PointModel[int]):
+    name: str = index.Keyword()
+
+
+class Paper(PointModel[int]):
+    title: str
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+@pytest.fixture
+def database(tmp_path):
+    return str(tmp_path / "qdrant")
+
+
+def record_calls(client, monkeypatch, *names):
+    calls = []
+    for name in names:
+        method = getattr(client, name)
+
+        def record(*args, method=method, name=name, **kwargs):
+            calls.append(name)
+            return method(*args, **kwargs)
+
+        monkeypatch.setattr(client, name, record)
+    return calls
+
+
+def test_init_models_creates_the_collections(client):
+    init_models(client, [Author, Paper])
+
+    assert Author.__client__ is client and Paper.__client__ is client
+    assert {collection.name for collection in client.get_collections().collections} == {
+        "Author",
+        "Paper",
+    }
+    with pytest.raises(ValueError, match="parallel must be positive"):
+        init_models(client, [Author], parallel=0)
+
+
+def test_schema_cache_skips_unchanged_models(database, tmp_path, monkeypatch):
+    cache = tmp_path / "schema.json"
+    client = QdrantClient(path=database)
+    init_models(client, [Author, Paper], cache=cache)
+    client.close()
+
+    assert set(json.loads(cache.read_text())) == {f"{database}/Author", f"{database}/Paper"}
+
+    client = QdrantClient(path=database)
+    calls = record_calls(client, monkeypatch, "collection_exists", "create_collection")
+    init_models(client, [Author, Paper], cache=cache)
+
+    assert calls == []
+    assert Author.__client__ is client and Paper.__client__ is client
+    client.close()
+
+
+def test_schema_cache_checks_changed_models(database, tmp_path, monkeypatch):
+    cache = tmp_path / "schema.json"
+    client = QdrantClient(path=database)
+    init_models(client, [Author], cache=cache)
+
+    class Renamed(PointModel[int]):
+        collection_config = CollectionConfig(collection_name="Author")
+        name: str = index.Text()
+
+    assert not SchemaCache(cache).fresh(Renamed, client)
+
+    calls = record_calls(client, monkeypatch, "collection_exists")
+    init_models(client, [Renamed], cache=cache)
+
+    assert calls == ["collection_exists"]
+    assert SchemaCache(cache).fresh(Renamed, client)
+    client.close()
+
+
+def test_in_memory_collections_are_never_cached(client, tmp_path):
+    cache = SchemaCache(tmp_path / "schema.json")
+    cache.add(Author, client)
+
+    assert not cache.fresh(Author, client)
+
+
+def test_unreadable_cache_is_ignored(tmp_path):
+    cache = tmp_path / "schema.json"
+    cache.write_text("{not json")
+    client = QdrantClient(path=str(tmp_path / "qdrant"))
+
+    assert not SchemaCache(cache).fresh(Author, client)
+    client.close()
+
+
+def test_async_schema_cache_assigns_the_client(database, tmp_path):
+    cache = tmp_path / "schema.json"
+
+    async def init() -> AsyncQdrantClient:
+        client = AsyncQdrantClient(path=database)
+        await init_models(client, [Author], cache=cache)  # type: ignore
+        assert Author.__async_client__ is client
+        await client.close()
+        return client
+
+    first = asyncio.run(init())
+    second = asyncio.run(init())
+
+    assert first is not second
+    assert Author.__async_client__ is second
+
+
+def test_lazy_models_initialize_on_the_first_request(client, monkeypatch):
+    calls = record_calls(client, monkeypatch, "create_collection")
+    init_models(client, [Author, Paper], lazy=True)
+
+    assert calls == [] and not client.get_collections().collections
+
+    assert Author.count() == 0
+    assert calls == ["create_collection"]
+    assert Author.__client__ is client
+    assert Paper.__client__ is not client
+
+
+def test_lazy_initialization_needs_a_sync_client():
+    with pytest.raises(ValueError, match="synchronous client"):
+        init_models(AsyncQdrantClient(":memory:"), [Author], lazy=True)
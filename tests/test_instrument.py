@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from loguru import logger
+from qdrant_client import AsyncQdrantClient, models
+
+from qdrant_odm import LoggingHook, PointModel, add_hook, index, init_models, remove_hook
+from qdrant_odm.executors import AsyncPointCRUD
+from qdrant_odm.instrument import current_span, operation, vector_size
+
+
+class Track(PointModel[int]):
+    title: str
+    plays: int = index.Integer()
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+@pytest.fixture
+def spans():
+    spans = []
+    hook = add_hook(spans.append)
+    yield spans
+    remove_hook(hook)
+
+
+@pytest.fixture
+def messages():
+    messages = []
+    sink = logger.add(messages.append, level="DEBUG", format="{level} {message}")
+    yield messages
+    logger.remove(sink)
+
+
+def tracks(count: int) -> list[Track]:
+    return [
+        Track(id=id, title=f"track {id}", plays=id, vector=[1.0, float(id)])
+        for id in range(1, count + 1)
+    ]
+
+
+def test_operations_report_a_span(client, spans):
+    init_models(client, [Track])
+
+    Track.insert_many(tracks(3))
+    Track.get_many([1, 2])
+
+    insert, get_many = spans
+    assert (insert.operation, insert.model, insert.collection) == (
+        "insert_many",
+        "Track",
+        "Track",
+    )
+    assert insert.points == 3 and insert.error is None
+    assert insert.payload_bytes > 0 and insert.vector_bytes == 3 * 8
+    assert insert.duration >= insert.serialize > 0
+    assert get_many.operation == "get_many" and get_many.points == 2
+    assert get_many.decode > 0
+    assert insert.network == insert.duration - insert.serialize - insert.decode
+
+
+def test_nested_operations_count_in_the_outer_one(client, spans):
+    init_models(client, [Track])
+
+    with operation("import", Track) as span:
+        assert current_span() is span
+        Track.insert_many(tracks(2))
+        Track.get(1)
+
+    assert current_span() is None
+    assert spans == [span]
+    assert span.points == 3
+
+
+def test_failed_operations_record_the_error(client, spans):
+    init_models(client, [Track])
+    client.delete_collection("Track")
+
+    with pytest.raises(ValueError):
+        Track.count()
+
+    [span] = spans
+    assert span.operation == "count"
+    assert isinstance(span.error, ValueError)
+
+
+def test_a_failing_hook_does_not_fail_the_operation(client, spans, messages):
+    def broken(span):
+        raise RuntimeError("broken hook")
+
+    init_models(client, [Track])
+    add_hook(broken)
+    try:
+        Track.insert_many(tracks(1))
+    finally:
+        remove_hook(broken)
+
+    assert len(spans) == 1
+    assert any("Instrumentation hook" in message for message in messages)
+
+
+def test_nothing_is_measured_without_hooks(client):
+    init_models(client, [Track])
+
+    with operation("import", Track) as span:
+        Track.insert_many(tracks(1))
+
+    assert span is None
+
+
+def test_async_operations_report_a_span(spans):
+    async def check():
+        client = AsyncQdrantClient(":memory:")
+        await init_models(client, [Track])  # type: ignore
+        crud = AsyncPointCRUD(Track)
+        await crud.insert_many(tracks(2))
+        await crud.count()
+
+    asyncio.run(check())
+
+    assert [(span.operation, span.points) for span in spans] == [
+        ("insert_many", 2),
+        ("count", 0),
+    ]
+
+
+def test_logging_hook(messages, spans):
+    hook = LoggingHook(level="INFO", slower_than=0.0)
+    slow_only = LoggingHook(slower_than=60.0)
+    with operation("import", Track) as span:
+        pass
+
+    hook(span)
+    slow_only(span)
+    span.error = ValueError("rejected")
+    slow_only(span)
+
+    assert [message.split(" ", 1)[0] for message in messages] == ["INFO", "WARNING"]
+    assert "Span(import Track" in messages[0]
+    assert "ValueError('rejected')" in messages[1]
+
+
+def test_vector_sizes():
+    assert vector_size(None) == 0
+    assert vector_size([1.0, 2.0]) == 8
+    assert vector_size({"a": [1.0], "b": [[1.0, 2.0], [3.0, 4.0]]}) == 4 + 16
+    assert vector_size(models.SparseVector(indices=[1, 2], values=[0.5, 0.5])) == 16
@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, init_models
+from qdrant_odm.lookup import AsyncGetBatcher, GetBatcher, order_by_ids
+
+
+class Entry(PointModel[int]):
+    name: str
+
+
+def test_get_many_keeps_the_order_of_ids(client):
+    init_models(client, [Entry])
+    Entry.insert_many(Entry(id=i, name=str(i)) for i in range(5))
+
+    points = Entry.get_many([3, 99, 1, 3])
+
+    assert [point and point.id for point in points] == [3, None, 1, 3]
+    assert points[0] is points[3]
+
+
+def test_get_many_chunks_requests(client, monkeypatch):
+    init_models(client, [Entry])
+    Entry.insert_many(Entry(id=i, name=str(i)) for i in range(10))
+    retrieve, sizes = client.retrieve, []
+
+    def record_retrieve(collection_name, ids, **kwargs):
+        sizes.append(len(ids))
+        return retrieve(collection_name, ids=ids, **kwargs)
+
+    monkeypatch.setattr(client, "retrieve", record_retrieve)
+
+    assert len(Entry.get_many(range(10), chunk_size=4)) == 10
+    assert sizes == [4, 4, 2]
+
+
+def test_order_by_ids_matches_uuid_ids_in_any_form():
+    id = uuid.uuid4()
+    records = [models.Record(id=str(id), payload={})]
+
+    assert order_by_ids([id.hex, str(id).upper()], records, list) == records * 2
+
+
+def test_get_batcher_coalesces_concurrent_calls():
+    calls = []
+
+    def get_many(ids, read_options):
+        calls.append(ids)
+        return [f"point {id}" for id in ids]
+
+    batcher = GetBatcher(get_many, window=0.2)
+    results = {}
+    barrier = threading.Barrier(5)
+
+    def get(id):
+        barrier.wait()
+        results[id] = batcher.get(id, "options")
+
+    threads = [threading.Thread(target=get, args=(id,)) for id in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {id: f"point {id}" for id in range(5)}
+    assert len(calls) == 1
+    assert sorted(calls[0]) == list(range(5))
+
+
+def test_get_batcher_sends_full_batches_early():
+    calls = []
+    batcher = GetBatcher(lambda ids, options: calls.append(ids) or ids, window=5, max_batch_size=1)
+
+    assert batcher.get(1, None) == 1
+    assert calls == [[1]]
+
+
+def test_get_batcher_propagates_errors():
+    def get_many(ids, read_options):
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        GetBatcher(get_many, window=0).get(1, None)
+
+
+def test_async_get_batcher():
+    calls = []
+
+    async def get_many(ids, read_options):
+        calls.append(ids)
+        return [id * 10 for id in ids]
+
+    async def check():
+        batcher = AsyncGetBatcher(get_many, window=0.05)
+        return await asyncio.gather(*(batcher.get(id, None) for id in range(4)))
+
+    assert asyncio.run(check()) == [0, 10, 20, 30]
+    assert calls == [[0, 1, 2, 3]]
+
+
+def test_model_get_batching(client):
+    init_models(client, [Entry])
+    Entry.insert_many(Entry(id=i, name=str(i)) for i in range(3))
+    Entry.enable_get_batching(window=0.001)
+    try:
+        assert Entry.get(2).name == "2"  # type: ignore
+        assert Entry.get(7) is None
+    finally:
+        Entry.disable_get_batching()
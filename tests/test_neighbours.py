@@ -0,0 +1,65 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, init_models, index
+
+
+class Song(PointModel[int]):
+    title: str
+    vector: list[float] = index.Vector(2, models.Distance.COSINE)
+
+
+VECTORS = {1: [1.0, 0.0], 2: [0.9, 0.1], 3: [0.0, 1.0], 4: [0.1, 0.9]}
+
+
+@pytest.fixture
+def songs(client):
+    init_models(client, [Song])
+    Song.insert_many(Song(id=id, title=str(id), vector=vector) for id, vector in VECTORS.items())
+    return client
+
+
+def test_neighbours(songs):
+    point = Song.get(1)
+    assert point is not None
+
+    [(neighbour, score)] = point.neighbours("vector", limit=1)
+
+    assert neighbour.id == 2
+    assert score == pytest.approx(0.9 / (0.81 + 0.01) ** 0.5)
+
+
+def test_neighbours_many_batches_queries(songs, monkeypatch):
+    calls = []
+
+    # The local client does not resolve point ids in batched queries, so
+    # each request is run as the server would, with `query_points`.
+    def record(collection_name, requests, **kwargs):
+        calls.append(len(requests))
+        return [
+            songs.query_points(
+                collection_name,
+                query=request.query.nearest,
+                using=request.using,
+                limit=request.limit,
+                query_filter=request.filter,
+                with_payload=request.with_payload,
+                with_vectors=request.with_vector,
+            )
+            for request in requests
+        ]
+
+    monkeypatch.setattr(songs, "query_batch_points", record)
+    points = Song.get_many([1, 3])
+
+    results = Song.neighbours_many([*points, 4], "vector", limit=1, chunk_size=2)  # type: ignore
+
+    assert [[neighbour.id for neighbour, _ in result] for result in results] == [[2], [4], [3]]
+    assert calls == [2, 1]
+
+
+def test_neighbours_need_persisted_points(songs):
+    with pytest.raises(ValueError):
+        Song.neighbours_many([Song(id=9, title="new")], "vector")
+    with pytest.raises(ValueError):
+        Song(id=9, title="new").neighbours("vector")
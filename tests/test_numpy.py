@@ -0,0 +1,77 @@
+import numpy as np
+import numpy.typing as npt
+from qdrant_client import models
+
+from qdrant_odm import PointModel, ReadOptions, index, init_models
+
+
+class Image(PointModel[int]):
+    embedding: npt.NDArray[np.float32] = index.Vector(3, models.Distance.DOT)
+    patches: list[list[float]] = index.MultiVector(
+        2, models.Distance.DOT, as_numpy=True, dtype=np.float16
+    )
+    plain: list[float] = index.Vector(2, models.Distance.DOT)
+    views: int = 0
+
+
+def test_numpy_fields_are_declared():
+    assert dict(Image.__numpy_vectors__) == {
+        "embedding": np.dtype(np.float32),
+        "patches": np.dtype(np.float16),
+    }
+
+
+def test_arrays_are_encoded_as_lists():
+    point = Image(
+        id=1,
+        embedding=np.array([1, 2, 3], dtype=np.float32),
+        patches=np.ones((2, 2)),
+        plain=[0.5, 0.5],
+    )
+
+    assert point.vectors() == {
+        "embedding": [1.0, 2.0, 3.0],
+        "patches": [[1.0, 1.0], [1.0, 1.0]],
+        "plain": [0.5, 0.5],
+    }
+    assert type(point._to_point_struct().vector["embedding"]) is list  # type: ignore
+
+
+def test_arrays_are_decoded_with_their_dtype(client):
+    init_models(client, [Image])
+    Image(id=1, embedding=np.array([1, 0, 0]), patches=[[1, 2], [3, 4]], plain=[1, 0]).save()
+
+    point = Image.get(1, ReadOptions(with_vectors=True))
+
+    assert point is not None
+    assert isinstance(point.embedding, np.ndarray)
+    assert point.embedding.dtype == np.float32
+    assert point.embedding.tolist() == [1.0, 0.0, 0.0]
+    assert point.patches.dtype == np.float16  # type: ignore
+    assert point.patches.shape == (2, 2)  # type: ignore
+    assert point.plain == [1.0, 0.0]
+
+
+def test_changed_arrays_are_written(client):
+    init_models(client, [Image])
+    Image(id=1, embedding=np.array([1, 0, 0]), patches=[[1, 2]], plain=[1, 0]).save()
+
+    point = Image.get(1, ReadOptions(with_vectors=True))
+    assert point is not None
+    point.embedding = np.array([0, 0, 1], dtype=np.float32)
+    point.save(overwrite_vectors=True)
+
+    stored = Image.get(1, ReadOptions(with_vectors=["embedding"]))
+    assert stored.embedding.tolist() == [0.0, 0.0, 1.0]  # type: ignore
+
+
+def test_sync_loads_arrays_and_falsy_values(client):
+    init_models(client, [Image])
+    Image(id=1, embedding=np.array([1, 0, 0]), patches=[[1, 2]], plain=[1, 0]).save()
+
+    point = Image(id=1, embedding=np.array([0, 1, 0]), patches=[[0, 0]], views=5)
+    point.sync(ReadOptions(with_vectors=True))
+
+    assert point.embedding.tolist() == [1.0, 0.0, 0.0]  # type: ignore
+    assert point.patches.tolist() == [[1.0, 2.0]]  # type: ignore
+    assert point.views == 0
@@ -0,0 +1,106 @@
+import threading
+
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, QueryPlan, init_models, index
+
+
+class Clip(PointModel[int]):
+    title: str
+    audio: list[float] = index.Vector(2, models.Distance.COSINE)
+    video: list[float] = index.Vector(2, models.Distance.COSINE)
+
+
+CLIPS = {
+    1: ([1.0, 0.0], [1.0, 0.0]),
+    2: ([0.9, 0.1], [0.0, 1.0]),
+    3: ([0.8, 0.2], [0.9, 0.1]),
+    4: ([0.0, 1.0], [0.7, 0.3]),
+}
+
+
+@pytest.fixture
+def clips(client):
+    init_models(client, [Clip])
+    Clip.insert_many(
+        Clip(id=id, title=str(id), audio=audio, video=video)
+        for id, (audio, video) in CLIPS.items()
+    )
+
+
+def test_plans_are_immutable():
+    plan = QueryPlan(Clip, using="audio", limit=5)
+
+    with pytest.raises(AttributeError):
+        plan.limit = 3  # type: ignore
+    assert plan.replace(limit=3).limit == 3
+    assert plan.limit == 5
+
+
+def test_plans_are_validated():
+    with pytest.raises(ValueError):
+        QueryPlan(Clip, using="title")
+    with pytest.raises(ValueError):
+        QueryPlan(Clip, using="audio", fusion=models.Fusion.RRF)
+
+
+def test_query_with_a_vector(clips):
+    results = QueryPlan(Clip, using="video", limit=2).query([1.0, 0.0])
+
+    assert [point.id for point, _ in results] == [1, 3]
+
+
+def test_rescoring_stage(clips):
+    plan = QueryPlan(Clip, using="audio", limit=3).then("video", limit=1)
+
+    [(point, _)] = plan.query({"audio": [1.0, 0.0], "video": [0.0, 1.0]})
+
+    assert point.id == 2
+
+
+def test_shared_between_threads(clips):
+    plan = QueryPlan(Clip, using="audio", limit=1)
+    results = {}
+
+    def query(vector):
+        results[tuple(vector)] = plan.query(vector)[0][0].id
+
+    threads = [
+        threading.Thread(target=query, args=(vector,)) for vector in ([1.0, 0.0], [0.0, 1.0])
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {(1.0, 0.0): 1, (0.0, 1.0): 4}
+
+
+def test_query_many(clips):
+    results = QueryPlan(Clip, using="video", limit=1).query_many([[1.0, 0.0], [0.0, 1.0]])
+
+    assert [[point.id for point, _ in result] for result in results] == [[1], [2]]
+
+
+def test_point_prefetch_stacks_plan_stages(clips):
+    point = Clip.get(1)
+    assert point is not None
+
+    assert [neighbour.id for neighbour, _ in point.neighbours("audio")] == [2, 3, 4]
+
+    with point.prefetch("audio", limit=2):
+        with point.prefetch("video", limit=1):
+            stage = point._prefetch()
+            assert stage is not None
+            assert (stage.using, stage.limit) == ("video", 1)
+            assert stage.query == models.NearestQuery(nearest=1)
+            assert stage.prefetch[0].using == "audio"  # type: ignore
+
+            neighbours = point.neighbours("audio", limit=5)
+
+        assert point._prefetch().using == "audio"  # type: ignore
+
+    assert point._prefetch() is None
+    # The nearest in video of the two nearest in audio.
+    assert [neighbour.id for neighbour, _ in neighbours] == [3]
@@ -0,0 +1,153 @@
+import pytest
+from loguru import logger
+from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
+
+from qdrant_odm import ClientPool, PointModel, init_models
+from qdrant_odm import pool as pool_module
+
+
+class Node:
+    """
+    Stand-in for a client of one Qdrant node, recording the calls it serves.
+    """
+
+    def __init__(self, url: str):
+        self.init_options = {"url": url}
+        self.calls: list[str] = []
+        self.error: Exception | None = None
+        self.closed = 0
+
+    def count(self, collection_name: str) -> str:
+        self.calls.append(collection_name)
+        if self.error is not None:
+            raise self.error
+        return self.init_options["url"]
+
+    def upsert(self, collection_name: str, points: list) -> str:
+        self.calls.append(collection_name)
+        return "written"
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+class Note(PointModel[int]):
+    text: str
+
+
+@pytest.fixture
+def nodes():
+    return [Node(f"http://qdrant-{i}:6333") for i in range(3)]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(pool_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def unavailable() -> Exception:
+    return ResponseHandlingException(ConnectionError("connection refused"))
+
+
+def test_reads_are_spread_and_writes_go_to_the_primary(nodes):
+    primary, *replicas = nodes
+    pool = ClientPool(primary, replicas)  # type: ignore
+
+    served = [pool.count("Note") for _ in range(6)]
+
+    assert sorted(served) == sorted([node.init_options["url"] for node in nodes] * 2)
+    assert pool.upsert("Note", []) == "written"
+    assert primary.calls.count("Note") == 3
+    assert [len(node.calls) for node in replicas] == [2, 2]
+
+
+def test_primary_can_be_kept_out_of_reads(nodes):
+    primary, *replicas = nodes
+    pool = ClientPool(primary, replicas, read_from_primary=False)  # type: ignore
+
+    for _ in range(4):
+        pool.count("Note")
+
+    assert primary.calls == []
+    assert list(pool.healthy()) == [node.init_options["url"] for node in replicas]
+
+
+def test_least_inflight_picks_the_idlest_reader(nodes):
+    pool = ClientPool(nodes[0], nodes[1:], policy="least_inflight")  # type: ignore
+    pool._readers[0].inflight = pool._readers[2].inflight = 1
+
+    assert {pool.count("Note") for _ in range(3)} == {nodes[1].init_options["url"]}
+
+
+def test_failed_reads_are_retried_and_readers_ejected(nodes, clock):
+    messages = []
+    sink = logger.add(messages.append, level="WARNING")
+    pool = ClientPool(nodes[0], nodes[1:], eject_after=2, eject_for=10.0)  # type: ignore
+    nodes[1].error = unavailable()
+    try:
+        served = [pool.count("Note") for _ in range(6)]
+    finally:
+        logger.remove(sink)
+
+    assert "http://qdrant-1:6333" not in served
+    assert len(nodes[1].calls) == 2
+    assert pool.healthy()["http://qdrant-1:6333"] is False
+    assert "Ejected http://qdrant-1:6333" in messages[0]
+
+    nodes[1].error = None
+    clock[0] += 10.0
+    assert pool.healthy()["http://qdrant-1:6333"] is True
+    assert "http://qdrant-1:6333" in {pool.count("Note") for _ in range(3)}
+
+
+def test_ejected_readers_are_tried_when_none_is_healthy(nodes, clock):
+    pool = ClientPool(nodes[0], eject_after=1)  # type: ignore
+    nodes[0].error = unavailable()
+
+    with pytest.raises(ResponseHandlingException):
+        pool.count("Note")
+    assert pool.healthy() == {"http://qdrant-0:6333": False}
+
+    nodes[0].error = None
+    assert pool.count("Note") == "http://qdrant-0:6333"
+
+
+def test_invalid_requests_are_not_retried(nodes):
+    pool = ClientPool(nodes[0], nodes[1:])  # type: ignore
+    for node in nodes:
+        node.error = UnexpectedResponse(400, "Bad Request", b"", {})  # type: ignore
+
+    with pytest.raises(UnexpectedResponse):
+        pool.count("Note")
+
+    assert sum(len(node.calls) for node in nodes) == 1
+    assert all(pool.healthy().values())
+
+
+def test_invalid_options_raise(nodes):
+    with pytest.raises(ValueError, match="Unknown routing policy"):
+        ClientPool(nodes[0], policy="random")  # type: ignore
+    with pytest.raises(ValueError, match="must be positive"):
+        ClientPool(nodes[0], eject_after=0)  # type: ignore
+
+
+def test_close_closes_each_client_once(nodes):
+    pool = ClientPool(nodes[0], [nodes[0], *nodes[1:]])  # type: ignore
+
+    pool.close()
+
+    assert [node.closed for node in nodes] == [1, 1, 1]
+
+
+def test_models_run_on_a_pool():
+    pool = ClientPool(QdrantClient(":memory:"))
+    init_models(pool, [Note])
+
+    Note.insert_many([Note(id=1, text="pooled")])
+
+    assert Note.get(1).text == "pooled"
+    assert Note.count() == 1
+    pool.close()
@@ -0,0 +1,115 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import CollectionConfig, PointModel, index, init_models
+from qdrant_odm import reconcile
+from qdrant_odm.reconcile import diff_collection, reconcile_collection, update_kwargs
+
+
+class Doc(PointModel[int]):
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+class Tuned(PointModel[int]):
+    collection_config = CollectionConfig(
+        collection_name="Doc",
+        hnsw_config=models.HnswConfigDiff(m=32),
+        replication_factor=2,
+    )
+    vector: list[float] = index.Vector(
+        2, models.Distance.DOT, hnsw_config=models.HnswConfigDiff(ef_construct=50)
+    )
+
+
+class Resized(PointModel[int]):
+    collection_config = CollectionConfig(collection_name="Doc")
+    vector: list[float] = index.Vector(3, models.Distance.DOT)
+
+
+class Drifted(PointModel[int]):
+    collection_config = CollectionConfig(
+        collection_name="Doc", hnsw_config=models.HnswConfigDiff(m=32)
+    )
+    vector: list[float] = index.Vector(3, models.Distance.DOT)
+
+
+@pytest.fixture
+def collection(client):
+    init_models(client, [Doc])
+    return client
+
+
+def changes(model, client):
+    model._collection_kwargs()
+    return diff_collection(model, client.get_collection("Doc"))
+
+
+def test_matching_declaration_has_no_changes(collection):
+    assert changes(Doc, collection) == []
+    assert reconcile_collection(Doc, collection).report() == "Doc: up to date"
+
+
+def test_diff_lists_changed_settings(collection):
+    assert {
+        (change.vector, change.setting, change.current, change.declared, change.safe)
+        for change in changes(Tuned, collection)
+    } == {
+        (None, "hnsw_config.m", 16, 32, True),
+        (None, "replication_factor", None, 2, True),
+        ("vector", "hnsw_config.ef_construct", None, 50, True),
+    }
+    [change] = changes(Resized, collection)
+    assert (change.vector, change.setting, change.safe) == ("vector", "size", False)
+
+
+def test_update_kwargs_apply_only_safe_changes(collection):
+    kwargs = update_kwargs(Tuned, changes(Tuned, collection))
+
+    assert kwargs["collection_name"] == "Doc"
+    assert kwargs["hnsw_config"] == models.HnswConfigDiff(m=32)
+    assert kwargs["collection_params"].replication_factor == 2
+    assert kwargs["vectors_config"]["vector"].hnsw_config.ef_construct == 50
+    assert update_kwargs(Resized, changes(Resized, collection)) == {}
+
+
+def test_dry_run_only_reports(collection, monkeypatch):
+    updates = []
+    monkeypatch.setattr(collection, "update_collection", lambda **kwargs: updates.append(kwargs))
+
+    diff = reconcile_collection(Tuned, collection, dry_run=True)
+
+    assert updates == [] and not diff.applied
+    assert "3 change(s), not applied" in diff.report()
+
+    diff = reconcile_collection(Tuned, collection)
+    assert [kwargs["collection_name"] for kwargs in updates] == ["Doc"]
+    assert diff.applied and diff.unsafe == ()
+
+
+def test_unsafe_changes_are_reported_not_applied(collection, monkeypatch):
+    monkeypatch.setattr(collection, "update_collection", pytest.fail)
+
+    diff = reconcile_collection(Resized, collection)
+
+    assert not diff.applied
+    assert [change.setting for change in diff.unsafe] == ["size"]
+    assert "needs recreating the collection" in diff.report()
+
+
+@pytest.mark.parametrize(
+    ("model", "apply", "status"),
+    [
+        ("Doc", False, 0),
+        ("Tuned", False, 1),
+        ("Tuned", True, 0),
+        ("Resized", False, 1),
+        ("Resized", True, 1),
+        ("Drifted", True, 1),
+    ],
+)
+def test_main_exit_status(collection, monkeypatch, capsys, model, apply, status):
+    monkeypatch.setattr(reconcile, "QdrantClient", lambda **kwargs: collection)
+    argv = [f"{__name__}:{model}"] + ["--apply"] * apply
+
+    assert reconcile.main(argv) == status
+    assert capsys.readouterr().out.startswith("Doc: ")
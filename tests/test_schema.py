@@ -0,0 +1,63 @@
+from typing import ClassVar
+
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, index
+from qdrant_odm.dataclass import DataClass
+
+
+class Base(PointModel[int]):
+    title: str
+    tags: list[str] = []
+    kind: ClassVar[str] = "base"
+
+
+class Child(Base):
+    rank: int = 0
+    vector: list[float] = index.Vector(4, models.Distance.DOT)
+
+
+def test_schema_collects_fields_once():
+    assert list(Base.__schema__.fields) == ["id", "title", "tags"]
+    assert list(Child.__schema__.fields) == ["id", "title", "tags", "rank", "vector"]
+    assert "kind" not in Child.__schema__.fields
+
+
+def test_defaults_exclude_index_declarations():
+    assert dict(Child.__schema__.defaults) == {"tags": [], "rank": 0}
+    assert isinstance(Child.__indexes__["vector"], index.Vector)
+
+
+def test_payload_and_vector_fields_are_per_class():
+    assert Base.__payload_fields__ == ("title", "tags")
+    assert Child.__payload_fields__ == ("title", "tags", "rank")
+    assert Child.__vector_fields__ == ("vector",)
+    assert Base.__non_payload_fields__ == {"id"}
+    assert Child.__non_payload_fields__ == {"id", "vector"}
+
+
+def test_instances_use_slots():
+    point = Child(id=1, title="a")
+
+    assert not hasattr(point, "__dict__")
+    assert point.to_dict() == {
+        "id": 1,
+        "title": "a",
+        "tags": [],
+        "rank": 0,
+        "vector": None,
+    }
+    with pytest.raises(AttributeError):
+        point.unknown = 1  # type: ignore
+
+
+def test_dataclass_post_init():
+    class Counter(DataClass):
+        value: int = 1
+        doubled: int = 0
+
+        def __post_init__(self):
+            self.doubled = self.value * 2
+
+    assert Counter(value=3).doubled == 6
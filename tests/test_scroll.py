@@ -0,0 +1,92 @@
+import threading
+
+import pytest
+
+from qdrant_odm import PointModel, init_models
+from qdrant_odm.scroll import PageSize, iter_pages
+
+
+class Row(PointModel[int]):
+    value: int
+
+
+def fake_fetch(total: int, calls: list):
+    def fetch(offset, limit):
+        calls.append((offset, limit, threading.current_thread().name))
+        start = offset or 0
+        end = min(start + limit, total)
+        return list(range(start, end)), end if end < total else None
+
+    return fetch
+
+
+def test_scroll_pages(client):
+    init_models(client, [Row])
+    Row.insert_many(Row(id=i, value=i) for i in range(25))
+
+    pages = list(Row.scroll(limit=10))
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert [point.id for page in pages for point in page] == list(range(25))
+
+
+def test_scroll_points_reads_ahead(client):
+    init_models(client, [Row])
+    Row.insert_many(Row(id=i, value=i) for i in range(25))
+
+    assert [point.id for point in Row.scroll_points(limit=4, read_ahead=2)] == list(range(25))
+
+
+def test_read_ahead_fetches_in_background():
+    calls = []
+    pages = iter_pages(fake_fetch(30, calls), list, limit=10, read_ahead=1)
+
+    assert next(pages) == list(range(10))
+    assert list(pages) == [list(range(10, 20)), list(range(20, 30))]
+    assert {name for _, _, name in calls} == {"qdrant-odm-scroll"}
+
+
+def test_read_ahead_raises_fetch_errors():
+    def fetch(offset, limit):
+        if offset is not None:
+            raise RuntimeError("lost")
+        return [1], 1
+
+    pages = iter_pages(fetch, list, limit=1, read_ahead=2)
+
+    assert next(pages) == [1]
+    with pytest.raises(RuntimeError):
+        next(pages)
+
+
+def test_read_ahead_stops_when_closed():
+    calls = []
+    pages = iter_pages(fake_fetch(10_000, calls), list, limit=1, read_ahead=2)
+
+    next(pages)
+    pages.close()  # type: ignore
+    fetched = len(calls)
+    threading.Event().wait(0.3)
+
+    assert len(calls) <= fetched + 1
+
+
+def test_adaptive_page_size():
+    size = PageSize(initial=64, minimum=16, maximum=128, target_seconds=1.0)
+
+    size.observe(0.1, 64)
+    assert size.value == 128
+    size.observe(0.1, 128)
+    assert size.value == 128
+    size.observe(3.0, 128)
+    assert size.value == 64
+    # A short last page says nothing about the round-trip time.
+    size.observe(3.0, 10)
+    assert size.value == 64
+
+
+def test_fixed_page_size():
+    size = PageSize(limit=50)
+
+    size.observe(0.0, 50)
+    assert size.value == 50
@@ -0,0 +1,103 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, Session, init_models
+
+
+class Task(PointModel[int]):
+    title: str
+    done: bool = False
+
+
+class Tag(PointModel[int]):
+    label: str
+
+
+def recorded_updates(client, monkeypatch) -> list:
+    batch_update_points, calls = client.batch_update_points, []
+
+    def record(collection_name, update_operations, **kwargs):
+        calls.append((collection_name, update_operations))
+        return batch_update_points(collection_name, update_operations=update_operations, **kwargs)
+
+    monkeypatch.setattr(client, "batch_update_points", record)
+    return calls
+
+
+def test_one_request_per_collection(client, monkeypatch):
+    init_models(client, [Task, Tag])
+    calls = recorded_updates(client, monkeypatch)
+
+    with Session() as session:
+        session.save(Task(id=1, title="a"), Task(id=2, title="b"), Tag(id=1, label="x"))
+
+    assert sorted(name for name, _ in calls) == ["Tag", "Task"]
+    assert Task.count() == 2
+    assert Tag.get(1).label == "x"  # type: ignore
+
+
+def test_writes_collapse_to_the_last_state(client, monkeypatch):
+    init_models(client, [Task])
+    Task.insert_many(Task(id=i, title=str(i)) for i in range(3))
+    calls = recorded_updates(client, monkeypatch)
+    first, second = Task.get_many([1, 2])
+    assert first is not None and second is not None
+
+    with Session() as session:
+        new = Task(id=10, title="new")
+        session.save(new)
+        session.save(new)
+        session.delete(new)
+
+        first.done = True
+        session.save(first)
+        first.title = "changed after save"
+
+        session.save(second)
+        session.delete(second)
+
+        assert len(session) == 2
+
+    [(_, operations)] = calls
+    assert [type(operation) for operation in operations] == [
+        models.DeleteOperation,
+        models.SetPayloadOperation,
+    ]
+    assert operations[1].set_payload.payload == {"done": True, "title": "changed after save"}
+    assert Task.get(1).title == "changed after save"  # type: ignore
+    assert Task.get(2) is None
+    assert Task.get(10) is None
+    assert not first.changed
+
+
+def test_nothing_is_sent_when_the_block_raises(client, monkeypatch):
+    init_models(client, [Task])
+    calls = recorded_updates(client, monkeypatch)
+
+    with pytest.raises(RuntimeError):
+        with Session() as session:
+            session.save(Task(id=1, title="a"))
+            raise RuntimeError
+
+    assert calls == []
+    assert Task.count() == 0
+
+
+def test_deleting_an_unsaved_point_raises():
+    with pytest.raises(ValueError):
+        Session().delete(Task(id=1, title="a"))
+
+
+def test_new_points_are_persisted_after_flush(client):
+    init_models(client, [Task])
+    point = Task(id=1, title="a")
+
+    with Session() as session:
+        session.save(point)
+
+    assert point.persisted
+    point.title = "b"
+    with Session() as session:
+        session.save(point)
+
+    assert Task.get(1).title == "b"  # type: ignore
@@ -0,0 +1,106 @@
+import pytest
+from qdrant_client import models
+
+from qdrant_odm import PointModel, ReadOptions, index, init_models
+
+
+class Profile(PointModel[int]):
+    name: str
+    bio: str | None = None
+    tags: list[str] = []
+    vector: list[float] = index.Vector(2, models.Distance.DOT)
+
+
+class Derived(PointModel[int]):
+    name: str
+    slug: str = ""
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.slug = (self.name or "").lower()
+
+
+def recorded_updates(client, monkeypatch) -> list:
+    batch_update_points, calls = client.batch_update_points, []
+
+    def record(collection_name, update_operations, **kwargs):
+        calls.append(update_operations)
+        return batch_update_points(collection_name, update_operations=update_operations, **kwargs)
+
+    monkeypatch.setattr(client, "batch_update_points", record)
+    return calls
+
+
+def test_construction_is_not_a_change():
+    assert not Profile(id=1, name="a", tags=["x"]).changed
+    assert not Derived(id=1, name="A").changed
+    assert not Derived._from_record(models.Record(id=1, payload={"name": "A"})).changed
+
+
+def test_assignments_are_tracked():
+    point = Profile(id=1, name="a")
+    point.name = "b"
+    point.vector = [1.0, 0.0]
+
+    assert point.changed == {"name", "vector"}
+
+
+def test_mark_changed():
+    point = Profile(id=1, name="a")
+    point.tags.append("x")
+    point.mark_changed("tags")
+
+    assert point.changed == {"tags"}
+    with pytest.raises(ValueError):
+        point.mark_changed("id")
+
+
+def test_save_sends_only_changed_fields(client, monkeypatch):
+    init_models(client, [Profile])
+    Profile(id=1, name="a", bio="b", tags=["x"], vector=[1.0, 0.0]).save()
+    calls = recorded_updates(client, monkeypatch)
+
+    point = Profile.get(1)
+    assert point is not None
+    point.save()
+    assert calls == []
+
+    point.name = "renamed"
+    point.bio = None
+    point.save()
+
+    [operations] = calls
+    assert [type(operation) for operation in operations] == [
+        models.SetPayloadOperation,
+        models.DeletePayloadOperation,
+    ]
+    assert operations[0].set_payload.payload == {"name": "renamed"}
+    assert operations[1].delete_payload.keys == ["bio"]
+    assert not point.changed
+
+    stored = Profile.get(1, ReadOptions(with_vectors=True))
+    assert stored is not None
+    assert stored.to_dict() == {
+        "id": 1,
+        "name": "renamed",
+        "bio": None,
+        "tags": ["x"],
+        "vector": [1.0, 0.0],
+    }
+
+
+def test_vectors_are_written_with_overwrite_vectors(client, monkeypatch):
+    init_models(client, [Profile])
+    Profile(id=1, name="a", vector=[1.0, 0.0]).save()
+    calls = recorded_updates(client, monkeypatch)
+
+    point = Profile.get(1)
+    assert point is not None
+    point.vector = [0.0, 1.0]
+    point.save()
+    assert calls == []
+    assert point.changed == {"vector"}
+
+    point.save(overwrite_vectors=True)
+    assert isinstance(calls[0][0], models.UpdateVectorsOperation)
+    assert Profile.get(1, ReadOptions(with_vectors=True)).vector == [0.0, 1.0]  # type: ignore